@@ -0,0 +1,13 @@
+"""
+benchmarks
+─────────────────────────────────────────────
+效能基準腳本。每個模組可單獨執行：
+
+  python -m benchmarks.battle_setup
+  python -m benchmarks.lottery_draw
+
+整套回歸基準（情境見 benchmarks.scenarios，基準檔在 benchmarks/baselines/）：
+
+  python -m benchmarks.suite run --compare
+  python -m benchmarks.suite run -o benchmarks/baselines/baseline.json   # 更新基準
+"""
@@ -0,0 +1,76 @@
+"""
+BattleEngine 開戰成本基準
+─────────────────────────────────────────────
+比較每場戰鬥的 setup 成本：
+  deepcopy : 舊做法，深拷貝所有隊友 / 敵人及其每個技能
+  clone    : battle_clone() / battle_copy()，共享原型的只讀資料
+
+  python -m benchmarks.battle_setup [-n 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import copy
+import io
+import time
+
+from core.data_loader import load_all
+from core.registry import registry
+from common.battle.engine import BattleEngine
+
+
+class _DeepCopyEngine(BattleEngine):
+    """還原舊版的深拷貝開戰流程，作為對照組。"""
+
+    @staticmethod
+    def _spawn(prototype):
+        return copy.deepcopy(prototype)
+
+    @staticmethod
+    def _copy_skill(skill):
+        return copy.deepcopy(skill)
+
+
+def _scenario():
+    """4 名隊友 vs Boss + 4 名小怪（技能最多的組合之一）。"""
+    allies  = list(registry.get_all("ally").values())
+    enemies = [registry.get("boss", 600001)] + [
+        registry.get("enemy", eid) for eid in (500001, 500002, 500003, 500004)
+    ]
+    return allies, enemies
+
+
+def measure(engine_cls, allies: list, enemies: list, fights: int) -> float:
+    """回傳每場 setup 的平均耗時（微秒）。"""
+    start = time.perf_counter()
+    for _ in range(fights):
+        engine = engine_cls(None, allies, enemies)
+        engine._handler_ctx.teardown()
+    return (time.perf_counter() - start) / fights * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="BattleEngine 開戰成本基準")
+    parser.add_argument("-n", "--fights", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_all()
+    allies, enemies = _scenario()
+
+    # 預熱
+    measure(BattleEngine, allies, enemies, 50)
+    measure(_DeepCopyEngine, allies, enemies, 50)
+
+    before = measure(_DeepCopyEngine, allies, enemies, args.fights)
+    after  = measure(BattleEngine, allies, enemies, args.fights)
+
+    print(f"參戰：{len(allies)} 隊友 + {len(enemies)} 敵人，{args.fights} 場")
+    print(f"  deepcopy : {before:8.1f} µs / 場")
+    print(f"  clone    : {after:8.1f} µs / 場")
+    print(f"  加速     : {before / after:8.2f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Lottery 抽獎路徑基準
+─────────────────────────────────────────────
+比較每抽的平均耗時：
+  legacy : 舊做法，每抽線性累加機率、保底時重新篩選獎勵、十連檢查 results[-9:]
+  sampler: 預計算 CDF + draw_many()
+
+同時以固定 seed 跑一次保底模擬，確認出率沒有因最佳化而改變。
+指定 --max-us 時，sampler 每抽耗時超過門檻即以非零狀態碼結束（供 CI 偵測退化）。
+
+  python -m benchmarks.lottery_draw [-n 1000000] [--pool 1] [--max-us 1.0]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+
+from core.data_loader import load_all
+from core.registry import registry
+from common.module.lottery import Lottery
+from common.module.lottery_simulator import simulate
+
+
+class _LegacyLottery(Lottery):
+    """還原舊版的逐抽流程，作為對照組。"""
+
+    def draw(self, draw_count):
+        results = []
+        for i in range(draw_count):
+            reward = self.perform_draw()
+            if (i + 1) % 10 == 0 and not any(p <= 0.2 for _, p in results[-9:]):
+                reward = self.guaranteed_draw(min_probability=0.2)
+            if reward['probability'] <= 0.03:
+                self.top_tier_guarantee_counter = 0
+            else:
+                self.top_tier_guarantee_counter += 1
+            if self.top_tier_guarantee_counter >= 100:
+                reward = self.guaranteed_draw(min_probability=0.03)
+                self.top_tier_guarantee_counter = 0
+            results.append((reward['item'], reward['probability']))
+        return results
+
+    def perform_draw(self):
+        roll = random.random()
+        cumulative_probability = 0.0
+        for reward in self.rewards:
+            cumulative_probability += reward['probability']
+            if roll <= cumulative_probability:
+                return reward
+        return self.rewards[-1]
+
+    def guaranteed_draw(self, min_probability):
+        eligible_rewards = [r for r in self.rewards if r['probability'] <= min_probability]
+        return random.choice(eligible_rewards) if eligible_rewards else self.rewards[0]
+
+
+def measure(draw, pulls: int, session: int = 10) -> float:
+    """回傳每抽的平均耗時（微秒）。"""
+    start = time.perf_counter()
+    for _ in range(pulls // session):
+        draw(session)
+    return (time.perf_counter() - start) / pulls * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Lottery 抽獎路徑基準")
+    parser.add_argument("-n", "--pulls", type=int, default=1_000_000)
+    parser.add_argument("--pool", type=int, default=1, help="奖池 ID（lottery）")
+    parser.add_argument("--session", type=int, default=10)
+    parser.add_argument("--max-us", type=float, default=None,
+                        help="sampler 每抽耗時上限（微秒），超過時回傳狀態碼 1")
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_all()
+    pool = registry.get("lottery", args.pool)
+    if pool is None:
+        raise SystemExit(f"找不到奖池：{args.pool}")
+
+    legacy  = _LegacyLottery(pool.name, pool.rewards)
+    current = Lottery(pool.name, pool.rewards)
+
+    # 預熱
+    measure(legacy.draw, 10_000, args.session)
+    measure(current.draw_many, 10_000, args.session)
+
+    random.seed(0)
+    before = measure(legacy.draw, args.pulls, args.session)
+    random.seed(0)
+    after  = measure(current.draw_many, args.pulls, args.session)
+
+    report = simulate(pool, players=1000, pulls=300, session=args.session,
+                      workers=1, seed=0)
+    rates = report.tier_rates()
+
+    print(f"奖池：{pool.name}，{args.pulls} 抽（每次 {args.session} 抽）")
+    print(f"  legacy  : {before:8.3f} µs / 抽")
+    print(f"  sampler : {after:8.3f} µs / 抽")
+    print(f"  加速    : {before / after:8.2f}×")
+    print(f"  出率（seed=0，1000 人 × 300 抽）：第一档 {rates.get('top', 0):.3%}"
+          f" / 第二档 {rates.get('second', 0):.3%}"
+          f"，平均 {report.mean_pulls_to_top:.2f} 抽出第一档")
+
+    if args.max_us is not None and after > args.max_us:
+        print(f"  ✗ 超過門檻 {args.max_us:.3f} µs / 抽")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+基準情境
+─────────────────────────────────────────────
+每個情境以 @scenario 登記，函數接收 (seed, scale)，完成所有準備工作
+（不計時）後回傳一個無參數的 callable；suite 只計時該 callable。
+callable 的回傳值是結果指紋（勝負 / 回合數 / 物品數量…），
+同一 seed 必須得到相同指紋，compare 用它偵測「變快了但結果也變了」。
+
+情境一覽見 python -m benchmarks.suite list。
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import random
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable
+
+from core.registry import registry
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name:        str
+    description: str
+    ops:         int                                    # scale=1 時每次執行的操作數
+    prepare:     Callable[[int, float], Callable[[], object]]
+
+    def scaled_ops(self, scale: float) -> int:
+        return max(1, int(self.ops * scale))
+
+
+SCENARIOS: dict[str, Scenario] = {}
+
+
+def scenario(name: str, description: str, ops: int):
+    def register(prepare):
+        SCENARIOS[name] = Scenario(name, description, ops, prepare)
+        return prepare
+    return register
+
+
+# ══════════════════════════════════════════════
+#  共用
+# ══════════════════════════════════════════════
+
+def _player(name: str = "基準", **stats):
+    """基準用玩家（預設屬性 + stats 覆寫）。"""
+    from common.character.player import Player
+
+    player = Player(name)
+    for attr, value in stats.items():
+        setattr(player.stats, attr, value)
+    return player
+
+
+def _fights(player_stats: dict, enemies: list, seed: int, fights: int):
+    """
+    連續 fights 場無人值守戰鬥（第 i 場種子 seed + i），每場使用新的玩家，
+    指紋為勝負與總回合數。
+    舊版技能的提示（echo → print）不寫到終端。
+    """
+    from common.battle.engine import BattleEngine
+    from common.event import EventBus, SilentBattleHandler
+
+    def run():
+        EventBus.clear()
+        EventBus.register(SilentBattleHandler())
+        results: Counter = Counter()
+        turns = 0
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                for i in range(fights):
+                    engine = BattleEngine(
+                        _player(**player_stats), [], enemies,
+                        headless=True, max_turns=200, seed=seed + i,
+                    )
+                    results[engine.run()] += 1
+                    turns += engine._turn_count
+        finally:
+            EventBus.clear()
+        return {"results": dict(sorted(results.items())), "turns": turns}
+
+    return run
+
+
+# ══════════════════════════════════════════════
+#  戰鬥
+# ══════════════════════════════════════════════
+
+@scenario("battle_1v1", "玩家 vs 敵人 500001，BattleEngine 逐場", ops=200)
+def battle_1v1(seed: int, scale: float):
+    enemies = [registry.get("enemy", 500001)]
+    fights  = SCENARIOS["battle_1v1"].scaled_ops(scale)
+    return _fights({"attack": 30.0, "max_hp": 1500.0, "hp": 1500.0}, enemies, seed, fights)
+
+
+@scenario("battle_1v5", "玩家 vs 5 名普攻敵人（500001 / 500002）", ops=50)
+def battle_1v5(seed: int, scale: float):
+    enemies = [registry.get("enemy", eid) for eid in (500001, 500002, 500001, 500002, 500001)]
+    fights  = SCENARIOS["battle_1v5"].scaled_ops(scale)
+    return _fights({"attack": 40.0, "max_hp": 4000.0, "hp": 4000.0}, enemies, seed, fights)
+
+
+@scenario("battle_boss_summon", "玩家 vs Boss 600001 + 4 名小怪（Boss 腳本 / 召喚 / 技能）", ops=20)
+def battle_boss_summon(seed: int, scale: float):
+    enemies = [registry.get("boss", 600001)] + [
+        registry.get("enemy", eid) for eid in (500001, 500002, 500003, 500004)
+    ]
+    fights  = SCENARIOS["battle_boss_summon"].scaled_ops(scale)
+    return _fights({"attack": 60.0, "max_hp": 8000.0, "hp": 8000.0}, enemies, seed, fights)
+
+
+# ══════════════════════════════════════════════
+#  資料載入
+# ══════════════════════════════════════════════
+
+@scenario("load_all", "core.data_loader.load_all()（不使用編譯快取）", ops=1)
+def load_all_cold(seed: int, scale: float):
+    from core.data_loader import load_all, _MANIFEST
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            load_all(use_cache=False)
+        return {c: len(registry.get_all(c)) for c in _MANIFEST}
+
+    return run
+
+
+@scenario("parser_load_json", "core.parser.load_json_to_dict() 解析全部資料檔", ops=1)
+def parser_load_json(seed: int, scale: float):
+    from core.data_loader import _MANIFEST
+    from core.parser import load_json_to_dict
+
+    paths = {c: str(p) for c, p in _MANIFEST.items() if p.exists()}
+
+    def run():
+        return {c: len(load_json_to_dict(p)) for c, p in paths.items()}
+
+    return run
+
+
+# ══════════════════════════════════════════════
+#  背包
+# ══════════════════════════════════════════════
+
+@scenario("inventory_ops", "Inventory.add / remove 隨機操作（40 種材料，容量 50）", ops=10_000)
+def inventory_ops(seed: int, scale: float):
+    from components.inventory import Inventory
+    from common.event import EventBus
+
+    rng   = random.Random(seed)
+    items = list(registry.get_all("material").values())[:40]
+    steps = []
+    held: Counter = Counter()
+    for _ in range(SCENARIOS["inventory_ops"].scaled_ops(scale)):
+        item = rng.choice(items)
+        if held[item.name] and rng.random() < 0.5:
+            qty = rng.randint(1, held[item.name])
+            held[item.name] -= qty
+            steps.append((False, item, qty))
+        else:
+            qty = rng.randint(1, 5)
+            held[item.name] += qty
+            steps.append((True, item, qty))
+
+    def run():
+        EventBus.clear()
+        inventory = Inventory(capacity=50, owner="基準")
+        add, remove = inventory.add, inventory.remove
+        for is_add, item, qty in steps:
+            if is_add:
+                add(item, qty)
+            else:
+                remove(item.name, qty)
+        return sorted(inventory.all_items)
+
+    return run
+
+
+# ══════════════════════════════════════════════
+#  EventBus
+# ══════════════════════════════════════════════
+
+@scenario("eventbus_emit", "EventBus.emit 分派給單一 subscriber", ops=1_000_000)
+def eventbus_emit(seed: int, scale: float):
+    from common.event import EventBus, InfoEvent
+
+    emits = SCENARIOS["eventbus_emit"].scaled_ops(scale)
+    event = InfoEvent(message="benchmark")
+
+    def run():
+        EventBus.clear()
+        received = [0]
+
+        def on_info(e):
+            received[0] += 1
+
+        EventBus.subscribe(InfoEvent, on_info)
+        emit = EventBus.emit
+        try:
+            for _ in range(emits):
+                emit(event)
+        finally:
+            EventBus.clear()
+        return received[0]
+
+    return run
@@ -0,0 +1,266 @@
+"""
+基準套件
+─────────────────────────────────────────────
+以固定 seed 執行 benchmarks.scenarios 中的情境，結果存成 JSON 基準檔，
+compare 與基準比較，耗時超過門檻或結果指紋改變時以狀態碼 1 結束（供 CI 偵測退化）。
+
+  python -m benchmarks.suite list
+  python -m benchmarks.suite run [--only battle_1v1 eventbus_emit] [--repeat 5] [--scale 1.0]
+                                 [-o benchmarks/baselines/baseline.json]
+                                 [--compare benchmarks/baselines/baseline.json] [--threshold 0.10]
+  python -m benchmarks.suite compare BASE.json CURRENT.json [--threshold 0.10]
+
+每個情境先預熱一次，再執行 repeat 次，以最短耗時（best）比較；
+--scale 按比例縮放操作數（快速檢查用），scale 不同的結果不互相比較。
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from core.data_loader import load_all
+from benchmarks.scenarios import SCENARIOS
+
+
+FORMAT = 1
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "baseline.json"
+
+
+# ══════════════════════════════════════════════
+#  執行
+# ══════════════════════════════════════════════
+
+def run_scenario(name: str, seed: int = 0, repeat: int = 5, scale: float = 1.0) -> dict:
+    """執行單一情境；情境拋出例外時記錄於 "error"，不中斷整個套件。"""
+    sc = SCENARIOS[name]
+    ops = sc.scaled_ops(scale)
+    try:
+        fn = sc.prepare(seed, scale)
+        check = _jsonable(fn())                 # 預熱
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - start)
+            if _jsonable(result) != check:
+                raise RuntimeError("同一 seed 的結果不一致")
+    except Exception as e:
+        return {"ops": ops, "error": f"{e.__class__.__name__}: {e}"}
+
+    best = min(times)
+    return {
+        "ops":       ops,
+        "best":      best,
+        "median":    statistics.median(times),
+        "times":     times,
+        "per_op_us": best / ops * 1e6,
+        "check":     check,
+    }
+
+
+def run_suite(
+    names: list[str] | None = None,
+    seed: int = 0,
+    repeat: int = 5,
+    scale: float = 1.0,
+    progress=None,
+) -> dict:
+    names = names or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise KeyError(f"未知的情境：{', '.join(unknown)}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_all()
+
+    results = {}
+    for name in names:
+        results[name] = run_scenario(name, seed, repeat, scale)
+        if progress is not None:
+            progress(name, results[name])
+
+    return {
+        "format":   FORMAT,
+        "created":  datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python":   platform.python_version(),
+        "platform": platform.platform(),
+        "seed":     seed,
+        "repeat":   repeat,
+        "scale":    scale,
+        "results":  results,
+    }
+
+
+def _jsonable(value):
+    """指紋經 JSON 往返後再比較（tuple → list、int 鍵 → str 鍵），與存檔後一致。"""
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+# ══════════════════════════════════════════════
+#  基準檔
+# ══════════════════════════════════════════════
+
+def save(report: dict, path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def load(path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    if report.get("format") != FORMAT:
+        raise SystemExit(f"{path}：不支援的基準檔格式 {report.get('format')!r}")
+    return report
+
+
+# ══════════════════════════════════════════════
+#  比較
+# ══════════════════════════════════════════════
+
+def compare(base: dict, current: dict, threshold: float = 0.10) -> list[dict]:
+    """
+    逐情境比較 best 耗時，回傳每列：
+      {"name", "status", "base", "current", "ratio"}
+    status：
+      ok / faster / slower  : ratio = current / base 與 1 ± threshold 比較
+      changed               : 結果指紋不同（行為改變）
+      error / fixed         : 新出現的錯誤 / 基準中的錯誤已不再發生
+      known-error           : 基準與目前都失敗（不視為退化）
+      new / missing         : 只存在於其中一邊
+    """
+    if base.get("scale") != current.get("scale") or base.get("seed") != current.get("seed"):
+        raise ValueError(
+            f"scale / seed 不同，無法比較（基準 {base.get('scale')} / {base.get('seed')}，"
+            f"目前 {current.get('scale')} / {current.get('seed')}）"
+        )
+
+    rows = []
+    old, new = base["results"], current["results"]
+    for name in list(old) + [n for n in new if n not in old]:
+        b, c = old.get(name), new.get(name)
+        row = {"name": name, "base": None, "current": None, "ratio": None}
+        if b is None:
+            row["status"] = "new"
+        elif c is None:
+            row["status"] = "missing"
+        elif "error" in c:
+            row["status"] = "known-error" if "error" in b else "error"
+        elif "error" in b:
+            row["status"] = "fixed"
+        else:
+            row["base"], row["current"] = b["best"], c["best"]
+            row["ratio"] = ratio = c["best"] / b["best"]
+            if c["check"] != b["check"]:
+                row["status"] = "changed"
+            elif ratio > 1 + threshold:
+                row["status"] = "slower"
+            elif ratio < 1 / (1 + threshold):
+                row["status"] = "faster"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def is_regression(rows: list[dict]) -> bool:
+    return any(r["status"] in ("slower", "changed", "error") for r in rows)
+
+
+def format_rows(rows: list[dict], threshold: float) -> str:
+    marks = {"slower": "✗", "changed": "✗", "error": "✗", "faster": "↑"}
+    lines = [f"{'情境':<20} {'基準':>10} {'目前':>10} {'比例':>8}  狀態（門檻 ±{threshold:.0%}）"]
+    for r in rows:
+        base = f"{r['base'] * 1e3:.2f}ms" if r["base"] is not None else "-"
+        cur  = f"{r['current'] * 1e3:.2f}ms" if r["current"] is not None else "-"
+        ratio = f"{r['ratio']:.2f}×" if r["ratio"] is not None else "-"
+        lines.append(
+            f"{r['name']:<20} {base:>10} {cur:>10} {ratio:>8}  "
+            f"{marks.get(r['status'], ' ')} {r['status']}"
+        )
+    return "\n".join(lines)
+
+
+# ══════════════════════════════════════════════
+#  命令行
+# ══════════════════════════════════════════════
+
+def _print_result(name: str, result: dict) -> None:
+    if "error" in result:
+        print(f"  {name:<20} 錯誤：{result['error']}")
+        return
+    print(
+        f"  {name:<20} best {result['best'] * 1e3:9.2f} ms"
+        f"  median {result['median'] * 1e3:9.2f} ms"
+        f"  {result['per_op_us']:10.3f} µs/op  × {result['ops']}"
+    )
+
+
+def _report_comparison(base: dict, current: dict, threshold: float) -> None:
+    try:
+        rows = compare(base, current, threshold)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    print(format_rows(rows, threshold))
+    if is_regression(rows):
+        sys.exit(1)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="效能基準套件")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="列出所有情境")
+
+    run = sub.add_parser("run", help="執行情境")
+    run.add_argument("--only", nargs="+", metavar="NAME", help="只執行指定情境")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--scale", type=float, default=1.0, help="操作數比例")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("-o", "--output", help="結果寫入 JSON（例如作為新的基準檔）")
+    run.add_argument("--compare", metavar="BASELINE", nargs="?", const=str(DEFAULT_BASELINE),
+                     help="與基準檔比較（未指定路徑時為 benchmarks/baselines/baseline.json）")
+    run.add_argument("--threshold", type=float, default=0.10, help="變慢門檻（比例）")
+
+    cmp = sub.add_parser("compare", help="比較兩個結果檔")
+    cmp.add_argument("base")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for sc in SCENARIOS.values():
+            print(f"  {sc.name:<20} {sc.ops:>9} ops  {sc.description}")
+        return
+
+    if args.command == "compare":
+        _report_comparison(load(args.base), load(args.current), args.threshold)
+        return
+
+    try:
+        report = run_suite(args.only, args.seed, args.repeat, args.scale, progress=_print_result)
+    except KeyError as e:
+        raise SystemExit(e.args[0])
+    if args.output:
+        save(report, args.output)
+        print(f"已寫入 {args.output}")
+    if args.compare:
+        print()
+        _report_comparison(load(args.compare), report, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
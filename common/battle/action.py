@@ -2,7 +2,7 @@
 ActionMenu
 負責玩家回合的所有輸入互動。
 不直接修改戰場狀態，不直接 print，
-狀態提示一律透過 EventBus 發送。
+狀態提示一律透過 EventBus 發送，選單經 echo() 與戰鬥輸出同序寫出。
 """
 
 from common.module.item import Skill, Equipment, Medicine, Product
@@ -10,9 +10,17 @@ from common.event import (
     EventBus,
     StatusBlockedActionEvent,
     WarningEvent,
+    drain_all,
+    echo,
 )
 
 
+def _ask(prompt: str) -> str:
+    """等待輸入前先送出所有 sink 的緩衝，確保提示出現在戰鬥輸出之後。"""
+    drain_all()
+    return input(prompt).strip()
+
+
 class ActionMenu:
 
     def run(self, player, battle) -> str:
@@ -25,18 +33,18 @@ class ActionMenu:
         """
         while True:
             self._display_status(player, battle)
-            print(f"\n{'─'*30}")
-            print(f"  {player.name} 的回合！請選擇行動：")
-            print("  1. 普通攻擊")
-            print("  2. 使用技能")
-            print("  3. 使用法寶")
-            print("  4. 使用藥品")
-            print("  5. 使用道具")
-            print("  6. 開啟／關閉自動戰鬥")
-            print("  7. 返回上一級")
-            print("  8. 結束戰鬥")
-            print(f"{'─'*30}")
-            choice = input("請輸入選項編號：").strip()
+            echo(f"\n{'─'*30}")
+            echo(f"  {player.name} 的回合！請選擇行動：")
+            echo("  1. 普通攻擊")
+            echo("  2. 使用技能")
+            echo("  3. 使用法寶")
+            echo("  4. 使用藥品")
+            echo("  5. 使用道具")
+            echo("  6. 開啟／關閉自動戰鬥")
+            echo("  7. 返回上一級")
+            echo("  8. 結束戰鬥")
+            echo(f"{'─'*30}")
+            choice = _ask("請輸入選項編號：")
 
             if choice == "1":
                 if self._attack(player, battle):
@@ -61,7 +69,7 @@ class ActionMenu:
             elif choice == "6":
                 battle.auto_battle = not battle.auto_battle
                 state = "開啟" if battle.auto_battle else "關閉"
-                print(f"[自動戰鬥] 已{state}。")
+                echo(f"[自動戰鬥] 已{state}。")
                 return "acted"
 
             elif choice == "7":
@@ -108,11 +116,7 @@ class ActionMenu:
         return False
 
     def _use_medicine(self, player, battle) -> bool:
-        medicines = [  # ← 修复迭代
-            slot.item
-            for slot in player.inventory._slots.values()
-            if isinstance(slot.item, Medicine)
-        ]
+        medicines = [slot.item for slot in player.inventory.iter_by_type(Medicine)]
         if not medicines:
             EventBus.emit(WarningEvent(message="你沒有可用的藥品。"))
             return False
@@ -126,11 +130,7 @@ class ActionMenu:
         return False
 
     def _use_product(self, player, battle) -> bool:
-        products = [  # ← 修复迭代
-            slot.item
-            for slot in player.inventory._slots.values()
-            if isinstance(slot.item, Product)
-        ]
+        products = [slot.item for slot in player.inventory.iter_by_type(Product)]
         if not products:
             EventBus.emit(WarningEvent(message="你沒有可用的道具。"))
             return False
@@ -177,10 +177,10 @@ class ActionMenu:
                     else [battle.player] + [a for a in battle.allies if a.hp > 0]
                 )
                 label = "全體敵人" if target_type == "enemy" else "全體我方"
-                print(f"\n選擇目標：")
-                print(f"  1. {label}（共 {len(targets)} 個）")
-                print("  0. 返回上一級")
-                choice = input("請輸入選項編號：").strip()
+                echo(f"\n選擇目標：")
+                echo(f"  1. {label}（共 {len(targets)} 個）")
+                echo("  0. 返回上一級")
+                choice = _ask("請輸入選項編號：")
                 if choice == "0":
                     return None
                 if choice == "1":
@@ -193,11 +193,11 @@ class ActionMenu:
                     if not candidates:
                         EventBus.emit(WarningEvent(message="沒有可選的敵人目標。"))
                         return None
-                    print("\n選擇攻擊的敵人：")
+                    echo("\n選擇攻擊的敵人：")
                     for i, e in enumerate(candidates, 1):
-                        print(f"  {i}. {e.name}（HP: {e.hp}/{e.max_hp}）")
-                    print("  0. 返回上一級")
-                    choice = input("請輸入選項編號：").strip()
+                        echo(f"  {i}. {e.name}（HP: {e.hp}/{e.max_hp}）")
+                    echo("  0. 返回上一級")
+                    choice = _ask("請輸入選項編號：")
                     if choice == "0":
                         return None
                     if choice.isdigit() and 1 <= int(choice) <= len(candidates):
@@ -206,11 +206,11 @@ class ActionMenu:
 
                 elif target_type == "ally":
                     candidates = [battle.player] + [a for a in battle.allies if a.hp > 0]
-                    print("\n選擇目標：")
+                    echo("\n選擇目標：")
                     for i, c in enumerate(candidates, 1):
-                        print(f"  {i}. {c.name}（HP: {c.hp}/{c.max_hp}）")
-                    print("  0. 返回上一級")
-                    choice = input("請輸入選項編號：").strip()
+                        echo(f"  {i}. {c.name}（HP: {c.hp}/{c.max_hp}）")
+                    echo("  0. 返回上一級")
+                    choice = _ask("請輸入選項編號：")
                     if choice == "0":
                         return None
                     if choice.isdigit() and 1 <= int(choice) <= len(candidates):
@@ -219,14 +219,14 @@ class ActionMenu:
 
     def choose_item(self, items: list):
         while True:
-            print("\n選擇使用的技能 / 法寶 / 道具：")
+            echo("\n選擇使用的技能 / 法寶 / 道具：")
             for i, item in enumerate(items, 1):
                 extra = ""
                 if hasattr(item, "frequency") and item.frequency is not None:
                     extra = f"  [剩餘次數: {item.frequency}]"
-                print(f"  {i}. {item.name} — {item.description}{extra}")
-            print("  0. 返回上一級")
-            choice = input("請輸入選項編號：").strip()
+                echo(f"  {i}. {item.name} — {item.description}{extra}")
+            echo("  0. 返回上一級")
+            choice = _ask("請輸入選項編號：")
             if choice == "0":
                 return None
             if choice.isdigit() and 1 <= int(choice) <= len(items):
@@ -239,14 +239,14 @@ class ActionMenu:
 
     @staticmethod
     def _display_status(player, battle) -> None:
-        print(f"\n{'═'*40}")
-        print(f"  {player.name}  HP: {player.hp}/{player.max_hp}  MP: {player.mp}/{player.max_mp}")
+        echo(f"\n{'═'*40}")
+        echo(f"  {player.name}  HP: {player.hp}/{player.max_hp}  MP: {player.mp}/{player.max_mp}")
         for ally in battle.allies:
             if ally.hp > 0:
-                print(f"  {ally.name}  HP: {ally.hp}/{ally.max_hp}  MP: {ally.mp}/{ally.max_mp}")
-        print(f"{'─'*40}")
-        print("  敵人：")
+                echo(f"  {ally.name}  HP: {ally.hp}/{ally.max_hp}  MP: {ally.mp}/{ally.max_mp}")
+        echo(f"{'─'*40}")
+        echo("  敵人：")
         for enemy in battle.enemies:
             if enemy.hp > 0:
-                print(f"    {enemy.name}  HP: {enemy.hp}/{enemy.max_hp}")
-        print(f"{'═'*40}")
\ No newline at end of file
+                echo(f"    {enemy.name}  HP: {enemy.hp}/{enemy.max_hp}")
+        echo(f"{'═'*40}")
\ No newline at end of file
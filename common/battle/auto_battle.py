@@ -13,6 +13,9 @@ from common.event import (
 
 class AutoBattleAI:
 
+    def __init__(self, rng=random):
+        self.rng = rng              # 目標選擇（BattleEngine 傳入 ai 子串流）
+
     def decide(self, player, battle) -> None:
         """
         自動決策並執行一次行動。
@@ -139,10 +142,10 @@ class AutoBattleAI:
 
     def _pick_enemy(self, battle):
         available = [e for e in battle.enemies if e.hp > 0]
-        return random.choice(available) if available else None
+        return self.rng.choice(available) if available else None
 
     def _pick_ally(self, player, battle, scope="single"):
         available = [player] + [a for a in battle.allies if a.hp > 0]
         if scope == "user":
             return player
-        return random.choice(available) if available else None
+        return self.rng.choice(available) if available else None
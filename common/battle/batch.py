@@ -0,0 +1,297 @@
+"""
+BattleBatch
+同一陣容的 K 場戰鬥以 struct-of-arrays 同步推進（數值平衡的快速路徑）。
+
+BattleEngine 每場戰鬥是一組 Combatant 物件，每次攻擊都經過
+property（Player → Stats）、EventBus 與 Handler；BattleBatch 改為：
+  - 每個參戰位置（slot）的可變狀態存成長度 K 的 array：
+      hp / max_hp / mp / max_mp / attack / defense / level
+    （玩家升級會改變 max_hp / attack / defense / level，因此逐場保存）
+  - 不會變動的屬性（speed / crit / crit_damage / penetration / resistance / exp_drops）
+    每個 slot 只存一份
+  - 每回合依行動順序逐 slot 處理所有仍在進行的戰鬥
+
+規則與 BattleEngine 一致：
+  - 傷害公式共用 combatant.damage_coefficients()（暴擊、浮動、保底傷害、取兩位小數）
+  - 玩家依 AutoBattleAI 普攻隨機存活敵人；隊友依 Ally.choose_action 普攻隨機存活敵人；
+    敵人依 Enemy.choose_action 普攻 [玩家] + 上回合結束時仍存活的隊友
+  - 回合開始夾 HP 上限；每次行動後判定勝負；回合結束處理經驗 / 升級 / 掉落
+  - 每場使用獨立的 BattleRNG（seeds[k]），抽取順序與 BattleEngine 相同，
+    BattleEngine(..., seed=batch.seeds[k]) 可重現第 k 場
+
+只支援「普通攻擊」陣容：任何參戰者帶有技能、Boss 腳本或開場 Buff 時
+拋出 BatchUnsupportedError，請改用 BattleEngine / simulator.simulate()。
+
+環境沒有 NumPy，欄位以標準庫 array 儲存、逐場迴圈推進。
+
+用法：
+    batch = BattleBatch(player, [enemy_a, enemy_b], fights=10_000, seed=1)
+    report = batch.run()              # SimulationReport
+"""
+from __future__ import annotations
+
+import random
+from array import array
+from collections import Counter
+
+from common.battle.combatant import damage_coefficients
+from common.battle.drop_processor import DropProcessor
+from common.battle.rng import BattleRNG
+
+
+class BatchUnsupportedError(ValueError):
+    """陣容含 BattleBatch 未模擬的機制（技能 / Boss 腳本 / Buff）。"""
+
+
+# 勝負狀態
+ONGOING, WIN, LOSS, TIMEOUT = 0, 1, 2, 3
+_RESULT_NAMES = {WIN: "win", LOSS: "loss", TIMEOUT: "timeout"}
+
+
+class BattleBatch:
+
+    COLUMNS = ("hp", "max_hp", "mp", "max_mp", "attack", "defense", "level")
+    STATIC  = ("speed", "crit", "crit_damage", "penetration", "resistance")
+
+    def __init__(
+        self,
+        player,
+        enemies: list,
+        fights: int,
+        allies: list | None = None,
+        seed: int | None = None,
+        max_turns: int | None = 200,
+    ):
+        allies  = list(allies or [])
+        enemies = list(enemies)
+        roster  = [player] + allies + enemies
+        for p in roster:
+            self._check_supported(p)
+
+        self.fights    = fights
+        self.max_turns = max_turns
+        self.roster    = roster
+        self.names     = [p.name for p in roster]
+        self.player    = 0
+        self.allies    = list(range(1, 1 + len(allies)))
+        self.enemies   = list(range(1 + len(allies), len(roster)))
+
+        # ── struct-of-arrays ──────────────────────────────────
+        self.columns: dict[str, list[array]] = {
+            name: [array("d", [float(getattr(p, name))]) * fights for p in roster]
+            for name in self.COLUMNS
+        }
+        self.static: dict[str, list[float]] = {
+            name: [float(getattr(p, name)) for p in roster] for name in self.STATIC
+        }
+        self.exp_drops = [getattr(p, "exp_drops", 0) for p in roster]
+
+        stats = player.stats
+        self.exp         = array("q", [int(stats.exp)]) * fights
+        self.exp_to_next = array("q", [int(stats.exp_to_next)]) * fights
+
+        # ── 逐場狀態 ──────────────────────────────────────────
+        master = random.Random(seed) if seed is not None else random
+        self.seeds  = [master.getrandbits(63) for _ in range(fights)]
+        self.rngs   = [BattleRNG(s) for s in self.seeds]
+        self.status = array("b", [ONGOING]) * fights
+        self.turns  = array("l", [0]) * fights
+        # 敵人可選目標（玩家 + 上回合結束時存活的隊友）
+        self.enemy_targets = [[self.player] + self.allies for _ in range(fights)]
+        self.dropped = [set() for _ in range(fights)]
+
+        # 行動順序：與 TurnManager 相同（穩定排序，死亡者於行動時跳過）
+        speed = self.static["speed"]
+        self.order = sorted(range(len(roster)), key=lambda s: speed[s], reverse=True)
+
+        self.report = None
+        self._coefficients: dict = {}
+
+    @staticmethod
+    def _check_supported(p) -> None:
+        from common.character.boss import Boss
+
+        if isinstance(p, Boss):
+            raise BatchUnsupportedError(f"{p.name}：Boss 腳本不支援批量模擬")
+        if list(p.skills):
+            raise BatchUnsupportedError(f"{p.name}：帶有技能，不支援批量模擬")
+        bs = p.battle_state
+        if bs.active_buffs or bs.shield:
+            raise BatchUnsupportedError(f"{p.name}：帶有 Buff / 護盾，不支援批量模擬")
+
+    # ── 推進 ──────────────────────────────────────────────────
+
+    def run(self):
+        """推進到全部戰鬥結束，回傳 SimulationReport。"""
+        from common.battle.simulator import SimulationReport
+
+        self.report = report = SimulationReport()
+        active = list(range(self.fights))
+        turn = 0
+        while active:
+            if self.max_turns is not None and turn >= self.max_turns:
+                for k in active:
+                    self.status[k] = TIMEOUT
+                    self.turns[k]  = turn
+                break
+            turn += 1
+            active = self.step(active, turn)
+
+        report.fights = self.fights
+        for k in range(self.fights):
+            result, turns = self.status[k], self.turns[k]
+            report.total_turns += turns
+            report.turn_counts[turns] += 1
+            if result == WIN:
+                report.wins += 1
+            elif result == LOSS:
+                report.losses += 1
+            else:
+                report.timeouts += 1
+        return report
+
+    def step(self, active: list, turn: int) -> list:
+        """所有 active 戰鬥推進一回合，回傳仍在進行的戰鬥。"""
+        cols    = self.columns
+        hp      = cols["hp"]
+        max_hp  = cols["max_hp"]
+        mp      = cols["mp"]
+        max_mp  = cols["max_mp"]
+        attack  = cols["attack"]
+        defense = cols["defense"]
+        level   = cols["level"]
+        static  = self.static
+        crit, crit_damage = static["crit"], static["crit_damage"]
+        penetration, resistance = static["penetration"], static["resistance"]
+
+        player, allies, enemies = self.player, self.allies, self.enemies
+        status, turns, rngs = self.status, self.turns, self.rngs
+        coefficients = self._coefficients
+        report = self.report
+
+        # 1. 回合開始：玩家 update_stats + 全體夾 HP / MP 上限
+        p_hp, p_max = hp[player], max_hp[player]
+        p_mp, p_mmp = mp[player], max_mp[player]
+        for k in active:
+            if p_hp[k] > p_max[k]:
+                p_hp[k] = p_max[k]
+            if p_mp[k] > p_mmp[k]:
+                p_mp[k] = p_mmp[k]
+        for s in self.order:
+            s_hp, s_max, s_mp, s_mmp = hp[s], max_hp[s], mp[s], max_mp[s]
+            for k in active:
+                cap = 1.1 * s_max[k]
+                if s_hp[k] > cap:
+                    s_hp[k] = cap
+                if s_mp[k] > s_mmp[k]:
+                    s_mp[k] = s_mmp[k]
+
+        # 2. 依行動順序
+        running = active
+        for s in self.order:
+            is_enemy = s >= enemies[0] if enemies else False
+            s_hp, s_atk, s_lvl = hp[s], attack[s], level[s]
+            s_crit, s_cdmg, s_pen = crit[s], crit_damage[s], penetration[s]
+            still = []
+            for k in running:
+                if s_hp[k] <= 0:
+                    still.append(k)
+                    continue
+                rng = rngs[k]
+
+                # 選目標（AI 子串流）
+                if is_enemy:
+                    t = rng.ai.choice(self.enemy_targets[k])
+                else:
+                    alive = [e for e in enemies if hp[e][k] > 0]
+                    t = rng.ai.choice(alive)
+
+                # 傷害（damage 子串流，與 Combatant.calculate_damage 相同）
+                a_lvl, t_lvl = s_lvl[k], level[t][k]
+                key = (s, t, a_lvl, t_lvl)
+                coef = coefficients.get(key)
+                if coef is None:
+                    coef = coefficients[key] = damage_coefficients(
+                        a_lvl, s_crit, s_cdmg, s_pen, t_lvl, resistance[t],
+                    )
+                crit_chance, crit_multiplier, pen_factor, suppression = coef
+                damage_rng = rng.damage
+                base = s_atk[k]
+                is_critical = damage_rng.random() < crit_chance
+                damage = base * 1.0
+                if is_critical:
+                    damage *= crit_multiplier
+                damage = (
+                    (damage - defense[t][k]) * pen_factor * suppression
+                    * damage_rng.randint(900, 1100) / 1000
+                )
+                damage = round(max(0.05 * base, damage), 2)
+
+                # 统计实际扣除的 HP（与 DamageAppliedEvent 一致，不计溢出）
+                t_hp = hp[t]
+                before = t_hp[k]
+                t_hp[k] = max(0.0, before - damage)
+                if is_enemy:
+                    report.damage_taken += before - t_hp[k]
+                else:
+                    report.damage_dealt += before - t_hp[k]
+
+                # 勝負判定
+                result = self._check(k)
+                if result != ONGOING:
+                    status[k] = result
+                    turns[k]  = turn
+                    continue
+                still.append(k)
+            running = still
+
+        # 3. 回合結束：經驗 / 升級 / 掉落，更新敵人可選目標
+        for k in running:
+            dropped = self.dropped[k]
+            for e in enemies:
+                if hp[e][k] <= 0 and e not in dropped:
+                    dropped.add(e)
+                    self._gain_exp(k, self.exp_drops[e])
+                    self._roll_drops(k, e)
+            self.enemy_targets[k] = [player] + [a for a in allies if hp[a][k] > 0]
+        return running
+
+    # ── 輔助 ──────────────────────────────────────────────────
+
+    def _check(self, k: int) -> int:
+        hp = self.columns["hp"]
+        player_down = hp[self.player][k] <= 0
+        allies_down = all(hp[a][k] <= 0 for a in self.allies)
+        if player_down and allies_down:
+            return LOSS
+        if all(hp[e][k] <= 0 for e in self.enemies):
+            return WIN
+        return ONGOING
+
+    def _gain_exp(self, k: int, amount: int) -> None:
+        """與 Stats.gain_exp / _level_up 相同的升級規則。"""
+        cols, s = self.columns, self.player
+        exp = self.exp[k] + amount
+        while exp >= self.exp_to_next[k]:
+            exp -= self.exp_to_next[k]
+            self.exp_to_next[k] = int(self.exp_to_next[k] * 1.2)
+            cols["level"][s][k]   += 1
+            cols["max_hp"][s][k]  += 10
+            cols["hp"][s][k]       = cols["max_hp"][s][k]
+            cols["max_mp"][s][k]  += 5
+            cols["mp"][s][k]       = cols["max_mp"][s][k]
+            cols["attack"][s][k]  += 2
+            cols["defense"][s][k] += 1
+        self.exp[k] = exp
+
+    def _roll_drops(self, k: int, e: int) -> None:
+        table = DropProcessor.table_for(self.roster[e])
+        yields: Counter = self.report.drop_yields
+        for item_id, qty in table.roll(self.rngs[k].drops).items():
+            prototype = table.prototypes.get(item_id)
+            if prototype is not None:
+                yields[prototype.name] += qty
+
+    def result(self, k: int) -> tuple[str, int]:
+        """第 k 場的 (結果, 回合數)。"""
+        return _RESULT_NAMES.get(self.status[k], "ongoing"), self.turns[k]
@@ -21,7 +21,7 @@ Player / Enemy / Boss / Ally 都繼承此類。
 from __future__ import annotations
 import copy
 import uuid
-import random
+from math import floor
 
 from common.event import (
     EventBus,
@@ -34,6 +34,63 @@ from common.event import (
     WarningEvent,
 )
 from components.battle_state import BattleState
+from common.battle.rng import battle_rng
+from common.module.item import resolve_reference
+
+
+# ── 等級壓制查表 ─────────────────────────────────────────────
+#  等級差夾在 ±50 之間後直接索引（超出範圍的倍率與邊界相同）
+
+_SUPPRESSION_THRESHOLDS = (
+    (50,  1.5), (40,  1.4), (30,  1.3), (20,  1.2), (10,  1.1),
+    (-9,  1.0),
+    (-19, 0.9), (-29, 0.8), (-39, 0.7), (-49, 0.6),
+)
+_SUPPRESSION_FLOOR = 0.5
+_SUPPRESSION_SPAN  = 50
+
+
+def _build_suppression_table() -> tuple[float, ...]:
+    table = []
+    for diff in range(-_SUPPRESSION_SPAN, _SUPPRESSION_SPAN + 1):
+        for threshold, multiplier in _SUPPRESSION_THRESHOLDS:
+            if diff >= threshold:
+                table.append(multiplier)
+                break
+        else:
+            table.append(_SUPPRESSION_FLOOR)
+    return tuple(table)
+
+
+_SUPPRESSION_TABLE = _build_suppression_table()
+
+# 每個攻擊者最多保留的傷害係數組數（屬性頻繁變動時整批重建）
+_DAMAGE_CACHE_SIZE = 64
+
+
+def level_suppression(diff) -> float:
+    """等級差 → 傷害倍率（超出 ±50 時與邊界相同）。"""
+    if diff > _SUPPRESSION_SPAN:
+        diff = _SUPPRESSION_SPAN
+    elif diff < -_SUPPRESSION_SPAN:
+        diff = -_SUPPRESSION_SPAN
+    return _SUPPRESSION_TABLE[floor(diff) + _SUPPRESSION_SPAN]
+
+
+def damage_coefficients(
+    level, crit, crit_damage, penetration, target_level, resistance,
+) -> tuple[float, float, float, float]:
+    """
+    calculate_damage 用的 (暴擊率, 暴擊倍率, 穿透倍率, 等級壓制倍率)。
+    BattleBatch 與 Combatant 共用同一公式；穿透與壓制分開回傳，
+    呼叫端依原公式的順序逐一相乘，結果與未快取時逐位元相同。
+    """
+    return (
+        crit / 100.0,
+        crit_damage / 100.0,
+        1 + (penetration - resistance) / 100.0,
+        level_suppression(level - target_level),
+    )
 
 
 class Combatant:
@@ -70,11 +127,19 @@ class Combatant:
         self.skills    = skills    if skills    is not None else []
         self.equipment = equipment if equipment is not None else []
 
+        self._init_battle_fields()
+
+    def _init_battle_fields(self) -> None:
+        """
+        與屬性無關的戰鬥欄位。
+        Player 的屬性由 Stats 代理（唯讀 property），不經過 Combatant.__init__，
+        只呼叫這裡。
+        """
         # 戰鬥中的技能副本（由 BattleEngine 初始化）
         self.battle_skills: list = []
 
         # 戰鬥狀態（Buff / 狀態異常 / 護盾）
-        self.battle_state = BattleState(owner=name)
+        self.battle_state = BattleState(owner=self.name)
 
         # 持續效果（舊版相容，逐步遷移中）
         self.sustained_effects: list = []
@@ -85,6 +150,9 @@ class Combatant:
         # 唯一 ID（區分同名實例）
         self.unique_id = uuid.uuid4()
 
+        # 傷害係數快取（見 _damage_coefficients）
+        self._damage_coeffs: dict = {}
+
     # ── 狀態判斷 ────────────────────────────────────────────
 
     @property
@@ -120,19 +188,26 @@ class Combatant:
         計算最終傷害值，不修改任何狀態。
         回傳 (final_damage, is_critical)。
         """
-        is_critical     = random.random() < self.crit / 100.0
-        crit_multiplier = self.crit_damage / 100.0 if is_critical else 1.0
-
-        theoretical_damage = base_value * skill_multiplier * crit_multiplier
+        rng = battle_rng(self, "damage")
+        key = (
+            self.level, self.crit, self.crit_damage, self.penetration,
+            target.level, target.resistance,
+        )
+        coefficients = self._damage_coeffs.get(key)
+        if coefficients is None:
+            coefficients = self._damage_coefficients(key)
+        crit_chance, crit_multiplier, penetration, suppression = coefficients
 
-        level_difference  = self.level - target.level
-        level_suppression = self._calc_level_suppression(level_difference)
+        is_critical = rng.random() < crit_chance
+        theoretical_damage = base_value * skill_multiplier
+        if is_critical:
+            theoretical_damage *= crit_multiplier
 
         final_damage = (
             (theoretical_damage - target.defense)
-            * (1 + (self.penetration - target.resistance) / 100.0)
-            * level_suppression
-            * random.randint(900, 1100) / 1000
+            * penetration
+            * suppression
+            * rng.randint(900, 1100) / 1000
         )
 
         # 保底傷害
@@ -140,17 +215,23 @@ class Combatant:
 
         return final_damage, is_critical
 
+    def _damage_coefficients(self, key: tuple) -> tuple[float, float, float, float]:
+        """
+        計算並記錄 damage_coefficients(*key)：
+          key = (等級, 暴擊, 暴擊傷害, 穿透, 目標等級, 目標抗性)
+        每次命中仍會讀取這六個屬性組成鍵，省下的只是係數本身的計算；
+        沒有失效機制，屬性改變時自然換成新鍵。
+        """
+        cache = self._damage_coeffs
+        if len(cache) >= _DAMAGE_CACHE_SIZE:
+            cache = self._damage_coeffs = {}
+
+        coefficients = cache[key] = damage_coefficients(*key)
+        return coefficients
+
     @staticmethod
     def _calc_level_suppression(diff: int) -> float:
-        thresholds = [
-            (50,  1.5), (40,  1.4), (30,  1.3), (20,  1.2), (10,  1.1),
-            (-9,  1.0),
-            (-19, 0.9), (-29, 0.8), (-39, 0.7), (-49, 0.6),
-        ]
-        for threshold, multiplier in thresholds:
-            if diff >= threshold:
-                return multiplier
-        return 0.5
+        return level_suppression(diff)
 
     # ── 核心戰鬥方法 ────────────────────────────────────────
 
@@ -186,6 +267,7 @@ class Combatant:
             target=target.name,
             amount=round(damage, 2),
             damage_type="physical",
+            target_id=str(target.unique_id),
         ))
 
         return damage
@@ -200,6 +282,7 @@ class Combatant:
             target=self.name,
             amount=amount,
             damage_type=damage_type,
+            target_id=str(self.unique_id),
         ))
 
     def heal(self, amount: float, attr: str = "hp") -> None:
@@ -212,6 +295,7 @@ class Combatant:
             target=self.name,
             amount=amount,
             attr=attr,
+            target_id=str(self.unique_id),
         ))
 
     def use_skill(self, skill, target) -> None:
@@ -279,6 +363,7 @@ class Combatant:
             duration=duration,
             effect=effect,
             chance=chance,
+            target_id=str(self.unique_id),
         ))
 
     def request_remove_buff(
@@ -294,6 +379,7 @@ class Combatant:
             scope=scope,
             buff_name=buff_name,
             buff_type=buff_type,
+            target_id=str(self.unique_id),
         ))
 
     # ── 多態接口（子類必須實現）────────────────────────────
@@ -303,6 +389,42 @@ class Combatant:
             f"{self.__class__.__name__} 未實現 choose_action()"
         )
 
+    # ── 戰鬥實例複製 ────────────────────────────────────────
+
+    def battle_clone(self) -> "Combatant":
+        """
+        從原型建立戰鬥用實例（BattleEngine / Battle 開戰時呼叫）。
+        比 deepcopy 輕量：
+          - 共享不可變的原型資料：description / drops / chance_drops /
+            skills 內的技能定義 / summon_list / logic_module
+          - 只複製可變狀態：hp / mp 等數值欄位（淺拷貝即獨立）、
+            battle_state、sustained_effects、技能與裝備列表本身
+        列表中的引用字串（"skill_library[...]" 等）在此解析為 registry 原型。
+        battle_skills 由 Engine 另行以 Item.battle_copy() 建立。
+        """
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.skills            = [resolve_reference(s) for s in self.skills]
+        clone.equipment         = [resolve_reference(e) for e in self.equipment]
+        clone.battle_skills     = []
+        clone.battle_state      = self._clone_battle_state()
+        clone.sustained_effects = (
+            copy.deepcopy(self.sustained_effects) if self.sustained_effects else []
+        )
+        clone.battle            = None
+        clone.unique_id         = uuid.uuid4()
+        clone._damage_coeffs    = {}
+        if hasattr(clone, "module_object"):
+            clone.module_object = None
+        return clone
+
+    def _clone_battle_state(self) -> BattleState:
+        """原型通常沒有 Buff / 護盾，直接建新的；有殘留狀態時才深拷貝。"""
+        bs = self.battle_state
+        if not bs.active_buffs and not bs.shield:
+            return BattleState(owner=bs.owner)
+        return copy.deepcopy(bs)
+
     # ── deepcopy ────────────────────────────────────────────
 
     def _copy_base_fields(self, new_obj: "Combatant", memo: dict) -> None:
@@ -315,6 +437,7 @@ class Combatant:
         new_obj.battle_skills     = copy.deepcopy(self.battle_skills, memo)
         new_obj.battle            = self.battle   # 淺引用，Engine 重新注入
         new_obj.unique_id         = uuid.uuid4()  # 新實例給新 ID
+        new_obj._damage_coeffs    = {}
 
     # ── 顯示 ────────────────────────────────────────────────
 
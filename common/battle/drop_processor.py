@@ -4,12 +4,19 @@ DropProcessor
   1. 合併必掉 + 機率掉落
   2. 透過 Registry 查找物品原型
   3. 加入玩家背包
+
+每種敵人的掉落在首次擊殺時編譯成 DropTable（原型、分類、數量分佈都預先解析），
+之後的擊殺 / 模擬直接擲骰。大量擊殺可用 roll_batch() 分組合併計算：
+同種敵人的命中次數一次抽出，不逐次擲骰。
 """
 import copy
 import random
+from dataclasses import dataclass
+from math import floor, log, log1p
 
 from common.module.item import Equipment, Material, Product, Medicine, Warp, Skill
 from core.registry import registry
+from core.drop_resolver import QuantitySpec, compile_quantity
 from common.event import (
     EventBus,
     DropEvent,
@@ -17,19 +24,156 @@ from common.event import (
 )
 
 
+@dataclass(frozen=True)
+class DropEntry:
+    item_id: int
+    category: str | None        # None 表示 Registry 中找不到
+    prototype: object | None
+    quantity: QuantitySpec
+    chance: float = 1.0         # 必掉為 1.0
+
+
+class DropTable:
+    """
+    單一敵人原型的已編譯掉落表。
+    source 保存編譯時的 (drops, chance_drops) 列表引用，
+    戰鬥副本共享這兩個列表，因此可用 is 判斷快取是否仍然有效。
+    """
+
+    __slots__ = ("entries", "prototypes", "source")
+
+    def __init__(self, entries: list[DropEntry], source: tuple):
+        self.entries    = tuple(entries)
+        self.prototypes = {e.item_id: e.prototype for e in entries}
+        self.source     = source
+
+    @classmethod
+    def compile(cls, enemy) -> "DropTable":
+        drops        = getattr(enemy, "drops", None)
+        chance_drops = getattr(enemy, "chance_drops", None)
+        entries = []
+        for item_id, quantity in drops or []:
+            entries.append(cls._entry(item_id, quantity, 1.0))
+        for item_id, quantity, chance in chance_drops or []:
+            entries.append(cls._entry(item_id, quantity, chance))
+        return cls(entries, (drops, chance_drops))
+
+    @staticmethod
+    def _entry(item_id, quantity, chance) -> DropEntry:
+        category, prototype = DropProcessor._get_item(item_id)
+        return DropEntry(item_id, category, prototype, compile_quantity(quantity), chance)
+
+    # ── 擲骰 ──────────────────────────────────────────────────
+
+    def roll(self, rng=random) -> dict:
+        """擊殺一次，返回 {item_id: total_quantity}。"""
+        summary = {}
+        for e in self.entries:
+            if e.chance >= 1.0 or rng.random() < e.chance:
+                summary[e.item_id] = summary.get(e.item_id, 0) + e.quantity.roll(rng)
+        return summary
+
+    def roll_many(self, n: int, rng=random) -> dict:
+        """
+        擊殺 n 次的總掉落 {item_id: total_quantity}。
+        每個機率掉落的命中次數以一次二項分佈抽取（見 _binomial），
+        再一次抽取所有命中的數量總和；抽取次數與命中次數成正比，而非 n。
+        """
+        summary = {}
+        if n <= 0:
+            return summary
+        for e in self.entries:
+            if e.chance >= 1.0:
+                hits = n
+            else:
+                hits = _binomial(n, e.chance, rng)
+                if not hits:
+                    continue
+            summary[e.item_id] = summary.get(e.item_id, 0) + e.quantity.roll_total(hits, rng)
+        return summary
+
+    def expected(self) -> dict:
+        """每次擊殺的期望掉落 {item_id: float}（不擲骰）。"""
+        summary = {}
+        for e in self.entries:
+            rate = min(e.chance, 1.0)
+            summary[e.item_id] = summary.get(e.item_id, 0.0) + rate * e.quantity.mean
+        return summary
+
+
+def _binomial(n: int, p: float, rng=random) -> int:
+    """
+    n 次機率 p 的試驗中命中的次數。
+    有 binomialvariate（Python 3.12+）時直接使用；否則以幾何分佈跳過兩次命中之間的
+    失敗次數，每次命中只抽一個亂數（p > 0.5 時改為統計失敗次數）。
+    """
+    if p <= 0.0:
+        return 0
+    if p >= 1.0:
+        return n
+    binomial = getattr(rng, "binomialvariate", None)
+    if binomial is not None:
+        return binomial(n, p)
+    if p > 0.5:
+        return n - _binomial(n, 1.0 - p, rng)
+
+    log_q = log1p(-p)
+    hits, position = 0, 0
+    while True:
+        position += floor(log(1.0 - rng.random()) / log_q) + 1
+        if position > n:
+            return hits
+        hits += 1
+
+
 class DropProcessor:
 
+    # (敵人類別, number) → DropTable
+    _tables: dict = {}
+
     @staticmethod
-    def process(player, enemy) -> list:
+    def process(player, enemy, rng=random) -> list:
         """
         處理 enemy 的掉落，加入 player 背包。
         返回 [(item_name, quantity), ...] 供戰鬥日誌顯示。
         """
-        drop_summary = DropProcessor._resolve_drops(enemy)
+        table = DropProcessor.table_for(enemy)
+        return DropProcessor.grant(player, table.roll(rng), enemy.name, table.prototypes)
+
+    @staticmethod
+    def roll_batch(enemies, times: int = 1, rng=random) -> dict:
+        """
+        批量擲骰：enemies 每個各擊殺 times 次的總掉落 {item_id: total_quantity}。
+        同種敵人合併成一次 roll_many()，供刷怪模擬 / 連續清怪使用。
+        """
+        groups: dict[int, list] = {}
+        for enemy in enemies:
+            table = DropProcessor.table_for(enemy)
+            group = groups.get(id(table))
+            if group is None:
+                groups[id(table)] = [table, times]
+            else:
+                group[1] += times
+
+        summary = {}
+        for table, n in groups.values():
+            for item_id, qty in table.roll_many(n, rng).items():
+                summary[item_id] = summary.get(item_id, 0) + qty
+        return summary
+
+    @staticmethod
+    def grant(player, drop_summary: dict, source: str = "", prototypes: dict | None = None) -> list:
+        """
+        將 {item_id: total_quantity} 加入 player 背包並發送 DropEvent。
+        prototypes 為已解析的原型（來自 DropTable），缺少時查 Registry。
+        """
         result = []
 
         for item_id, total_quantity in drop_summary.items():
-            prototype = DropProcessor._get_item(item_id)
+            if prototypes is not None and item_id in prototypes:
+                prototype = prototypes[item_id]
+            else:
+                prototype = DropProcessor._get_item(item_id)[1]
             if prototype is None:
                 EventBus.emit(WarningEvent(
                     message=f"無法識別的掉落物 ID: {item_id}"
@@ -43,33 +187,40 @@ class DropProcessor:
 
         if result:
             EventBus.emit(DropEvent(
-                enemy=enemy.name,
+                enemy=source,
                 items=[{"name": name, "quantity": qty} for name, qty in result],
             ))
 
         return result
 
-    # ── 私有方法 ──────────────────────────────────────────────
+    # ── 掉落表 ────────────────────────────────────────────────
 
     @staticmethod
-    def _resolve_drops(enemy) -> dict:
-        """合併必掉 + 機率掉落，返回 {item_id: total_quantity}。"""
-        summary = {}
-        for item_id, quantity in getattr(enemy, "drops", []):
-            summary[item_id] = summary.get(item_id, 0) + quantity
-        for item_id, quantity, chance in getattr(enemy, "chance_drops", []):
-            if random.random() < chance:
-                summary[item_id] = summary.get(item_id, 0) + quantity
-        return summary
+    def table_for(enemy) -> DropTable:
+        """取得 enemy 的已編譯掉落表（掉落列表被替換時自動重新編譯）。"""
+        key = (type(enemy).__name__, getattr(enemy, "number", None))
+        table = DropProcessor._tables.get(key)
+        if (
+            table is None
+            or table.source[0] is not getattr(enemy, "drops", None)
+            or table.source[1] is not getattr(enemy, "chance_drops", None)
+        ):
+            table = DropTable.compile(enemy)
+            if key[1] is not None:
+                DropProcessor._tables[key] = table
+        return table
+
+    @staticmethod
+    def invalidate() -> None:
+        """清空掉落表快取（Registry 重新載入 / DLC 追加物品時由 registry 回呼）。"""
+        DropProcessor._tables.clear()
+
+    # ── 私有方法 ──────────────────────────────────────────────
 
     @staticmethod
-    def _get_item(item_id):
-        """透過 Registry 查找物品原型。"""
-        for category in ("material", "equipment", "product", "warp", "medicine", "skill"):
-            item = registry.get(category, item_id)
-            if item is not None:
-                return item
-        return None
+    def _get_item(item_id) -> tuple:
+        """透過 Registry 物品索引查找原型，返回 (category, prototype)；找不到為 (None, None)。"""
+        return registry.get_item(item_id)
 
     @staticmethod
     def _add_to_player(player, item, total_quantity) -> list:
@@ -92,3 +243,7 @@ class DropProcessor:
                 logs.append((item.name, 1))
 
         return logs
+
+
+# 物品原型重新載入 / 覆蓋時，已編譯的掉落表持有舊原型，一併失效
+registry.on_items_changed(DropProcessor.invalidate)
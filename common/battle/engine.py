@@ -2,9 +2,10 @@
 BattleEngine
 战斗主循环，组装所有子模块。
 所有战斗消息一律通过 EventBus 发送。
+自动战斗时每回合包在 EventBus.batch() 内：通知事件合并后于回合结束时一次分派。
+profile=True 时由 BattleProfiler 记录各阶段耗时，结果见 BattleResultEvent.profile。
 """
-
-import copy
+import contextlib
 
 from common.character.player import Player
 from common.character.ally   import Ally
@@ -14,6 +15,10 @@ from common.battle.buff_processor import BuffProcessor
 from common.battle.drop_processor import DropProcessor
 from common.battle.auto_battle    import AutoBattleAI
 from common.battle.action         import ActionMenu
+from common.battle.participant_index import ParticipantIndex
+from common.battle.rng import BattleRNG
+from common.battle.profiler import BattleProfiler
+from common.module.item import battle_copy
 
 from common.event import (
     EventBus,
@@ -22,6 +27,7 @@ from common.event import (
     ExpGainedEvent,
     BattleResultEvent,
     WarningEvent,
+    drain_all,
 )
 
 # ── 新增：战斗层 Handler 上下文 ──────────────────────────────
@@ -30,33 +36,62 @@ from core.handlers import BattleHandlerContext
 
 class BattleEngine:
 
-    def __init__(self, player, allies: list, enemies: list):
+    def __init__(
+        self,
+        player,
+        allies: list,
+        enemies: list,
+        headless: bool = False,
+        max_turns: int | None = None,
+        seed: int | None = None,
+        profile: bool = False,
+    ):
+        """
+        headless  : 无人值守模式（模拟 / 批量测试用）
+                    玩家固定由 AutoBattleAI 驱动，结算时不打印背包
+        max_turns : 回合上限，超过时以 "timeout" 结束；None 表示不限
+        seed      : BattleRNG 主种子；None 时随机产生，记录于 BattleResultEvent
+        profile   : 开启性能剖析（BattleProfiler），结果为 self.profile
+        """
         # ── 战场成员 ──────────────────────────────────────────
         self.player  = player
-        self.allies  = [copy.deepcopy(a) for a in allies]
-        self.enemies = [copy.deepcopy(e) for e in enemies]
+        self.allies  = [self._spawn(a) for a in allies]
+        self.enemies = [self._spawn(e) for e in enemies]
 
         if not self.player and not self.enemies:
             raise ValueError("没有玩家或敌人，无法开始战斗。")
 
         # ── 子模块 ────────────────────────────────────────────
-        self.turn_manager   = TurnManager()
+        self.rng            = BattleRNG(seed)
+        self.turn_manager   = TurnManager(self.rng.status)
         self.buff_processor = BuffProcessor()
         self.drop_processor = DropProcessor()
-        self.auto_ai        = AutoBattleAI()
+        self.auto_ai        = AutoBattleAI(self.rng.ai)
         self.action_menu    = ActionMenu()
 
         # ── 战斗状态 ──────────────────────────────────────────
-        self.auto_battle      = False
+        self.headless         = headless
+        self.max_turns        = max_turns
+        self.auto_battle      = headless
         self.defeated_enemies = []
         self._turn_count      = 0
 
+        # ── 性能剖析（未开启时不安装任何包装）────────────────
+        self.profiler = BattleProfiler() if profile else None
+        self.profile  = None
+
+        # ── 成员索引（供 Handler 按 unique_id / 名字查找）────
+        self._index = ParticipantIndex()
+        self._participants: tuple | None = None
+
         # ── 注入 battle 引用 ──────────────────────────────────
         self._inject_battle_ref()
 
         # ── 复制战斗用技能 ────────────────────────────────────
         self._copy_battle_skills()
 
+        self._index.rebuild(self._all_participants())
+
         # ── 建立初始回合顺序 ──────────────────────────────────
         self.turn_manager.build_order(self.player, self.allies, self.enemies)
 
@@ -71,51 +106,117 @@ class BattleEngine:
 
     def _copy_battle_skills(self):
         for p in self._all_participants():
-            p.battle_skills = [copy.deepcopy(s) for s in p.skills]
+            p.battle_skills = [self._copy_skill(s) for s in p.skills]
 
-    def _all_participants(self) -> list:
-        return (
-            ([self.player] if self.player else [])
-            + self.allies
-            + self.enemies
-        )
+    @staticmethod
+    def _spawn(prototype):
+        """原型 → 战斗实例（共享只读数据，只复制可变状态）。"""
+        return prototype.battle_clone()
+
+    @staticmethod
+    def _copy_skill(skill):
+        """战斗用技能副本（frequency 等计数独立，效果定义共享）。"""
+        return battle_copy(skill)
+
+    def _all_participants(self) -> tuple:
+        """
+        全体参战者（player → allies → enemies）。
+        结果缓存为 tuple（调用方无法改动缓存），由成员增减路径
+        （add_enemies / add_allies / _remove_dead）显式失效。
+        """
+        cached = self._participants
+        if cached is None:
+            cached = self._participants = (
+                ((self.player,) if self.player else ())
+                + tuple(self.allies)
+                + tuple(self.enemies)
+            )
+        return cached
+
+    # ── 成员管理 ──────────────────────────────────────────────
+
+    def add_enemies(self, enemies: list) -> None:
+        """战斗中加入敌人（召唤 / 剧情增援），下回合起加入行动顺序。"""
+        self._add_participants(self.enemies, enemies)
+
+    def add_allies(self, allies: list) -> None:
+        """战斗中加入队友，下回合起加入行动顺序。"""
+        self._add_participants(self.allies, allies)
+
+    def _add_participants(self, side: list, newcomers: list) -> None:
+        for p in newcomers:
+            p.battle = self
+            p.battle_skills = [self._copy_skill(s) for s in p.skills]
+            side.append(p)
+            self._index.add(p)
+        self._participants = None
+
+    def resolve(self, name: str, unique_id: str = ""):
+        """
+        查找参战者：优先 unique_id，其次名字（同名时优先存活者）。
+        索引未命中时重建一次，兼容直接改动 allies / enemies 列表的旧脚本。
+        """
+        p = self._index.resolve(name, unique_id)
+        if p is None:
+            self._participants = None
+            self._index.rebuild(self._all_participants())
+            p = self._index.resolve(name, unique_id)
+        return p
 
     # ── 主循环 ────────────────────────────────────────────────
 
     def run(self) -> str:
         """
         执行完整战斗。
-        返回："win" / "loss"
+        返回："win" / "loss"（设置 max_turns 时可能为 "timeout"）
         """
         status = "ongoing"
+        if self.profiler is not None:
+            self.profiler.attach(self)
+
+        try:
+            while status == "ongoing":
+                if self.max_turns is not None and self._turn_count >= self.max_turns:
+                    status = "timeout"
+                    break
+
+                self._turn_count += 1
+                with self._turn_scope():
+                    status = self._play_turn()
+
+            # ── 战斗结束后处理 ────────────────────────────────
+            self._finalize(status)
+        finally:
+            if self.profiler is not None:
+                self.profile = self.profiler.finish()
+        return status
 
-        while status == "ongoing":
-            self._turn_count += 1
-
-            EventBus.emit(TurnStartEvent(
-                turn=self._turn_count,
-                order=[p.name for p in self.turn_manager.order],
-            ))
+    def _turn_scope(self):
+        """自动战斗：通知事件于回合结束时合并分派；手动时需即时显示。"""
+        return EventBus.batch() if self.auto_battle else contextlib.nullcontext()
 
-            # 1. 处理所有 Buff（含计时递减）
-            self.buff_processor.apply_buffs(self._all_participants())
+    def _play_turn(self) -> str:
+        EventBus.emit(TurnStartEvent(
+            turn=self._turn_count,
+            order=[p.name for p in self.turn_manager.order],
+        ))
 
-            # 2. 同步玩家属性上限
-            if self.player:
-                self.player.update_stats()
-            self._clamp_hp_mp(self._all_participants())
+        # 1. 处理所有 Buff（含计时递减）
+        self.buff_processor.apply_buffs(self._all_participants())
 
-            # 3. 依回合顺序行动
-            status = self._run_turn()
-            if status != "ongoing":
-                break
+        # 2. 同步玩家属性上限
+        if self.player:
+            self.player.update_stats()
+        self._clamp_hp_mp(self._all_participants())
 
-            # 4. 移除死亡角色 + 更新顺序
-            self._remove_dead()
-            self.turn_manager.update_order(self.player, self.allies, self.enemies)
+        # 3. 依回合顺序行动
+        status = self._run_turn()
+        if status != "ongoing":
+            return status
 
-        # ── 战斗结束后处理 ────────────────────────────────────
-        self._finalize(status)
+        # 4. 移除死亡角色 + 更新顺序
+        self._remove_dead()
+        self.turn_manager.update_order(self.player, self.allies, self.enemies)
         return status
 
     # ── 回合执行 ──────────────────────────────────────────────
@@ -191,8 +292,11 @@ class BattleEngine:
     # ── 死亡处理 ──────────────────────────────────────────────
 
     def _remove_dead(self):
-        for enemy in self.enemies[:]:
-            if enemy.hp <= 0:
+        survivors = []
+        for enemy in self.enemies:
+            if enemy.hp > 0:
+                survivors.append(enemy)
+            else:
                 EventBus.emit(DeathEvent(name=enemy.name, is_enemy=True))
 
                 if self.player:
@@ -203,13 +307,20 @@ class BattleEngine:
                         total_exp=self.player.exp,
                     ))
 
-                self.drop_processor.process(self.player, enemy)
+                self.drop_processor.process(self.player, enemy, self.rng.drops)
                 self.defeated_enemies.append(enemy)
-                self.enemies.remove(enemy)
+                self._index.remove(enemy)
+                self.turn_manager.remove(enemy)
+                self._participants = None
+        if len(survivors) != len(self.enemies):
+            self.enemies[:] = survivors
 
-        for ally in self.allies[:]:
+        for ally in self.allies:
             if ally.hp <= 0:
                 EventBus.emit(DeathEvent(name=ally.name, is_enemy=False))
+                self._index.remove(ally)
+                self.turn_manager.remove(ally)
+                self._participants = None
 
         self.allies = [a for a in self.allies if a.hp > 0]
 
@@ -226,12 +337,17 @@ class BattleEngine:
             self.player.reset_skill_bonuses()
 
         total_exp = sum(e.exp_drops for e in self.defeated_enemies)
+        if self.profiler is not None:
+            self.profile = self.profiler.finish()
 
         EventBus.emit(BattleResultEvent(
             result=status,
             turn_count=self._turn_count,
             defeated_enemies=[e.name for e in self.defeated_enemies],
             total_exp=total_exp,
+            seed=self.rng.seed,
+            seeds=dict(self.rng.seeds),
+            profile=self.profile,
         ))
 
         # 修改3：注销战斗层 Handler
@@ -239,7 +355,12 @@ class BattleEngine:
 
         if status == "win" and self.player:
             self.player.update_tasks_after_battle()
-            self.player.display_inventory()
+            if not self.headless:
+                self.player.display_inventory()
+
+        # 返回调用方前写出所有缓冲输出，之后直接 print / input 不会错序
+        if not self.headless:
+            drain_all()
 
     # ── 辅助 ──────────────────────────────────────────────────
 
@@ -0,0 +1,73 @@
+"""
+ParticipantIndex
+戰場成員索引，供 CombatHandler / BuffHandler / StatusHandler 查找目標。
+  1. unique_id → Combatant（精確定位，同名召喚物不會互相覆蓋）
+  2. name      → [Combatant, ...]（事件只帶名字時的後備查找）
+
+由 BattleEngine 在成員加入 / 移除時增量維護，
+查找為 O(1)，不再每次掃描 _all_participants()。
+"""
+
+
+class ParticipantIndex:
+
+    def __init__(self):
+        self._by_id:   dict[str, object]       = {}
+        self._by_name: dict[str, list[object]] = {}
+
+    # ── 維護 ──────────────────────────────────────────────────
+
+    def add(self, participant) -> None:
+        key = str(participant.unique_id)
+        if key in self._by_id:
+            return
+        self._by_id[key] = participant
+        self._by_name.setdefault(participant.name, []).append(participant)
+
+    def remove(self, participant) -> None:
+        if self._by_id.pop(str(participant.unique_id), None) is None:
+            return
+        same_name = self._by_name.get(participant.name)
+        if same_name is None:
+            return
+        same_name.remove(participant)
+        if not same_name:
+            del self._by_name[participant.name]
+
+    def rebuild(self, participants) -> None:
+        self._by_id.clear()
+        self._by_name.clear()
+        for p in participants:
+            self.add(p)
+
+    # ── 查找 ──────────────────────────────────────────────────
+
+    def get(self, unique_id: str):
+        return self._by_id.get(unique_id)
+
+    def find(self, name: str):
+        """
+        按名字查找。
+        同名多個時優先回傳存活者（按加入順序），全部死亡則回傳第一個。
+        """
+        same_name = self._by_name.get(name)
+        if not same_name:
+            return None
+        for p in same_name:
+            if p.hp > 0:
+                return p
+        return same_name[0]
+
+    def resolve(self, name: str, unique_id: str = ""):
+        """優先以 unique_id 精確定位，找不到再以名字查找。"""
+        if unique_id:
+            p = self._by_id.get(unique_id)
+            if p is not None:
+                return p
+        return self.find(name)
+
+    def __contains__(self, participant) -> bool:
+        return str(participant.unique_id) in self._by_id
+
+    def __len__(self) -> int:
+        return len(self._by_id)
@@ -0,0 +1,285 @@
+"""
+BattleProfiler / BattleProfile
+战斗性能剖析（按需开启）。
+
+BattleEngine(..., profile=True) 时，run() 期间以实例属性覆盖下列方法，
+在原方法外层计时；结束后移除覆盖。未开启时不做任何替换，主循环与
+EventBus 走原本的代码路径，没有额外开销。
+
+  阶段（phase）：
+    turn         每回合（含回合结束时的批次分派 flush）
+    buffs        BuffProcessor.apply_buffs
+    actions      BattleEngine._run_turn
+    remove_dead  BattleEngine._remove_dead
+    drops        DropProcessor.process
+    turn_order   TurnManager.update_order
+    flush        EventBus.flush（批次事件分派）
+  事件：EventBus.emit 按事件类型计数
+  Handler：每个 listener 的调用次数、总耗时、最大耗时与延迟直方图
+  分配：每回合 sys.getallocatedblocks() 的净增量；
+        tracemalloc 正在追踪时另记录 traced 内存的净增量（bytes）
+
+Handler 在事件发出时同步执行，其耗时计入当时所在的阶段；
+调用栈记录每个栈帧的自身耗时，可导出为 flamegraph 的 folded stacks。
+
+用法：
+    engine = BattleEngine(player, [], enemies, headless=True, profile=True)
+    engine.run()
+    profile = engine.profile            # 亦见 BattleResultEvent.profile
+    profile.save_json("battle_profile.json")
+    profile.save_folded("battle.folded")   # flamegraph.pl battle.folded > battle.svg
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+
+from common.event import EventBus
+
+
+# ══════════════════════════════════════════════
+#  剖析结果
+# ══════════════════════════════════════════════
+
+@dataclass
+class BattleProfile:
+    """
+    turns      : 回合数
+    wall_ns    : 整场（run 开始到结算事件发出前）耗时
+    phases     : {阶段: {"calls", "total_ns"}}（含子阶段与 Handler）
+    events     : {事件类型: emit 次数}
+    handlers   : {listener: {"calls", "total_ns", "max_ns", "histogram"}}
+                 histogram 为 {上限微秒(2 的幂): 次数}
+    turn_stats : 每回合 {"turn", "wall_ns", "events", "alloc_blocks"[, "alloc_bytes"]}
+    stacks     : {"battle;turn;actions;handler:Xxx.on_yyy": 自身耗时 ns}
+    """
+    turns:      int = 0
+    wall_ns:    int = 0
+    phases:     dict[str, dict] = field(default_factory=dict)
+    events:     dict[str, int] = field(default_factory=dict)
+    handlers:   dict[str, dict] = field(default_factory=dict)
+    turn_stats: list[dict] = field(default_factory=list)
+    stacks:     dict[str, int] = field(default_factory=dict)
+
+    # ── 导出 ──────────────────────────────────
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def save_json(self, path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    def to_folded(self) -> str:
+        """flamegraph 的 folded stacks（每行 "a;b;c 微秒"，省略不足 1 微秒的栈）。"""
+        lines = [
+            f"{stack} {ns // 1000}"
+            for stack, ns in self.stacks.items()
+            if ns >= 1000
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def save_folded(self, path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_folded())
+
+    # ── 显示 ──────────────────────────────────
+
+    def summary(self, top: int = 5) -> str:
+        def ms(ns: int) -> str:
+            return f"{ns / 1e6:.3f} ms"
+
+        lines = [f"回合数：{self.turns}    总耗时：{ms(self.wall_ns)}", "阶段："]
+        for name, stat in sorted(self.phases.items(), key=lambda kv: -kv[1]["total_ns"]):
+            lines.append(f"  {name:<12} {stat['calls']:>7} 次  {ms(stat['total_ns'])}")
+        lines.append(f"事件：共 {sum(self.events.values())} 次 emit")
+        for name, n in Counter(self.events).most_common(top):
+            lines.append(f"  {name:<28} {n:>7}")
+        lines.append("Handler：")
+        slowest = sorted(self.handlers.items(), key=lambda kv: -kv[1]["total_ns"])[:top]
+        for name, stat in slowest:
+            lines.append(
+                f"  {name:<40} {stat['calls']:>7} 次  {ms(stat['total_ns'])}"
+                f"  (max {stat['max_ns'] / 1000:.1f} µs)"
+            )
+        return "\n".join(lines)
+
+
+# ══════════════════════════════════════════════
+#  剖析器
+# ══════════════════════════════════════════════
+
+class BattleProfiler:
+    """
+    attach(engine) 安装计时包装，finish() 移除并回传 BattleProfile。
+    同一时间只应有一个 profiler 挂在 EventBus 上。
+    """
+
+    # (取得对象的函数, 方法名, 阶段名)
+    PHASES = (
+        (lambda e: e.buff_processor, "apply_buffs",  "buffs"),
+        (lambda e: e,                "_run_turn",    "actions"),
+        (lambda e: e,                "_remove_dead", "remove_dead"),
+        (lambda e: e.drop_processor, "process",      "drops"),
+        (lambda e: e.turn_manager,   "update_order", "turn_order"),
+    )
+
+    def __init__(self):
+        self.profile = BattleProfile()
+        self._stack: list[list] = []        # [名称, 开始 ns, 子帧耗时 ns]
+        self._patched: list[tuple[object, str]] = []
+        self._events: Counter = Counter()
+        self._turn_events = 0
+        self._started = 0
+        self._attached = False
+
+    # ── 安装 / 移除 ───────────────────────────
+
+    def attach(self, engine) -> None:
+        if self._attached:
+            return
+        self._attached = True
+
+        for owner_of, method, phase in self.PHASES:
+            owner = owner_of(engine)
+            self._patch(owner, method, self._timed(phase, getattr(owner, method)))
+        self._patch(engine, "_turn_scope", self._turn_scope(engine, engine._turn_scope))
+        self._patch(EventBus, "emit", self._counted(EventBus.emit))
+        self._patch(EventBus, "flush", self._timed("flush", EventBus.flush))
+
+        # 分派表重建时由 EventBus 以 wrap_listener() 包装每个 listener
+        EventBus._profiler = self
+        EventBus._table = {}
+
+        self._started = time.perf_counter_ns()
+        self._enter("battle")
+
+    def finish(self) -> BattleProfile:
+        """移除包装并完成统计；可重复呼叫。"""
+        if not self._attached:
+            return self.profile
+        self._attached = False
+
+        while self._stack:
+            self._exit()
+        for owner, name in self._patched:
+            vars(owner).pop(name, None)
+        self._patched.clear()
+        if EventBus._profiler is self:
+            EventBus._profiler = None
+            EventBus._table = {}
+
+        profile = self.profile
+        profile.wall_ns = time.perf_counter_ns() - self._started
+        profile.events  = dict(self._events)
+        return profile
+
+    def _patch(self, owner, name: str, wrapper) -> None:
+        setattr(owner, name, wrapper)
+        self._patched.append((owner, name))
+
+    # ── 栈帧 ──────────────────────────────────
+
+    def _enter(self, name: str) -> None:
+        self._stack.append([name, time.perf_counter_ns(), 0])
+
+    def _exit(self) -> int:
+        now = time.perf_counter_ns()
+        stack = self._stack
+        frame = stack.pop()
+        elapsed = now - frame[1]
+
+        key = ";".join([f[0] for f in stack] + [frame[0]])
+        stacks = self.profile.stacks
+        stacks[key] = stacks.get(key, 0) + elapsed - frame[2]
+        if stack:
+            stack[-1][2] += elapsed
+
+        if frame[0] != "battle" and not frame[0].startswith("handler:"):
+            stat = self.profile.phases.setdefault(frame[0], {"calls": 0, "total_ns": 0})
+            stat["calls"]    += 1
+            stat["total_ns"] += elapsed
+        return elapsed
+
+    # ── 包装 ──────────────────────────────────
+
+    def _timed(self, phase: str, method):
+        enter, exit_ = self._enter, self._exit
+
+        def timed(*args, **kwargs):
+            enter(phase)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                exit_()
+        return timed
+
+    def _counted(self, emit):
+        events = self._events
+
+        def counted(event):
+            events[event.__class__.__name__] += 1
+            self._turn_events += 1
+            emit(event)
+        return counted
+
+    def _turn_scope(self, engine, turn_scope):
+        profiler = self
+
+        class _Turn:
+            def __enter__(self):
+                profiler._turn_events = 0
+                self.blocks = sys.getallocatedblocks()
+                self.traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+                profiler._enter("turn")
+                self.inner = turn_scope()
+                return self.inner.__enter__()
+
+            def __exit__(self, *exc):
+                try:
+                    return self.inner.__exit__(*exc)
+                finally:
+                    elapsed = profiler._exit()
+                    stat = {
+                        "turn":         engine._turn_count,
+                        "wall_ns":      elapsed,
+                        "events":       profiler._turn_events,
+                        "alloc_blocks": sys.getallocatedblocks() - self.blocks,
+                    }
+                    if self.traced is not None and tracemalloc.is_tracing():
+                        stat["alloc_bytes"] = tracemalloc.get_traced_memory()[0] - self.traced
+                    profiler.profile.turn_stats.append(stat)
+                    profiler.profile.turns += 1
+
+        return _Turn
+
+    def wrap_listener(self, listener):
+        """EventBus 建立分派表时呼叫：记录 listener 的延迟。"""
+        name = getattr(listener, "__qualname__", None) or repr(listener)
+        stat = self.profile.handlers.setdefault(
+            name, {"calls": 0, "total_ns": 0, "max_ns": 0, "histogram": {}},
+        )
+        histogram = stat["histogram"]
+        frame_name = f"handler:{name}"
+        enter, exit_ = self._enter, self._exit
+
+        def wrapped(event):
+            enter(frame_name)
+            try:
+                listener(event)
+            finally:
+                elapsed = exit_()
+                stat["calls"]    += 1
+                stat["total_ns"] += elapsed
+                if elapsed > stat["max_ns"]:
+                    stat["max_ns"] = elapsed
+                bucket = 1 << (elapsed // 1000).bit_length()     # 上限（微秒）
+                histogram[bucket] = histogram.get(bucket, 0) + 1
+        return wrapped
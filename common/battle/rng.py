@@ -0,0 +1,53 @@
+"""
+BattleRNG
+每場戰鬥獨立的亂數來源，按用途拆成互不干擾的子串流：
+
+  damage : 暴擊判定、傷害浮動（Combatant.calculate_damage）
+  status : 麻痹判定（TurnManager）、Buff 命中機率（BuffHandler / 技能、法寶、道具的 Buff 效果）
+  ai     : 自動戰鬥 / 敵人 / 隊友 / Boss 腳本（common.logic）的行動與目標選擇
+  drops  : 擊殺掉落（DropProcessor）
+
+子串流的種子由主種子與串流名稱雜湊而得（不依賴 PYTHONHASHSEED），
+同一主種子在任何進程都得到相同的戰鬥；某一串流多抽一次也不影響其他串流。
+未指定種子時從全域 random 取得，因此 random.seed() 仍可固定整批模擬。
+"""
+from __future__ import annotations
+
+import hashlib
+import random
+
+
+class BattleRNG:
+
+    STREAMS = ("damage", "status", "ai", "drops")
+
+    def __init__(self, seed: int | None = None):
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed  = seed
+        self.seeds = {name: self.derive(seed, name) for name in self.STREAMS}
+
+        self.damage = random.Random(self.seeds["damage"])
+        self.status = random.Random(self.seeds["status"])
+        self.ai     = random.Random(self.seeds["ai"])
+        self.drops  = random.Random(self.seeds["drops"])
+
+    @staticmethod
+    def derive(seed: int, name: str) -> int:
+        digest = hashlib.blake2b(f"{seed}:{name}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def stream(self, name: str) -> random.Random:
+        if name not in self.STREAMS:
+            raise KeyError(f"未知的亂數串流：{name!r}")
+        return getattr(self, name)
+
+
+def battle_rng(owner, stream: str):
+    """
+    owner（參戰者或 engine）所屬戰鬥的子串流；
+    不在 BattleEngine 內（舊 Battle / 單獨呼叫）時退回全域 random。
+    """
+    battle = getattr(owner, "battle", owner)
+    rng = getattr(battle, "rng", None)
+    return getattr(rng, stream) if rng is not None else random
@@ -0,0 +1,369 @@
+"""
+BattleSimulator
+无人值守的批量战斗模拟（数值平衡用）。
+
+  - 玩家由 AutoBattleAI 驱动（BattleEngine headless 模式）
+  - EventBus 上只挂 SilentBattleHandler + 统计用 Handler，不输出任何战斗日志
+  - 多场战斗按 chunk 分发到进程池，每个 worker 独立持有 EventBus / Registry
+  - batch=True 时改用 BattleBatch（struct-of-arrays，只支援普通攻击阵容）
+
+用法：
+    from common.battle.simulator import simulate
+
+    report = simulate(player, enemies=[500001, 500002], fights=100_000)
+    print(report.summary())
+
+命令行：
+    python -m common.battle.simulator 500001 500002 -n 100000 --stat attack=60
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from core.registry import registry
+from common.event import EventBus, SilentBattleHandler
+from common.event.handlers import BattleHandler
+from common.event.battle import (
+    DamageAppliedEvent,
+    DropEvent,
+    BattleResultEvent,
+)
+
+
+# ══════════════════════════════════════════════
+#  报告
+# ══════════════════════════════════════════════
+
+@dataclass
+class SimulationReport:
+    """
+    批量模拟结果，可跨 chunk 合并（merge）。
+
+    turn_counts  : {回合数: 场数}
+    drop_yields  : {物品名称: 总数量}
+    damage_dealt : 我方实际造成的总伤害（扣除护盾吸收与击杀溢出）
+    damage_taken : 我方实际承受的总伤害（同上）
+    """
+    fights:       int = 0
+    wins:         int = 0
+    losses:       int = 0
+    timeouts:     int = 0
+    total_turns:  int = 0
+    damage_dealt: float = 0.0
+    damage_taken: float = 0.0
+    turn_counts:  Counter = field(default_factory=Counter)
+    drop_yields:  Counter = field(default_factory=Counter)
+
+    def merge(self, other: "SimulationReport") -> None:
+        self.fights       += other.fights
+        self.wins         += other.wins
+        self.losses       += other.losses
+        self.timeouts     += other.timeouts
+        self.total_turns  += other.total_turns
+        self.damage_dealt += other.damage_dealt
+        self.damage_taken += other.damage_taken
+        self.turn_counts.update(other.turn_counts)
+        self.drop_yields.update(other.drop_yields)
+
+    # ── 统计量 ────────────────────────────────
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.fights if self.fights else 0.0
+
+    @property
+    def mean_turns(self) -> float:
+        return self.total_turns / self.fights if self.fights else 0.0
+
+    @property
+    def damage_per_turn(self) -> float:
+        return self.damage_dealt / self.total_turns if self.total_turns else 0.0
+
+    @property
+    def damage_taken_per_turn(self) -> float:
+        return self.damage_taken / self.total_turns if self.total_turns else 0.0
+
+    def turn_percentile(self, q: float) -> int:
+        """回合数分布的分位数（q ∈ [0, 1]）。"""
+        if not self.fights:
+            return 0
+        rank = q * (self.fights - 1)
+        seen = 0
+        for turns in sorted(self.turn_counts):
+            seen += self.turn_counts[turns]
+            if seen > rank:
+                return turns
+        return max(self.turn_counts)
+
+    def drops_per_fight(self) -> dict[str, float]:
+        if not self.fights:
+            return {}
+        return {name: qty / self.fights for name, qty in self.drop_yields.items()}
+
+    def to_dict(self) -> dict:
+        return {
+            "fights":                self.fights,
+            "wins":                  self.wins,
+            "losses":                self.losses,
+            "timeouts":              self.timeouts,
+            "win_rate":              self.win_rate,
+            "mean_turns":            self.mean_turns,
+            "turn_p50":              self.turn_percentile(0.5),
+            "turn_p90":              self.turn_percentile(0.9),
+            "damage_per_turn":       self.damage_per_turn,
+            "damage_taken_per_turn": self.damage_taken_per_turn,
+            "turn_counts":           dict(sorted(self.turn_counts.items())),
+            "drop_yields":           dict(self.drop_yields),
+        }
+
+    def summary(self) -> str:
+        lines = [
+            f"{'═'*40}",
+            f"  模拟场数：{self.fights}",
+            f"  胜率：{self.win_rate:.2%}"
+            f"（胜 {self.wins} / 负 {self.losses} / 超时 {self.timeouts}）",
+            f"  回合数：平均 {self.mean_turns:.2f}"
+            f"  P50 {self.turn_percentile(0.5)}  P90 {self.turn_percentile(0.9)}",
+            f"  每回合伤害：造成 {self.damage_per_turn:.1f}"
+            f" / 承受 {self.damage_taken_per_turn:.1f}",
+        ]
+        if self.drop_yields:
+            lines.append("  平均掉落：")
+            for name, avg in sorted(self.drops_per_fight().items()):
+                lines.append(f"    {name} × {avg:.3f}")
+        lines.append(f"{'═'*40}")
+        return "\n".join(lines)
+
+
+# ══════════════════════════════════════════════
+#  统计 Handler
+# ══════════════════════════════════════════════
+
+class _FightRecorder(BattleHandler):
+    """把单场战斗的事件累计进 SimulationReport。"""
+
+    def __init__(self, report: SimulationReport) -> None:
+        self._report = report
+        self._friendly: set[str] = set()
+
+    def bind(self, engine) -> None:
+        """每场开始前记录我方名单，用于区分造成 / 承受的伤害。"""
+        self._friendly = {a.name for a in engine.allies}
+        if engine.player:
+            self._friendly.add(engine.player.name)
+
+    def on_damage_applied_event(self, e: DamageAppliedEvent) -> None:
+        if e.source in self._friendly:
+            self._report.damage_dealt += e.amount
+        elif e.target in self._friendly:
+            self._report.damage_taken += e.amount
+
+    def on_drop_event(self, e: DropEvent) -> None:
+        for item in e.items:
+            self._report.drop_yields[item["name"]] += item["quantity"]
+
+    def on_battle_result_event(self, e: BattleResultEvent) -> None:
+        r = self._report
+        r.fights      += 1
+        r.total_turns += e.turn_count
+        r.turn_counts[e.turn_count] += 1
+        if e.result == "win":
+            r.wins += 1
+        elif e.result == "loss":
+            r.losses += 1
+        else:
+            r.timeouts += 1
+
+
+# ══════════════════════════════════════════════
+#  单个 chunk（worker 内执行）
+# ══════════════════════════════════════════════
+
+def _resolve_enemy(ref):
+    """
+    敌人引用 → 原型。
+      500001              : 依次查 enemy / boss
+      ("boss", 600001)    : 指定 category
+      Combatant 实例      : 原样返回
+    """
+    if isinstance(ref, (tuple, list)):
+        category, key = ref
+        proto = registry.get(category, key)
+    elif isinstance(ref, int):
+        proto = registry.get("enemy", ref) or registry.get("boss", ref)
+    else:
+        return ref
+
+    if proto is None:
+        raise KeyError(f"找不到敌人原型：{ref!r}")
+    return proto
+
+
+def _init_worker() -> None:
+    """spawn 启动的 worker 没有继承父进程的 Registry，需重新加载。"""
+    if not registry.get_all("enemy"):
+        from core.data_loader import load_all
+        load_all()
+
+
+def _run_chunk(
+    player, allies: list, enemies: list,
+    fights: int, seed: int | None, max_turns: int | None,
+    batch: bool = False,
+) -> SimulationReport:
+    from common.battle.engine import BattleEngine
+    from common.battle.batch import BattleBatch
+
+    _init_worker()
+    if batch:
+        prototypes = [_resolve_enemy(ref) for ref in enemies]
+        return BattleBatch(
+            player, prototypes, fights,
+            allies=allies, seed=seed, max_turns=max_turns,
+        ).run()
+
+    if seed is not None:
+        random.seed(seed)
+
+    prototypes = [_resolve_enemy(ref) for ref in enemies]
+    report     = SimulationReport()
+    recorder   = _FightRecorder(report)
+    silent     = SilentBattleHandler()
+
+    EventBus.register(silent)
+    EventBus.register(recorder)
+    try:
+        for _ in range(fights):
+            engine = BattleEngine(
+                copy.deepcopy(player), allies, prototypes,
+                headless=True, max_turns=max_turns,
+            )
+            recorder.bind(engine)
+            engine.run()
+    finally:
+        EventBus.unregister(recorder)
+        EventBus.unregister(silent)
+
+    return report
+
+
+# ══════════════════════════════════════════════
+#  对外入口
+# ══════════════════════════════════════════════
+
+def simulate(
+    player,
+    enemies: list,
+    fights: int = 1000,
+    allies: list | None = None,
+    workers: int | None = None,
+    chunk_size: int = 500,
+    seed: int | None = None,
+    max_turns: int | None = 200,
+    batch: bool = False,
+) -> SimulationReport:
+    """
+    用 player 的当前配置（属性 / 技能 / 装备）对 enemies 连续战斗 fights 场。
+
+    player     : Player 原型，每场深拷贝一次，原对象不受影响
+    enemies    : 敌人引用列表（ID / (category, ID) / Combatant 实例）
+    allies     : 队友原型列表
+    workers    : 进程数；None 为 CPU 核数，1 则在当前进程内执行
+    chunk_size : 每个任务包含的场数
+    seed       : 指定时每个 chunk 使用 seed + chunk 序号，结果可复现
+    max_turns  : 单场回合上限，防止双方都无法致死时卡死
+    batch      : 使用 BattleBatch 快速路径（阵容含技能 / Boss 时抛出 BatchUnsupportedError）
+    """
+    if fights <= 0:
+        return SimulationReport()
+
+    allies  = list(allies or [])
+    enemies = list(enemies)
+    workers = workers or os.cpu_count() or 1
+
+    chunks = []
+    remaining, index = fights, 0
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        chunk_seed = None if seed is None else seed + index
+        chunks.append((player, allies, enemies, size, chunk_seed, max_turns, batch))
+        remaining -= size
+        index     += 1
+
+    report = SimulationReport()
+
+    if workers == 1 or len(chunks) == 1:
+        for args in chunks:
+            report.merge(_run_chunk(*args))
+        return report
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_run_chunk, *args) for args in chunks]
+        for future in futures:
+            report.merge(future.result())
+
+    return report
+
+
+# ══════════════════════════════════════════════
+#  命令行
+# ══════════════════════════════════════════════
+
+def _build_player(name: str, stats: list[str], skills: list[int]):
+    """依命令行参数组装玩家：--stat attack=60 --skill 200001"""
+    from common.character.player import Player
+
+    player = Player(name)
+    for pair in stats:
+        attr, _, value = pair.partition("=")
+        if not hasattr(player.stats, attr):
+            raise SystemExit(f"未知属性：{attr}")
+        setattr(player.stats, attr, float(value))
+
+    for skill_id in skills:
+        skill = registry.get("skill", skill_id)
+        if skill is None:
+            raise SystemExit(f"找不到技能：{skill_id}")
+        player.skill_set.learn(copy.deepcopy(skill))
+        player.skill_set.equip(skill.name)
+
+    return player
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="无人值守批量战斗模拟")
+    parser.add_argument("enemies", nargs="+", type=int, help="敌人 ID（enemy / boss）")
+    parser.add_argument("-n", "--fights", type=int, default=1000)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--batch", action="store_true",
+                        help="使用 BattleBatch 快速路径（仅普通攻击阵容）")
+    parser.add_argument("--name", default="模拟玩家")
+    parser.add_argument("--stat", action="append", default=[],
+                        help="玩家属性，如 attack=60，可重复")
+    parser.add_argument("--skill", action="append", default=[], type=int,
+                        help="装备技能 ID，可重复")
+    args = parser.parse_args(argv)
+
+    _init_worker()
+    player = _build_player(args.name, args.stat, args.skill)
+    report = simulate(
+        player, args.enemies,
+        fights=args.fights,
+        workers=args.workers,
+        seed=args.seed,
+        max_turns=args.max_turns,
+        batch=args.batch,
+    )
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
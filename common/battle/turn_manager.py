@@ -5,22 +5,46 @@ TurnManager
   2. 查询参与者本回合的行动限制（从 battle_state 推导）
   3. 状态异常的计时由 BattleState.tick_buffs() 统一处理，
      TurnManager 不再直接操作任何状态字段
+
+回合顺序以排序键 (-speed, 阵营, 加入序号) 维护，bisect 插入 / 移除，不再每回合全量排序：
+  - 阵营：player 0 → allies 1 → enemies 2，与原先 [player] + allies + enemies 稳定排序一致
+  - 同阵营同速度依加入先后（召唤的新成员排在同速度的旧成员之后）
+  - speed 变化时只重新定位该角色（reposition）
+与上次发送的顺序不同时才发送 TurnOrderUpdatedEvent。
+order 为快照：变动后下次读取才重建，回合进行中持有的旧列表不受影响。
 """
 import random
+from bisect import bisect_left, insort
 
 from common.event import (
     EventBus,
     TurnOrderUpdatedEvent,
 )
 
+PLAYER_SIDE, ALLY_SIDE, ENEMY_SIDE = 0, 1, 2
+
 
 class TurnManager:
 
-    def __init__(self):
-        self.order: list = []
+    def __init__(self, rng=random):
+        self.rng = rng              # 麻痹判定（BattleEngine 傳入 status 子串流）
+        self._keys: list[tuple] = []            # 已排序的 (-speed, side, seq)
+        self._members: dict[tuple, object] = {} # 排序键 → 参与者
+        self._entries: dict[int, tuple] = {}    # id(参与者) → 排序键
+        self._seq = 0
+        self._order: list | None = []
+        self._dirty = False
+        self._emitted: list = []                 # 上次事件中的顺序
 
     # ── 回合顺序 ──────────────────────────────────────────────
 
+    @property
+    def order(self) -> list:
+        if self._order is None:
+            members = self._members
+            self._order = [members[k] for k in self._keys]
+        return self._order
+
     def build_order(self, player, allies: list, enemies: list) -> list:
         """初始建立回合顺序（包含 player）。"""
         participants = (
@@ -31,24 +55,92 @@ class TurnManager:
         for p in participants:
             if not hasattr(p, "speed"):
                 raise ValueError(f"{p.name} 缺少 speed 属性，无法计算回合顺序。")
-        self.order = sorted(participants, key=lambda x: x.speed, reverse=True)
-        EventBus.emit(TurnOrderUpdatedEvent(
-            order=[p.name for p in self.order]
-        ))
+
+        self._keys, self._members, self._entries = [], {}, {}
+        for side, group in self._sides(player, allies, enemies, alive_only=False):
+            for p in group:
+                self.add(p, side)
+        self._emit()
         return self.order
 
     def update_order(self, player, allies: list, enemies: list) -> list:
-        """移除死亡角色后重新排序（每回合结束调用）。"""
-        participants = (
-            ([player] if player is not None and player.hp > 0 else [])
-            + [a for a in allies  if a.hp > 0]
-            + [e for e in enemies if e.hp > 0]
-        )
-        self.order = sorted(participants, key=lambda x: x.speed, reverse=True)
+        """
+        回合结束时对齐存活成员（每回合结束调用）：
+        移除死亡 / 离场者、加入新成员、重新定位 speed 变动者；有变动才发送事件。
+        """
+        alive: set[int] = set()
+        for side, group in self._sides(player, allies, enemies, alive_only=True):
+            for p in group:
+                alive.add(id(p))
+                key = self._entries.get(id(p))
+                if key is None:
+                    self.add(p, side)
+                elif -key[0] != p.speed:
+                    self.reposition(p)
+
+        for key in [k for k in self._keys if id(self._members[k]) not in alive]:
+            self.remove(self._members[key])
+
+        if self._dirty:
+            self._dirty = False
+            if self.order != self._emitted:
+                self._emit()
+        return self.order
+
+    # ── 增量维护 ──────────────────────────────────────────────
+
+    def add(self, participant, side: int = ENEMY_SIDE) -> None:
+        """加入顺序（O(log n) 定位）；已在顺序中时忽略。"""
+        if id(participant) in self._entries:
+            return
+        if not hasattr(participant, "speed"):
+            raise ValueError(f"{participant.name} 缺少 speed 属性，无法计算回合顺序。")
+        self._seq += 1
+        self._insert(participant, (-participant.speed, side, self._seq))
+
+    def remove(self, participant) -> None:
+        key = self._entries.pop(id(participant), None)
+        if key is None:
+            return
+        del self._keys[bisect_left(self._keys, key)]
+        del self._members[key]
+        self._touch()
+
+    def reposition(self, participant) -> None:
+        """speed 变动后重新定位（保留阵营与加入序号，等同重新稳定排序）。"""
+        key = self._entries.get(id(participant))
+        if key is None or -key[0] == participant.speed:
+            return
+        self.remove(participant)
+        self._insert(participant, (-participant.speed, key[1], key[2]))
+
+    def _insert(self, participant, key: tuple) -> None:
+        insort(self._keys, key)
+        self._members[key] = participant
+        self._entries[id(participant)] = key
+        self._touch()
+
+    def _touch(self) -> None:
+        self._order = None
+        self._dirty = True
+
+    def _emit(self) -> None:
+        self._dirty = False
+        self._emitted = self.order
         EventBus.emit(TurnOrderUpdatedEvent(
             order=[p.name for p in self.order]
         ))
-        return self.order
+
+    @staticmethod
+    def _sides(player, allies: list, enemies: list, alive_only: bool):
+        if player is not None and (not alive_only or player.hp > 0):
+            yield PLAYER_SIDE, (player,)
+        if alive_only:
+            yield ALLY_SIDE,  (a for a in allies  if a.hp > 0)
+            yield ENEMY_SIDE, (e for e in enemies if e.hp > 0)
+        else:
+            yield ALLY_SIDE,  allies
+            yield ENEMY_SIDE, enemies
 
     # ── 状态异常查询 ──────────────────────────────────────────
     #
@@ -75,7 +167,7 @@ class TurnManager:
 
         # 麻痹：50% 概率阻断
         if bs.has_status("paralyzed"):
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 bs.check_and_emit_blocked()
                 return "paralyzed"
 
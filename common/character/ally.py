@@ -1,5 +1,6 @@
 import copy
 from common.battle.combatant import Combatant
+from common.battle.rng import battle_rng
 
 
 class Ally(Combatant):
@@ -46,7 +47,7 @@ class Ally(Combatant):
         - 有技能時 50% 機率使用隨機技能
         - 否則普通攻擊隨機敵人
         """
-        import random
+        rng = battle_rng(engine, "ai")
 
         if not self.can_act():
             return
@@ -55,12 +56,12 @@ class Ally(Combatant):
         if not alive_enemies:
             return
 
-        if self.battle_skills and random.random() < 0.5:
-            skill  = random.choice(self.battle_skills)
-            target = random.choice(alive_enemies)
+        if self.battle_skills and rng.random() < 0.5:
+            skill  = rng.choice(self.battle_skills)
+            target = rng.choice(alive_enemies)
             self.use_skill(skill, target)
         else:
-            target = random.choice(alive_enemies)
+            target = rng.choice(alive_enemies)
             self.perform_attack(target)
 
     # ── deepcopy ─────────────────────────────────────────────
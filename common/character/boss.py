@@ -1,9 +1,32 @@
 import copy
+import importlib
+import re
 from core.registry import registry
 from common.character.enemy import Enemy
 from common.event import EventBus, WarningEvent
 
 
+# ── logic_module 解析 ─────────────────────────────────────────
+#  boss.json 以字串記錄腳本模組：ast.dump 形式
+#  "Attribute(value=Attribute(value=Name(id='common', ...), attr='logic', ...), attr='boss_logic_600001', ...)"
+#  或點分形式 "common.logic.boss_logic_600001"。
+#  模組物件只存在此快取中，Boss 原型仍保存字串（registry_cache 以 pickle 儲存原型）。
+
+_LOGIC_NAME = re.compile(r"(?:id|attr)='(\w+)'")
+_logic_modules: dict = {}
+
+
+def resolve_logic_module(logic):
+    """logic_module 欄位 → 模組物件；非字串原樣返回。"""
+    if not isinstance(logic, str):
+        return logic
+    module = _logic_modules.get(logic)
+    if module is None:
+        parts = _LOGIC_NAME.findall(logic) or logic.split(".")
+        module = _logic_modules[logic] = importlib.import_module(".".join(parts))
+    return module
+
+
 class Boss(Enemy):
     """
     Boss 繼承 Enemy。
@@ -95,7 +118,7 @@ class Boss(Enemy):
     def summon(self) -> list[Enemy]:
         """
         從 registry 取得 'enemy' category 的模板，
-        實例化 summon_list 中的敵人並注入 battle 引用。
+        以 battle_clone() 建立戰鬥實例並注入 battle 引用。
         找不到模板時 emit WarningEvent 並跳過。
         """
         summoned = []
@@ -107,27 +130,7 @@ class Boss(Enemy):
                 ))
                 continue
 
-            new_enemy = Enemy(
-                number      = template.number,
-                name        = template.name,
-                description = template.description,
-                level       = template.level,
-                hp          = template.hp,
-                mp          = template.mp,
-                max_hp      = template.max_hp,
-                max_mp      = template.max_mp,
-                attack      = template.attack,
-                defense     = template.defense,
-                speed       = template.speed,
-                crit        = template.crit,
-                crit_damage = template.crit_damage,
-                resistance  = template.resistance,
-                penetration = template.penetration,
-                drops       = copy.deepcopy(template.drops),
-                chance_drops= copy.deepcopy(template.chance_drops),
-                exp_drops   = template.exp_drops,
-                skills      = copy.deepcopy(template.skills),
-            )
+            new_enemy = template.battle_clone()
             new_enemy.battle = self.battle
             summoned.append(new_enemy)
         return summoned
@@ -137,14 +140,15 @@ class Boss(Enemy):
     def choose_action(self, engine) -> None:
         """
         先檢查是否能行動（眩暈 / 麻痹）。
-        優先使用 logic_module.boss_logic(boss, engine)。
+        優先使用 logic_module.boss_logic(boss, engine)
+        （字串形式的 logic_module 首次行動時才匯入，見 resolve_logic_module）。
         沒有 logic_module 時退回普通敵人 AI。
         """
         if not self.can_act():
             return
 
         if self.logic_module:
-            self.logic_module.boss_logic(self, engine)
+            resolve_logic_module(self.logic_module).boss_logic(self, engine)
         else:
             super().choose_action(engine)
 
@@ -1,5 +1,6 @@
 import copy
 from common.battle.combatant import Combatant
+from common.battle.rng import battle_rng
 
 
 class Enemy(Combatant):
@@ -43,19 +44,19 @@ class Enemy(Combatant):
         - 有技能時 50% 機率使用隨機技能
         - 否則普通攻擊隨機目標
         """
-        import random
+        rng = battle_rng(engine, "ai")
 
         if not self.can_act():
             return
 
         targets = [engine.player] + engine.allies
 
-        if self.battle_skills and random.random() < 0.5:
-            skill  = random.choice(self.battle_skills)
-            target = random.choice(targets)
+        if self.battle_skills and rng.random() < 0.5:
+            skill  = rng.choice(self.battle_skills)
+            target = rng.choice(targets)
             self.use_skill(skill, target)
         else:
-            target = random.choice(targets)
+            target = rng.choice(targets)
             self.perform_attack(target)
 
     # ── deepcopy ─────────────────────────────────────────────
@@ -23,6 +23,7 @@ from common.event import (
     EventBus,
     WarningEvent,
     EquipmentEquippedEvent,
+    echo,
 )
 from components.stats     import Stats
 from components.inventory import Inventory
@@ -32,31 +33,20 @@ from components.skills    import SkillSet
 class Player(Combatant):
 
     def __init__(self, name: str):
-        super().__init__(
-            number      = 0,
-            name        = name,
-            description = "",
-            level       = 1,
-            hp          = 100.0,
-            mp          = 50.0,
-            max_hp      = 100.0,
-            max_mp      = 50.0,
-            attack      = 10.0,
-            defense     = 5.0,
-            speed       = 10.0,
-            crit        = 5.0,      # Combatant 期望百分比整數
-            crit_damage = 150.0,    # 同上
-            resistance  = 0.0,
-            penetration = 0.0,
-            skills      = [],
-            equipment   = [],
-        )
+        # 等級 / HP / 攻擊等屬性由 Stats 代理（唯讀 property），
+        # 不呼叫 Combatant.__init__，只初始化與屬性無關的欄位
+        self.number      = 0
+        self.name        = name
+        self.description = ""
+        self.equipment   = []
 
         # ── 玩家獨有組件 ──────────────────────────
         self.stats     = Stats(owner=name)
         self.inventory = Inventory(owner=name)
         self.skill_set = SkillSet(owner=name)
-        # battle_state 已由 Combatant.__init__ 建立，不重複創建
+
+        # battle_skills / battle_state / unique_id 等
+        self._init_battle_fields()
 
         # 裝備欄：每個部位只能裝一件
         self._equipment: dict[str, object] = {}
@@ -265,7 +255,15 @@ class Player(Combatant):
         return self.inventory.add(item, quantity)
 
     def display_inventory(self) -> None:
-        print(self.inventory.summary())
+        echo(self.inventory.summary())
+
+    def get_inventory_count(self, item_number) -> int:
+        """按物品編號計數（任務條件用）。"""
+        return self.inventory.count_by_number(item_number)
+
+    def get_material_quantity(self, material_number) -> int:
+        """按材料編號計數（合成 / 商店用）。"""
+        return self.inventory.count_by_number(material_number)
 
     # ══════════════════════════════════════════
     #  裝備欄接口（玩家獨有：部位裝備欄）
@@ -8,7 +8,7 @@ common.event 統一入口
   BattleEventBus = EventBus
 """
 
-from common.event.bus import EventBus, BattleEvent, _to_snake
+from common.event.bus import EventBus, BattleEvent, NotificationEvent, _to_snake
 
 # 向後相容舊名稱
 BattleEventBus = EventBus
@@ -21,6 +21,7 @@ from common.event.battle import (
     SkillUsedEvent,
     MissEvent,
     DamageRequestEvent,
+    DamageAppliedEvent,
     HealRequestEvent,
     StatChangeRequestEvent,
     BuffRequestEvent,
@@ -30,6 +31,7 @@ from common.event.battle import (
     StatusExpiredEvent,
     BuffAppliedEvent,
     BuffTickEvent,
+    BuffTicksEvent,
     BuffExpiredEvent,
     DeathEvent,
     ExpGainedEvent,
@@ -107,20 +109,33 @@ from common.event.handlers import (
     SilentBattleHandler,
     JsonCollectorHandler,
 )
+from common.event.output import (
+    FlushPolicy,
+    DirectSink,
+    BufferedSink,
+    ThreadedSink,
+    drain_all,
+    echo,
+)
+from common.event.replay import (
+    ReplayRecorder,
+    ReplayReader,
+    ReplayFormatError,
+)
 from common.event.system.map import (
     MapWarpRequestEvent,
 )
 
 __all__ = [
     # Bus
-    "EventBus", "BattleEventBus", "BattleEvent",
+    "EventBus", "BattleEventBus", "BattleEvent", "NotificationEvent",
     # Battle
     "TurnStartEvent", "TurnOrderUpdatedEvent",
     "AttackEvent", "SkillUsedEvent", "MissEvent",
-    "DamageRequestEvent", "HealRequestEvent", "StatChangeRequestEvent",
+    "DamageRequestEvent", "DamageAppliedEvent", "HealRequestEvent", "StatChangeRequestEvent",
     "BuffRequestEvent", "BuffRemoveRequestEvent",
     "StatusAppliedEvent", "StatusBlockedActionEvent", "StatusExpiredEvent",
-    "BuffAppliedEvent", "BuffTickEvent", "BuffExpiredEvent",
+    "BuffAppliedEvent", "BuffTickEvent", "BuffTicksEvent", "BuffExpiredEvent",
     "DeathEvent", "ExpGainedEvent", "DropEvent",
     "BattleResultEvent", "SummonEvent",
     # System base
@@ -150,5 +165,10 @@ __all__ = [
     # Handlers
     "BattleHandler", "ConsoleBattleHandler",
     "SilentBattleHandler", "JsonCollectorHandler",
+    # Output
+    "FlushPolicy", "DirectSink", "BufferedSink", "ThreadedSink",
+    "drain_all", "echo",
+    # Replay
+    "ReplayRecorder", "ReplayReader", "ReplayFormatError",
     "MapWarpRequestEvent",
 ]
\ No newline at end of file
@@ -2,42 +2,55 @@
 戰鬥相關事件
 ─────────────────────────────────────────────
 回合、行動、狀態異常、Buff、死亡掉落、戰鬥結果
+
+*RequestEvent 為請求（改變狀態，一律同步分派），
+其餘繼承 NotificationEvent，批次模式下延後並合併分派；
+須與請求事件保持先後順序的通知設 deferrable = False，同步分派：
+  StatusAppliedEvent → StatusHandler 寫入 battle_state
+  DeathEvent / BattleResultEvent → QuestHandler 更新任務
+  TurnStartEvent → ReplayRecorder 記錄回合位移（須早於該回合的請求事件）
 """
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from common.event.bus import BattleEvent
+from typing import ClassVar
+from common.event.bus import BattleEvent, NotificationEvent
 
 
 # ── 回合 ──────────────────────────────────────
 
 @dataclass
-class TurnStartEvent(BattleEvent):
+class TurnStartEvent(NotificationEvent):
+    deferrable: ClassVar[bool] = False          # 回合邊界：ReplayRecorder 依此記錄回合位移
     turn: int
     order: list[str]
 
 @dataclass
-class TurnOrderUpdatedEvent(BattleEvent):
+class TurnOrderUpdatedEvent(NotificationEvent):
     order: list[str]
 
+    def coalesce(self, later):
+        # 順序是快照，連續更新只保留最後一次
+        return later if isinstance(later, TurnOrderUpdatedEvent) else None
+
 # ── 行動 ──────────────────────────────────────
 
 @dataclass
-class AttackEvent(BattleEvent):
+class AttackEvent(NotificationEvent):
     attacker: str
     target: str
     damage: float
     is_critical: bool = False
 
 @dataclass
-class SkillUsedEvent(BattleEvent):
+class SkillUsedEvent(NotificationEvent):
     user: str
     skill_name: str
     targets: list[str]
     effects: list[dict]
 
 @dataclass
-class MissEvent(BattleEvent):
+class MissEvent(NotificationEvent):
     attacker: str
     target: str
 
@@ -60,6 +73,19 @@ class DamageRequestEvent(BattleEvent):
     damage_type: str = "physical"       # "physical" | "true" | "skill"
     skill_multiplier: float = 1.0
     is_skill: bool = False
+    target_id: str = ""                 # 目標 unique_id，空字串時按名字查找
+
+@dataclass
+class DamageAppliedEvent(NotificationEvent):
+    """
+    DamageRequestEvent 結算後的實際結果（統計用）。
+    amount   : 實際扣除的 HP（已扣除護盾吸收，且不超過剩餘 HP）
+    absorbed : 護盾吸收量
+    """
+    source: str
+    target: str
+    amount: float
+    absorbed: float = 0.0
 
 @dataclass
 class HealRequestEvent(BattleEvent):
@@ -73,6 +99,7 @@ class HealRequestEvent(BattleEvent):
     target: str
     amount: float
     attr: str = "hp"
+    target_id: str = ""
 
 @dataclass
 class StatChangeRequestEvent(BattleEvent):
@@ -89,6 +116,7 @@ class StatChangeRequestEvent(BattleEvent):
     attr: str
     change: float
     scope: str = "battle"
+    target_id: str = ""
 
 # ── Buff ──────────────────────────────────────
 
@@ -111,6 +139,7 @@ class BuffRequestEvent(BattleEvent):
     duration: int
     effect: dict = field(default_factory=dict)
     chance: float = 1.0                              # 施加成功率 0.0~1.0
+    target_id: str = ""
 
 @dataclass
 class BuffRemoveRequestEvent(BattleEvent):
@@ -127,75 +156,107 @@ class BuffRemoveRequestEvent(BattleEvent):
     scope: str                                       # "name" | "type" | "all"
     buff_name: str = ""
     buff_type: str = ""
+    target_id: str = ""
 
 # ── 狀態異常 ──────────────────────────────────
 
 @dataclass
-class StatusAppliedEvent(BattleEvent):
+class StatusAppliedEvent(NotificationEvent):
+    deferrable: ClassVar[bool] = False          # StatusHandler 寫入 battle_state
     target: str
     status: str
     rounds: int
+    target_id: str = ""
 
 @dataclass
-class StatusBlockedActionEvent(BattleEvent):
+class StatusBlockedActionEvent(NotificationEvent):
     target: str
     status: str
     rounds_remaining: int
 
 @dataclass
-class StatusExpiredEvent(BattleEvent):
+class StatusExpiredEvent(NotificationEvent):
     target: str
     status: str
 
 # ── Buff 生命週期（通知用，非請求）──────────────
 
 @dataclass
-class BuffAppliedEvent(BattleEvent):
+class BuffAppliedEvent(NotificationEvent):
     target: str
     buff_name: str
     duration: int
 
 @dataclass
-class BuffTickEvent(BattleEvent):
+class BuffTickEvent(NotificationEvent):
     target: str
     buff_name: str
     duration_remaining: int
 
+    def coalesce(self, later):
+        if isinstance(later, BuffTickEvent) and later.target == self.target:
+            return BuffTicksEvent(
+                target=self.target,
+                ticks={self.buff_name: self.duration_remaining},
+            ).coalesce(later)
+        return None
+
+@dataclass
+class BuffTicksEvent(NotificationEvent):
+    """批次模式下同一目標連續的 BuffTickEvent 合併結果：{buff_name: 剩餘回合}。"""
+    target: str
+    ticks: dict[str, int] = field(default_factory=dict)
+
+    def coalesce(self, later):
+        if isinstance(later, BuffTickEvent) and later.target == self.target:
+            self.ticks[later.buff_name] = later.duration_remaining
+            return self
+        return None
+
 @dataclass
-class BuffExpiredEvent(BattleEvent):
+class BuffExpiredEvent(NotificationEvent):
     target: str
     buff_name: str
 
 # ── 死亡 / 掉落 ───────────────────────────────
 
 @dataclass
-class DeathEvent(BattleEvent):
+class DeathEvent(NotificationEvent):
+    deferrable: ClassVar[bool] = False          # QuestHandler 登記擊殺
     name: str
     is_enemy: bool
 
 @dataclass
-class ExpGainedEvent(BattleEvent):
+class ExpGainedEvent(NotificationEvent):
     player: str
     amount: int
     total_exp: int
 
 @dataclass
-class DropEvent(BattleEvent):
+class DropEvent(NotificationEvent):
     enemy: str
     items: list[dict]
 
 # ── 戰鬥結果 ──────────────────────────────────
 
 @dataclass
-class BattleResultEvent(BattleEvent):
+class BattleResultEvent(NotificationEvent):
+    """
+    seed 為 BattleRNG 主種子，以相同種子與陣容重建 BattleEngine 即可重現整場戰鬥。
+    profile 為 BattleProfile（BattleEngine(profile=True) 時），不寫入回放。
+    """
+    deferrable: ClassVar[bool] = False          # QuestHandler 檢查任務完成
     result: str
     turn_count: int
     defeated_enemies: list[str]
     total_exp: int
+    seed: int | None = None
+    seeds: dict[str, int] = field(default_factory=dict)      # 各子串流種子
+    profile: object | None = field(default=None, repr=False, metadata={"transient": True})
 
 # ── 召喚 ──────────────────────────────────────
 
 @dataclass
-class SummonEvent(BattleEvent):
+class SummonEvent(NotificationEvent):
     summoner: str
     ally_name: str
\ No newline at end of file
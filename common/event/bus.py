@@ -2,14 +2,32 @@
 EventBus 核心
 ─────────────────────────────────────────────
 只包含：
-  - BattleEvent 基類
+  - BattleEvent / NotificationEvent 基類
   - _BattleEventBus 實作
   - EventBus 全域單例
-  - _to_snake 工具函數
+  - _to_snake / _listener_name 工具函數
+
+分派方式：
+  Bus 維護 {event_type: (listener, ...)} 分派表，
+  register / unregister / subscribe / unsubscribe 時失效，
+  emit 時只呼叫關心該事件類型的 listener，不做任何字串處理。
+
+批次模式（EventBus.batch()）：
+  範圍內 NotificationEvent 先排入佇列，相鄰且可合併的事件經 coalesce() 合併，
+  正常離開範圍時依序一次分派（以例外離開時丟棄）；其餘事件（請求類等會改變狀態的事件）仍同步分派。
+  有監聽器據以改變狀態的通知事件標記 deferrable = False：同步分派，
+  分派前先 flush 佇列，顯示順序與發生順序一致。
+
+剖析（BattleProfiler）：
+  _profiler 設定時，分派表中的每個 listener 經 _profiler.wrap_listener() 包裝計時；
+  未設定時分派表與 emit 完全不受影響。
 """
 
 from __future__ import annotations
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Callable, ClassVar, Iterator
 import json
 import re
 
@@ -28,35 +46,186 @@ class BattleEvent:
     def to_json(self) -> str:
         return json.dumps(self.to_dict(), ensure_ascii=False)
 
+    # 批次模式下可延後分派（純通知，不改變遊戲狀態）
+    deferrable: ClassVar[bool] = False
+
+    def coalesce(self, later: "BattleEvent") -> "BattleEvent | None":
+        """
+        批次模式下與緊接在後的事件 later 合併，回傳合併後的事件；
+        None 表示不能合併（預設）。
+        """
+        return None
+
+
+@dataclass
+class NotificationEvent(BattleEvent):
+    """
+    通知類事件（顯示 / 統計用），批次模式下延後到 flush 時分派。
+    子類若有監聽器據以改變遊戲狀態，設 deferrable = False 保持同步。
+    """
+    deferrable: ClassVar[bool] = True
+
 
 # ══════════════════════════════════════════════
 #  EventBus
 # ══════════════════════════════════════════════
 
+class _Subscription:
+    """subscribe() 登記的單一回呼，對外表現與 Handler 相同。"""
+
+    __slots__ = ("event_type", "callback")
+
+    def __init__(self, event_type: type, callback: Callable) -> None:
+        self.event_type = event_type
+        self.callback   = callback
+
+    def listener_for(self, event_type: type) -> Callable | None:
+        return self.callback if event_type is self.event_type else None
+
+
 class _EventBus:
     """
     全域事件總線。
-      register(handler)   : 添加 Handler
-      unregister(handler) : 移除 Handler
-      emit(event)         : 發送事件給所有 Handler
-      clear()             : 清空所有 Handler（測試用）
+      register(handler)                : 添加 Handler
+      unregister(handler)              : 移除 Handler
+      subscribe(event_type, callback)  : 只訂閱單一事件類型
+      unsubscribe(event_type, callback): 取消訂閱
+      emit(event)                      : 發送事件給關心該類型的 listener
+      batch()                          : 批次範圍（context manager），可巢狀
+      flush()                          : 立即分派批次佇列中的事件
+      clear()                          : 清空所有 Handler（測試用），generation 遞增
+
+    長期存在的訂閱者（快取等）可比對 generation 判斷訂閱是否已被 clear() 清掉。
+
+    Handler 透過 listener_for(event_type) 宣告自己處理哪些事件
+    （BattleHandler 依 on_xxx 命名自動解析）；沒有 listener_for 的
+    物件視為接收所有事件，直接呼叫其 handle()。
     """
 
     def __init__(self):
         self._handlers: list = []
+        self._table: dict[type, tuple[Callable, ...]] = {}
+        self._batch_depth = 0
+        self._queue: list[BattleEvent] = []
+        self._profiler = None
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
 
     def register(self, handler) -> None:
         self._handlers.append(handler)
+        self._table = {}
 
     def unregister(self, handler) -> None:
         self._handlers.remove(handler)
+        self._table = {}
+
+    def subscribe(self, event_type: type, callback: Callable) -> None:
+        self.register(_Subscription(event_type, callback))
+
+    def unsubscribe(self, event_type: type, callback: Callable) -> None:
+        for h in self._handlers:
+            if (
+                isinstance(h, _Subscription)
+                and h.event_type is event_type
+                and h.callback == callback
+            ):
+                self.unregister(h)
+                return
+        raise ValueError(f"{callback!r} 未訂閱 {event_type.__name__}")
 
     def emit(self, event: BattleEvent) -> None:
-        for handler in self._handlers:
-            handler.handle(event)
+        event_type = event.__class__
+        if self._batch_depth:
+            queue = self._queue
+            if event_type.deferrable:
+                if queue:
+                    merged = queue[-1].coalesce(event)
+                    if merged is not None:
+                        queue[-1] = merged
+                        return
+                queue.append(event)
+                return
+            if queue and isinstance(event, NotificationEvent):
+                # 同步的通知事件：先分派之前排隊的通知，保持顯示順序
+                self.flush()
+
+        listeners = self._table.get(event_type)
+        if listeners is None:
+            listeners = self._build_listeners(event_type)
+        for listener in listeners:
+            listener(event)
+
+    def _dispatch(self, event: BattleEvent) -> None:
+        """直接分派給 listener（flush 用；不經過 emit，事件不重複計數）。"""
+        listeners = self._table.get(event.__class__)
+        if listeners is None:
+            listeners = self._build_listeners(event.__class__)
+        for listener in listeners:
+            listener(event)
+
+    # ── 批次模式 ──────────────────────────────
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        批次範圍：NotificationEvent 排隊合併，最外層範圍正常結束時一次分派。
+        以例外離開最外層範圍時丟棄佇列、不分派，避免 listener 在分派時
+        出錯而取代原本的例外，也避免殘留事件混入之後的分派。
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._queue = []
+            raise
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self.flush()
+
+    def flush(self) -> None:
+        """依序分派佇列中的事件（分派期間新產生的通知事件同步分派）。"""
+        queue, self._queue = self._queue, []
+        depth, self._batch_depth = self._batch_depth, 0
+        try:
+            for event in queue:
+                self._dispatch(event)
+        finally:
+            self._batch_depth = depth
+
+    def listeners(self, event_type: type) -> tuple[Callable, ...]:
+        """回傳 event_type 目前的 listener（依註冊順序）。"""
+        listeners = self._table.get(event_type)
+        if listeners is None:
+            listeners = self._build_listeners(event_type)
+        return listeners
 
     def clear(self) -> None:
         self._handlers.clear()
+        self._table = {}
+        self._queue = []
+        self._generation += 1
+
+    # ── 分派表 ────────────────────────────────
+
+    def _build_listeners(self, event_type: type) -> tuple[Callable, ...]:
+        listeners = []
+        for h in self._handlers:
+            resolve = getattr(h, "listener_for", None)
+            listener = resolve(event_type) if resolve else h.handle
+            if listener is not None:
+                if self._profiler is not None:
+                    listener = self._profiler.wrap_listener(listener)
+                listeners.append(listener)
+        # 以 tuple 儲存：emit 途中 register/unregister 只替換分派表，
+        # 不影響正在迭代的 listener 序列
+        result = tuple(listeners)
+        self._table[event_type] = result
+        return result
 
 
 # 全域單例
@@ -71,3 +240,9 @@ def _to_snake(name: str) -> str:
     """CamelCase → snake_case。例：DamageEvent → damage_event"""
     s1 = re.sub(r"(.)([A-Z][a-z]+)", r"\1_\2", name)
     return re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+
+
+@lru_cache(maxsize=None)
+def _listener_name(event_type: type) -> str:
+    """事件類型 → Handler 方法名稱（每個類型只計算一次）。"""
+    return f"on_{_to_snake(event_type.__name__)}"
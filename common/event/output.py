@@ -0,0 +1,197 @@
+"""
+終端輸出 Sink
+─────────────────────────────────────────────
+ConsoleBattleHandler 不直接 print()，而是把文字交給 Sink：
+
+  DirectSink    : 立即寫出（等同 print，預設；手動戰鬥需即時顯示）
+  BufferedSink  : 累積成一個 frame，依 FlushPolicy 一次寫出
+  ThreadedSink  : 同 BufferedSink，但 frame 交給背景執行緒寫出，
+                  戰鬥迴圈不必等待終端 / SSH 的 I/O
+
+輸出內容與順序與直接 print 完全一致（單一寫出端，frame 依序寫出）。
+stream 未指定時於寫出當下取 sys.stdout，redirect_stdout 仍有效。
+
+其他直接輸出的地方需配合：
+  drain_all()   : 等待輸入（input()）或直接 print 前，送出所有 sink 的緩衝
+  echo(text)    : 取代 print；有 listener 接收 InfoEvent（例如 ConsoleBattleHandler）
+                  時以 InfoEvent 發出，與戰鬥事件同序經 sink 寫出，否則直接 print
+存活的緩衝 sink 登記於模組層級的 _sinks，程式結束時由單一 atexit 回呼全部關閉。
+
+用法：
+    sink = ThreadedSink(policy=FlushPolicy(on_turn=True))
+    EventBus.register(ConsoleBattleHandler(sink))
+    ...
+    sink.close()            # 等待背景寫出完成
+"""
+
+from __future__ import annotations
+
+import atexit
+import queue
+import sys
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import TextIO
+
+from common.event.bus import EventBus
+from common.event.system import InfoEvent
+
+
+# ══════════════════════════════════════════════
+#  送出策略
+# ══════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class FlushPolicy:
+    """
+    on_turn   : 回合邊界（回合開始 / 戰鬥結束）時送出
+    max_lines : 緩衝達此行數即送出；0 = 不限
+    interval  : 距上次送出超過此秒數，下一次寫入時送出；0 = 不檢查
+    """
+    on_turn:   bool  = True
+    max_lines: int   = 256
+    interval:  float = 0.0
+
+
+# ══════════════════════════════════════════════
+#  Sink
+# ══════════════════════════════════════════════
+
+class DirectSink:
+    """立即寫出，不緩衝。"""
+
+    def __init__(self, stream: TextIO | None = None):
+        self._stream = stream
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    def write(self, text: str) -> None:
+        self.stream.write(text + "\n")
+
+    def frame_end(self) -> None:
+        """回合邊界。"""
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def drain(self) -> None:
+        """送出緩衝並等待寫出完成。"""
+        self.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+
+class BufferedSink(DirectSink):
+    """累積行，依 FlushPolicy 一次寫出整個 frame。"""
+
+    def __init__(self, stream: TextIO | None = None, policy: FlushPolicy | None = None):
+        super().__init__(stream)
+        self.policy = policy or FlushPolicy()
+        self._lines: list[str] = []
+        self._last_flush = time.monotonic()
+        _sinks.add(self)
+
+    def write(self, text: str) -> None:
+        self._lines.append(text)
+        policy = self.policy
+        if policy.max_lines and len(self._lines) >= policy.max_lines:
+            self.flush()
+        elif policy.interval and time.monotonic() - self._last_flush >= policy.interval:
+            self.flush()
+
+    def frame_end(self) -> None:
+        if self.policy.on_turn:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._lines:
+            return
+        frame = "\n".join(self._lines) + "\n"
+        self._lines = []
+        self._emit(self.stream, frame)
+
+    def _emit(self, stream: TextIO, frame: str) -> None:
+        stream.write(frame)
+        stream.flush()
+
+
+class ThreadedSink(BufferedSink):
+    """frame 交給背景執行緒寫出；close() / drain() 等待全部寫完。"""
+
+    def __init__(self, stream: TextIO | None = None, policy: FlushPolicy | None = None):
+        super().__init__(stream, policy)
+        self._closed = False
+        self._frames: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._run, name="console-sink", daemon=True,
+        )
+        self._writer.start()
+
+    def _emit(self, stream: TextIO, frame: str) -> None:
+        if self._closed:
+            super()._emit(stream, frame)
+            return
+        self._frames.put((stream, frame))
+
+    def _run(self) -> None:
+        frames = self._frames
+        while True:
+            item = frames.get()
+            try:
+                if item is None:
+                    return
+                stream, frame = item
+                stream.write(frame)
+                stream.flush()
+            finally:
+                frames.task_done()
+
+    def drain(self) -> None:
+        """送出緩衝並等待背景執行緒寫完（需與其他輸出同步時使用，例如等待輸入前）。"""
+        self.flush()
+        self._frames.join()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._frames.put(None)
+        self._writer.join()
+        _sinks.discard(self)
+
+
+# ══════════════════════════════════════════════
+#  模組層級
+# ══════════════════════════════════════════════
+
+# 存活的緩衝 sink（弱引用；ThreadedSink 於 close() 時移除）
+_sinks: weakref.WeakSet = weakref.WeakSet()
+
+
+def drain_all() -> None:
+    """送出所有 sink 的緩衝並等待寫完（input() 前呼叫，避免提示與輸出錯序）。"""
+    for sink in list(_sinks):
+        sink.drain()
+
+
+def echo(text: str = "") -> None:
+    """取代 print：有 InfoEvent listener 時經 EventBus 發出，否則直接 print。"""
+    if EventBus.listeners(InfoEvent):
+        EventBus.emit(InfoEvent(message=text))
+    else:
+        print(text)
+
+
+def _close_all() -> None:
+    for sink in list(_sinks):
+        sink.close()
+
+
+atexit.register(_close_all)
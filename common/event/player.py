@@ -6,7 +6,8 @@
 
 from __future__ import annotations
 from dataclasses import dataclass
-from common.event.bus import BattleEvent
+from typing import ClassVar
+from common.event.bus import BattleEvent, NotificationEvent
 
 
 # ── 成長 ──────────────────────────────────────
@@ -26,13 +27,15 @@ class StatChangedEvent(BattleEvent):
 # ── 背包 ──────────────────────────────────────
 
 @dataclass
-class ItemAddedEvent(BattleEvent):
+class ItemAddedEvent(NotificationEvent):
+    deferrable: ClassVar[bool] = False          # SynthesisAvailability 更新可合成清單
     item_name: str
     quantity: int
     is_new: bool
 
 @dataclass
-class ItemRemovedEvent(BattleEvent):
+class ItemRemovedEvent(NotificationEvent):
+    deferrable: ClassVar[bool] = False          # SynthesisAvailability 更新可合成清單
     item_name: str
     quantity: int
 
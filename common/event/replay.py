@@ -0,0 +1,359 @@
+"""
+戰鬥回放（二進位格式）
+─────────────────────────────────────────────
+ReplayRecorder : 接收所有事件，編碼成緊湊的二進位串流
+ReplayReader   : 解析回放檔，可跳到任一回合，並把事件重新分派給任意 BattleHandler
+
+與 JsonCollectorHandler 不同，錄製時不經過 asdict / dict：
+  - 事件類型以編號表示（類型表：模組路徑 + 欄位名稱，只存一次）
+  - 所有字串（角色名、技能名、訊息…）收進字串表，事件中只存編號
+  - 整數以 zigzag varint 編碼，整數值的 float 同樣以 varint 編碼
+  - 每個 TurnStartEvent 記錄其在事件區的位移，讀取時可直接 seek
+    （TurnStartEvent 不延後分派，批次模式下同樣先於該回合的其他事件錄製）
+
+檔案結構：
+  MAGIC(4) VERSION(1) │ 事件區 │ 索引區（類型表 / 字串表 / 回合位移）│ 索引區位移 <Q
+
+一個 recorder 對應一場戰鬥（clear() 後可重複使用）。
+
+用法：
+    recorder = ReplayRecorder()
+    EventBus.register(recorder)
+    engine.run()
+    recorder.save("boss_600001.replay")
+
+    reader = ReplayReader.open("boss_600001.replay")
+    reader.replay(ConsoleBattleHandler(), from_turn=5)
+"""
+
+from __future__ import annotations
+
+import importlib
+import struct
+from math import copysign
+from dataclasses import fields
+from typing import Iterator
+
+from common.event.bus import BattleEvent
+from common.event.battle import TurnStartEvent
+from common.event.handlers import BattleHandler
+
+
+MAGIC   = b"BRPL"
+VERSION = 1
+
+_FLOAT  = struct.Struct("<d")
+_FOOTER = struct.Struct("<Q")
+
+# 值的型別標記
+_T_NONE, _T_FALSE, _T_TRUE, _T_INT, _T_FLOAT, _T_STR, _T_LIST, _T_DICT, _T_TUPLE, _T_INTFLOAT = range(10)
+
+
+class ReplayFormatError(ValueError):
+    """回放檔格式錯誤或版本不符。"""
+
+
+# ══════════════════════════════════════════════
+#  varint
+# ══════════════════════════════════════════════
+
+def _write_varint(buf: bytearray, n: int) -> None:
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _read_varint(data, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(n: int) -> int:
+    return n << 1 if n >= 0 else ((-n) << 1) - 1
+
+
+def _unzigzag(n: int) -> int:
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+
+def _write_text(buf: bytearray, text: str) -> None:
+    raw = text.encode("utf-8")
+    _write_varint(buf, len(raw))
+    buf += raw
+
+
+def _read_text(data, pos: int) -> tuple[str, int]:
+    size, pos = _read_varint(data, pos)
+    return bytes(data[pos:pos + size]).decode("utf-8"), pos + size
+
+
+# ══════════════════════════════════════════════
+#  錄製
+# ══════════════════════════════════════════════
+
+class ReplayRecorder(BattleHandler):
+    """接收所有事件並編碼（覆寫 handle，EventBus 會把每種事件都交給它）。"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self._body = bytearray()
+        self._types: dict[type, tuple[int, tuple[str, ...]]] = {}
+        self._type_list: list[tuple[str, tuple[str, ...]]] = []
+        self._strings: dict[str, int] = {}
+        self._string_list: list[str] = []
+        self._turns: list[tuple[int, int]] = [(0, 0)]   # 第一回合前的事件視為第 0 回合
+        self.count = 0
+
+    # ── 編碼 ──────────────────────────────────
+
+    def handle(self, event: BattleEvent) -> None:
+        event_type = event.__class__
+        entry = self._types.get(event_type)
+        if entry is None:
+            entry = self._register_type(event_type)
+        type_id, names = entry
+
+        body = self._body
+        if event_type is TurnStartEvent:
+            self._turns.append((event.turn, len(body)))
+        _write_varint(body, type_id)
+        write = self._write_value
+        for name in names:
+            write(body, getattr(event, name))
+        self.count += 1
+
+    def _register_type(self, event_type: type) -> tuple[int, tuple[str, ...]]:
+        names = tuple(
+            f.name for f in fields(event_type)
+            if f.init and not f.metadata.get("transient")
+        )
+        path  = f"{event_type.__module__}:{event_type.__qualname__}"
+        entry = self._types[event_type] = (len(self._type_list), names)
+        self._type_list.append((path, names))
+        return entry
+
+    def _intern(self, text: str) -> int:
+        index = self._strings.get(text)
+        if index is None:
+            index = self._strings[text] = len(self._string_list)
+            self._string_list.append(text)
+        return index
+
+    def _write_value(self, buf: bytearray, value) -> None:
+        kind = value.__class__
+        if kind is str:
+            buf.append(_T_STR)
+            _write_varint(buf, self._intern(value))
+        elif kind is int:
+            buf.append(_T_INT)
+            _write_varint(buf, _zigzag(value))
+        elif kind is float:
+            if value.is_integer() and abs(value) < 1 << 53 and (value or copysign(1.0, value) > 0):
+                buf.append(_T_INTFLOAT)
+                _write_varint(buf, _zigzag(int(value)))
+            else:
+                buf.append(_T_FLOAT)
+                buf += _FLOAT.pack(value)
+        elif kind is bool:
+            buf.append(_T_TRUE if value else _T_FALSE)
+        elif value is None:
+            buf.append(_T_NONE)
+        elif isinstance(value, (list, tuple)):
+            buf.append(_T_TUPLE if isinstance(value, tuple) else _T_LIST)
+            _write_varint(buf, len(value))
+            for item in value:
+                self._write_value(buf, item)
+        elif isinstance(value, dict):
+            buf.append(_T_DICT)
+            _write_varint(buf, len(value))
+            for key, item in value.items():
+                self._write_value(buf, key)
+                self._write_value(buf, item)
+        else:
+            # 非基本型別（不應出現在事件中）以字串保存
+            buf.append(_T_STR)
+            _write_varint(buf, self._intern(str(value)))
+
+    # ── 輸出 ──────────────────────────────────
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        out += self._body
+
+        footer_offset = len(out)
+        _write_varint(out, len(self._type_list))
+        for path, names in self._type_list:
+            _write_text(out, path)
+            _write_varint(out, len(names))
+            for name in names:
+                _write_text(out, name)
+        _write_varint(out, len(self._string_list))
+        for text in self._string_list:
+            _write_text(out, text)
+        _write_varint(out, len(self._turns))
+        for turn, offset in self._turns:
+            _write_varint(out, _zigzag(turn))
+            _write_varint(out, offset)
+        _write_varint(out, self.count)
+
+        out += _FOOTER.pack(footer_offset)
+        return bytes(out)
+
+    def save(self, path) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+# ══════════════════════════════════════════════
+#  讀取
+# ══════════════════════════════════════════════
+
+class ReplayReader:
+
+    def __init__(self, data: bytes):
+        if data[:4] != MAGIC:
+            raise ReplayFormatError("不是戰鬥回放檔")
+        if data[4] != VERSION:
+            raise ReplayFormatError(f"不支援的回放版本：{data[4]}")
+
+        self._data = memoryview(data)
+        footer_offset, = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+        self._body_start = 5
+        self._body_end   = footer_offset
+
+        pos = footer_offset
+        count, pos = _read_varint(data, pos)
+        self._types: list[tuple[type, tuple[str, ...]]] = []
+        for _ in range(count):
+            path, pos = _read_text(data, pos)
+            size, pos = _read_varint(data, pos)
+            names = []
+            for _ in range(size):
+                name, pos = _read_text(data, pos)
+                names.append(name)
+            self._types.append((self._resolve(path), tuple(names)))
+
+        count, pos = _read_varint(data, pos)
+        self._strings: list[str] = []
+        for _ in range(count):
+            text, pos = _read_text(data, pos)
+            self._strings.append(text)
+
+        count, pos = _read_varint(data, pos)
+        self._index: list[tuple[int, int]] = []
+        for _ in range(count):
+            turn, pos   = _read_varint(data, pos)
+            offset, pos = _read_varint(data, pos)
+            self._index.append((_unzigzag(turn), offset))
+        self.count, pos = _read_varint(data, pos)
+
+    @classmethod
+    def open(cls, path) -> "ReplayReader":
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    @staticmethod
+    def _resolve(path: str) -> type:
+        module_name, _, qualname = path.partition(":")
+        target = importlib.import_module(module_name)
+        for part in qualname.split("."):
+            target = getattr(target, part)
+        return target
+
+    # ── 查詢 ──────────────────────────────────
+
+    @property
+    def turns(self) -> list[int]:
+        """有記錄的回合（0 = 第一回合開始前）。"""
+        return [turn for turn, _ in self._index]
+
+    def offset_of(self, turn: int) -> int:
+        """turn 在事件區的位移；找不到時拋出 KeyError。"""
+        for t, offset in self._index:
+            if t == turn:
+                return offset
+        raise KeyError(f"回放中沒有第 {turn} 回合")
+
+    # ── 解碼 ──────────────────────────────────
+
+    def events(self, from_turn: int = 0, to_turn: int | None = None) -> Iterator[BattleEvent]:
+        """依序產生 from_turn ~ to_turn（含）的事件。"""
+        pos = self._body_start + self.offset_of(from_turn)
+        end = self._body_end
+        if to_turn is not None:
+            later = [o for t, o in self._index if t > to_turn]
+            if later:
+                end = self._body_start + min(later)
+
+        data, types, read = self._data, self._types, self._read_value
+        while pos < end:
+            type_id, pos = _read_varint(data, pos)
+            event_type, names = types[type_id]
+            kwargs = {}
+            for name in names:
+                kwargs[name], pos = read(pos)
+            yield event_type(**kwargs)
+
+    def __iter__(self) -> Iterator[BattleEvent]:
+        return self.events()
+
+    def replay(self, handler: BattleHandler, from_turn: int = 0, to_turn: int | None = None) -> int:
+        """把事件依序交給 handler（與 EventBus 相同的分派方式），回傳分派數量。"""
+        listeners: dict[type, object] = {}
+        dispatched = 0
+        for event in self.events(from_turn, to_turn):
+            event_type = event.__class__
+            if event_type not in listeners:
+                listeners[event_type] = handler.listener_for(event_type)
+            listener = listeners[event_type]
+            if listener is not None:
+                listener(event)
+                dispatched += 1
+        return dispatched
+
+    def _read_value(self, pos: int):
+        data = self._data
+        tag = data[pos]
+        pos += 1
+        if tag == _T_STR:
+            index, pos = _read_varint(data, pos)
+            return self._strings[index], pos
+        if tag == _T_INT:
+            n, pos = _read_varint(data, pos)
+            return _unzigzag(n), pos
+        if tag == _T_INTFLOAT:
+            n, pos = _read_varint(data, pos)
+            return float(_unzigzag(n)), pos
+        if tag == _T_FLOAT:
+            return _FLOAT.unpack_from(data, pos)[0], pos + _FLOAT.size
+        if tag == _T_TRUE:
+            return True, pos
+        if tag == _T_FALSE:
+            return False, pos
+        if tag == _T_NONE:
+            return None, pos
+        if tag in (_T_LIST, _T_TUPLE):
+            size, pos = _read_varint(data, pos)
+            items = []
+            for _ in range(size):
+                item, pos = self._read_value(pos)
+                items.append(item)
+            return (tuple(items) if tag == _T_TUPLE else items), pos
+        if tag == _T_DICT:
+            size, pos = _read_varint(data, pos)
+            result = {}
+            for _ in range(size):
+                key, pos = self._read_value(pos)
+                result[key], pos = self._read_value(pos)
+            return result, pos
+        raise ReplayFormatError(f"未知的值標記：{tag}")
@@ -6,7 +6,7 @@ common.event.system
 """
 from __future__ import annotations
 from dataclasses import dataclass
-from common.event.bus import BattleEvent
+from common.event.bus import BattleEvent, NotificationEvent
 from common.event.system.cultivation import (
     CultivationUpgradeEvent,
     CultivationResetEvent,
@@ -66,12 +66,12 @@ __all__ = [
 
 
 @dataclass
-class WarningEvent(BattleEvent):
+class WarningEvent(NotificationEvent):
     """警告 / 操作失敗訊息，取代 print。"""
     message: str = ""
 
 @dataclass
-class InfoEvent(BattleEvent):
+class InfoEvent(NotificationEvent):
     """
     一般提示訊息，取代 print。
     用途：選擇心法線、初始化完成、一般操作回饋等。
@@ -79,7 +79,7 @@ class InfoEvent(BattleEvent):
     message: str = ""
 
 @dataclass
-class HealEvent(BattleEvent):
+class HealEvent(NotificationEvent):
     """治療結算通知。"""
     source:    str   = ""
     target:    str   = ""
@@ -42,4 +42,24 @@ class SynthesisListRequestEvent(BattleEvent):
 class SynthesisListResultEvent(BattleEvent):
     """回傳可合成清單給 UI。"""
     player_name:          str       = ""
-    available_targets:    list      = field(default_factory=list)
\ No newline at end of file
+    available_targets:    list      = field(default_factory=list)
+
+
+@dataclass
+class SynthesisPlanRequestEvent(BattleEvent):
+    """請求多段合成：自動補齊中間材料，整個計畫一次執行。"""
+    player_name:          str       = ""
+    target_number:        int | str = 0
+    quantity:             int       = 1
+
+
+@dataclass
+class SynthesisPlanCompletedEvent(BattleEvent):
+    """多段合成完成（整個計畫只發送一次）。"""
+    player_name:          str       = ""
+    target_number:        int | str = 0
+    result_item_name:     str       = ""
+    result_quantity:      int       = 0
+    steps:                dict      = field(default_factory=dict)   # {target_number: 合成次數}
+    consumed:             dict      = field(default_factory=dict)   # {number: 淨消耗}
+    produced:             dict      = field(default_factory=dict)   # {number: 淨增加}
@@ -1,7 +1,10 @@
-import random
+from common.battle.rng import battle_rng
+from common.event import echo
 
 
 def boss_logic(boss, battle):
+    rng = battle_rng(battle, "ai")
+
     # 初始权重
     weights = {
         'summon': 0,
@@ -23,7 +26,7 @@ def boss_logic(boss, battle):
                 break
 
     # 根据权重选择行动
-    action = random.choices(
+    action = rng.choices(
         population=['summon', 'skill', 'equipment', 'attack'],
         weights=[weights['summon'], weights['skill'], weights['equipment'], weights['attack']],
         k=1
@@ -31,13 +34,11 @@ def boss_logic(boss, battle):
 
     if action == 'summon' and len(battle.enemies) < 5:
         summoned_enemies = boss.summon()
-        battle.enemies.extend(summoned_enemies)
-        battle.turn_order.extend(summoned_enemies)
-        battle.update_turn_order()
-        print(f"{boss.name} 召唤了小怪！")
+        battle.add_enemies(summoned_enemies)
+        echo(f"{boss.name} 召唤了小怪！")
     elif action == 'skill':
         if boss.skills:
-            skill = random.choice(boss.skills)
+            skill = rng.choice(boss.skills)
             if skill.target_scope == "all":
                 if skill.target_type == "enemy":
                     targets = [battle.player] + battle.allies
@@ -45,13 +46,13 @@ def boss_logic(boss, battle):
                     targets = battle.enemies
             else:
                 if skill.target_type == "enemy":
-                    targets = [random.choice([battle.player] + battle.allies)]
+                    targets = [rng.choice([battle.player] + battle.allies)]
                 elif skill.target_type == "ally":
-                    targets = [random.choice(battle.enemies)]
+                    targets = [rng.choice(battle.enemies)]
             boss.use_skill(skill, targets)
     elif action == 'equipment':
         if boss.equipment:
-            equipment = random.choice(boss.equipment)
+            equipment = rng.choice(boss.equipment)
             if equipment.target_scope == "all":
                 if equipment.target_type == "enemy":
                     targets = [battle.player] + battle.allies
@@ -59,10 +60,10 @@ def boss_logic(boss, battle):
                     targets = battle.enemies
             else:
                 if equipment.target_type == "enemy":
-                    targets = [random.choice([battle.player] + battle.allies)]
+                    targets = [rng.choice([battle.player] + battle.allies)]
                 elif equipment.target_type == "ally":
-                    targets = [random.choice(battle.enemies)]
+                    targets = [rng.choice(battle.enemies)]
             boss.use_equipment(equipment, targets)
     else:
-        target = random.choice([battle.player] + battle.allies)
+        target = rng.choice([battle.player] + battle.allies)
         boss.perform_attack(target)
@@ -1,8 +1,16 @@
-import random
-from library.skill_library import skill_library
+from common.battle.rng import battle_rng
+from common.event import echo
+from core.registry import registry
+
+
+def skill_library(number):
+    """技能原型（旧版 library.skill_library 已由 registry 取代）。"""
+    return registry.get("skill", number)
 
 
 def boss_logic(boss, battle):
+    rng = battle_rng(battle, "ai")
+
     # 判断血量是否大于等于 60%
     if boss.hp >= boss.max_hp * 0.6:
         # 初始化权重
@@ -12,7 +20,7 @@ def boss_logic(boss, battle):
         }
 
         # 根据权重选择行动
-        action = random.choices(
+        action = rng.choices(
             population=['summon', 'skill_220019_220020'],
             weights=[weights['summon'], weights['skill_220019_220020']],
             k=1
@@ -21,17 +29,15 @@ def boss_logic(boss, battle):
         if action == 'summon' and len(battle.enemies) < 5:
             # 召唤小怪
             summoned_enemies = boss.summon()
-            battle.enemies.extend(summoned_enemies)
-            battle.turn_order.extend(summoned_enemies)
-            battle.update_turn_order()
-            print(f"{boss.name} 召唤了小怪！")
+            battle.add_enemies(summoned_enemies)
+            echo(f"{boss.name} 召唤了小怪！")
 
         elif action == 'skill_220019_220020':
             last_skill_used = getattr(boss, 'last_skill_used', None)
-            if last_skill_used == skill_library[220019]:
-                skill = skill_library[220020]
+            if last_skill_used == skill_library(220019):
+                skill = skill_library(220020)
             else:
-                skill = skill_library[220019]
+                skill = skill_library(220019)
             targets = determine_targets(skill, battle)
             boss.use_skill(skill, targets)
             boss.last_skill_used = skill  # 保存上次使用的技能
@@ -43,7 +49,7 @@ def boss_logic(boss, battle):
             'skill_220021': 0.7  # 70% 概率使用 skill_library[220021]
         }
 
-        action = random.choices(
+        action = rng.choices(
             population=['attack', 'skill_220021'],
             weights=[weights['attack'], weights['skill_220021']],
             k=1
@@ -51,16 +57,17 @@ def boss_logic(boss, battle):
 
         if action == 'attack':
             # 普通攻击
-            target = random.choice([battle.player] + battle.allies)
+            target = rng.choice([battle.player] + battle.allies)
             boss.perform_attack(target)
         elif action == 'skill_220021':
             # 使用技能 skill_library[220021]
-            skill = skill_library[220021]
+            skill = skill_library(220021)
             targets = determine_targets(skill, battle)
             boss.use_skill(skill, targets)
 
 
 def determine_targets(ability, battle):
+    rng = battle_rng(battle, "ai")
     if ability.target_scope == "all":
         if ability.target_type == "enemy":
             return [battle.player] + battle.allies
@@ -68,6 +75,6 @@ def determine_targets(ability, battle):
             return battle.enemies
     else:
         if ability.target_type == "enemy":
-            return [random.choice([battle.player] + battle.allies)]
+            return [rng.choice([battle.player] + battle.allies)]
         elif ability.target_type == "ally":
-            return [random.choice(battle.enemies)]
+            return [rng.choice(battle.enemies)]
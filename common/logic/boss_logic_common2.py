@@ -1,7 +1,10 @@
-import random
+from common.battle.rng import battle_rng
+from common.event import echo
 
 
 def boss_logic(boss, battle):
+    rng = battle_rng(battle, "ai")
+
     # 初始化权重
     if boss.hp > boss.max_hp * 0.5:
         weights = {
@@ -18,7 +21,7 @@ def boss_logic(boss, battle):
         }
 
     # 根据权重选择行动
-    action = random.choices(
+    action = rng.choices(
         population=['skill_or_equipment', 'attack', 'summon'],
         weights=[weights['skill_or_equipment'], weights['attack'], weights['summon']],
         k=1
@@ -28,32 +31,31 @@ def boss_logic(boss, battle):
     if action == 'summon' and len(battle.enemies) < 5:
         # 召唤小怪
         summoned_enemies = boss.summon()
-        battle.enemies.extend(summoned_enemies)
-        battle.turn_order.extend(summoned_enemies)
-        battle.update_turn_order()
-        print(f"{boss.name} 召唤了小怪！")
+        battle.add_enemies(summoned_enemies)
+        echo(f"{boss.name} 召唤了小怪！")
 
     elif action == 'skill_or_equipment':
         # 随机选择技能或法宝
         if boss.skills or boss.equipment:
-            if random.random() < 0.5 and boss.skills:
+            if rng.random() < 0.5 and boss.skills:
                 # 使用技能
-                skill = random.choice(boss.skills)
+                skill = rng.choice(boss.skills)
                 targets = determine_targets(skill, battle)
                 boss.use_skill(skill, targets)
             elif boss.equipment:
                 # 使用法宝
-                equipment = random.choice(boss.equipment)
+                equipment = rng.choice(boss.equipment)
                 targets = determine_targets(equipment, battle)
                 boss.use_equipment(equipment, targets)
 
     elif action == 'attack':
         # 普攻
-        target = random.choice([battle.player] + battle.allies)
+        target = rng.choice([battle.player] + battle.allies)
         boss.perform_attack(target)
 
 
 def determine_targets(ability, battle):
+    rng = battle_rng(battle, "ai")
     if ability.target_scope == "all":
         if ability.target_type == "enemy":
             return [battle.player] + battle.allies
@@ -61,6 +63,6 @@ def determine_targets(ability, battle):
             return battle.enemies
     else:
         if ability.target_type == "enemy":
-            return [random.choice([battle.player] + battle.allies)]
+            return [rng.choice([battle.player] + battle.allies)]
         elif ability.target_type == "ally":
-            return [random.choice(battle.enemies)]
\ No newline at end of file
+            return [rng.choice(battle.enemies)]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from common.character.player import Player
-from .item import Skill, Equipment, Medicine, Product, Material, Warp
+from .item import Skill, Equipment, Medicine, Product, Material, Warp, battle_copy
 from common.character.boss import Boss
 from common.character.ally import Ally
 from core.registry import registry  # ← 替換所有 library import
@@ -10,8 +10,8 @@ import copy
 class Battle:
     def __init__(self, player, allies, enemies):
         self.player = player
-        self.allies = [copy.deepcopy(ally) for ally in allies]
-        self.enemies = [copy.deepcopy(enemy) for enemy in enemies]
+        self.allies = [ally.battle_clone() for ally in allies]
+        self.enemies = [enemy.battle_clone() for enemy in enemies]
         if not self.player and not self.enemies:
             raise ValueError("没有玩家或敌人，无法开始战斗")
         self.defeated_enemies = []
@@ -24,13 +24,13 @@ class Battle:
         for enemy in self.enemies:
             enemy.battle = self
         if self.player:
-            self.player.battle_skills = [copy.deepcopy(skill) for skill in self.player.skills]
+            self.player.battle_skills = [battle_copy(skill) for skill in self.player.skills]
             self.player.battle = self
         for ally in self.allies:
-            ally.battle_skills = [copy.deepcopy(skill) for skill in ally.skills]
+            ally.battle_skills = [battle_copy(skill) for skill in ally.skills]
             ally.battle = self
         for enemy in self.enemies:
-            enemy.battle_skills = [copy.deepcopy(skill) for skill in enemy.skills]
+            enemy.battle_skills = [battle_copy(skill) for skill in enemy.skills]
             enemy.battle = self
         self.determine_turn_order()
 
@@ -354,6 +354,12 @@ class Battle:
         self.turn_order = sorted(participants, key=lambda x: x.speed, reverse=True)
         print("更新后的回合顺序:", [p.name for p in self.turn_order])
 
+    def add_enemies(self, enemies):
+        # 与 BattleEngine.add_enemies 接口一致，供 Boss 脚本召唤使用
+        self.enemies.extend(enemies)
+        self.turn_order.extend(enemies)
+        self.update_turn_order()
+
     def remove_dead_participants(self):
         for enemy in self.enemies[:]:
             if enemy.hp <= 0:
@@ -64,8 +64,15 @@ class Buff:
     target       : 目標名稱（str，不持有實例引用）
     duration     : 持續回合數（-1 表示永久）
     effect       : 效果描述 dict，格式見上方規格說明
+    target_id    : 目標 unique_id（發出的 Request 帶上，同名目標不會混淆）
+
+    掛到 BattleState 後，duration 由「到期回合 - 當前回合」推導，
+    不需每回合遞減；離開 BattleState 時凍結為當下剩餘值。
     """
 
+    _state = None           # 所屬 BattleState（到期排程）
+    _expires_at = None      # 到期的絕對回合；None = 未排程 / 永久
+
     def __init__(
         self,
         name: str,
@@ -74,12 +81,14 @@ class Buff:
         target: str,
         duration: int,
         effect: dict,
+        target_id: str = "",
     ):
         self.name             = name
         self.buff_type        = buff_type
         self.source           = source
         self.target           = target
-        self.duration         = duration
+        self.target_id        = target_id
+        self._duration        = duration
         self.original_duration = duration
         self.effect           = effect
 
@@ -87,6 +96,27 @@ class Buff:
         # key: attribute, value: 當時發出的 change 量
         self._applied_changes: dict[str, float] = {}
 
+    # ══════════════════════════════════════════
+    #  持續時間
+    # ══════════════════════════════════════════
+
+    @property
+    def duration(self) -> int:
+        if self._expires_at is None:
+            return self._duration
+        return self._expires_at - self._state.round
+
+    @duration.setter
+    def duration(self, value: int) -> None:
+        self._duration = value
+        if self._state is not None:
+            self._state._schedule(self)
+
+    @property
+    def has_tick(self) -> bool:
+        """每回合有持續效果（DoT / HoT）。"""
+        return bool(self.effect.get("tick", False))
+
     # ══════════════════════════════════════════
     #  生命週期鉤子
     # ══════════════════════════════════════════
@@ -108,6 +138,7 @@ class Buff:
                 target=self.target,
                 status=attribute,
                 rounds=self.duration,
+                target_id=self.target_id,
             ))
             return
 
@@ -131,6 +162,7 @@ class Buff:
                 attr=attribute,
                 change=value,
                 scope="battle",
+                target_id=self.target_id,
             ))
 
         EventBus.emit(BuffAppliedEvent(
@@ -184,6 +216,7 @@ class Buff:
                 attr=attr,
                 change=-applied_value,
                 scope="battle",
+                target_id=self.target_id,
             ))
 
         self._applied_changes.clear()
@@ -205,6 +238,7 @@ class Buff:
                 target=self.target,
                 amount=value,
                 attr=attribute,
+                target_id=self.target_id,
             ))
         else:
             EventBus.emit(DamageRequestEvent(
@@ -212,6 +246,7 @@ class Buff:
                 target=self.target,
                 amount=-value,
                 damage_type="true",
+                target_id=self.target_id,
             ))
 
     def decrement_duration(self) -> bool:
@@ -250,7 +285,7 @@ class Buff:
 
 class StunBuff(Buff):
     """眩暈：目標無法行動。"""
-    def __init__(self, source: str, target: str, duration: int):
+    def __init__(self, source: str, target: str, duration: int, target_id: str = ""):
         super().__init__(
             name="stunned",
             buff_type="debuff",
@@ -258,12 +293,13 @@ class StunBuff(Buff):
             target=target,
             duration=duration,
             effect={"attribute": "stunned"},
+            target_id=target_id,
         )
 
 
 class ParalysisBuff(Buff):
     """麻痹：目標有機率無法行動。"""
-    def __init__(self, source: str, target: str, duration: int):
+    def __init__(self, source: str, target: str, duration: int, target_id: str = ""):
         super().__init__(
             name="paralyzed",
             buff_type="debuff",
@@ -271,12 +307,13 @@ class ParalysisBuff(Buff):
             target=target,
             duration=duration,
             effect={"attribute": "paralyzed"},
+            target_id=target_id,
         )
 
 
 class SilenceBuff(Buff):
     """沉默：目標無法使用技能。"""
-    def __init__(self, source: str, target: str, duration: int):
+    def __init__(self, source: str, target: str, duration: int, target_id: str = ""):
         super().__init__(
             name="silenced",
             buff_type="debuff",
@@ -284,12 +321,13 @@ class SilenceBuff(Buff):
             target=target,
             duration=duration,
             effect={"attribute": "silenced"},
+            target_id=target_id,
         )
 
 
 class BlindBuff(Buff):
     """致盲：目標攻擊必定落空。"""
-    def __init__(self, source: str, target: str, duration: int):
+    def __init__(self, source: str, target: str, duration: int, target_id: str = ""):
         super().__init__(
             name="blinded",
             buff_type="debuff",
@@ -297,4 +335,5 @@ class BlindBuff(Buff):
             target=target,
             duration=duration,
             effect={"attribute": "blinded"},
+            target_id=target_id,
         )
@@ -1,5 +1,39 @@
-import random
+import copy
+import re
 from all.gamestate import game_state
+from common.battle.rng import battle_rng
+from common.event import echo
+
+
+_LIBRARY_REF = re.compile(r"^(\w+)_library\[(\d+)\]$")
+
+
+def resolve_reference(item):
+    """
+    资料中的引用字串（如 Boss 的 "skill_library[240006]"）→ registry 中的原型。
+    非字串原样返回；无法解析的字串也原样返回。
+    """
+    if not isinstance(item, str):
+        return item
+    match = _LIBRARY_REF.match(item)
+    if match is None:
+        return item
+    from core.registry import registry
+
+    prototype = registry.get(match.group(1), int(match.group(2)))
+    return item if prototype is None else prototype
+
+
+def battle_copy(item):
+    """
+    战斗用副本：Item 走 Item.battle_copy()（浅拷贝），
+    "skill_library[...]" 等引用字串先解析为原型；其他对象深拷贝。
+    """
+    item = resolve_reference(item)
+    if isinstance(item, str):
+        return item
+    copier = getattr(item, "battle_copy", None)
+    return copier() if copier is not None else copy.deepcopy(item)
 
 
 class Item:
@@ -14,6 +48,13 @@ class Item:
     def use(self, user, target):
         pass  # Specific effect implemented in subclasses
 
+    def battle_copy(self):
+        """
+        战斗用副本：浅拷贝。
+        frequency / quantity 等计数为独立字段，effect_changes / cost 等定义数据共享（只读）。
+        """
+        return copy.copy(self)
+
 
 class Equipment(Item):
     def __init__(self, number, name, description, quality, category, price, quantity, hp, mp, attack, defense, speed,
@@ -63,11 +104,11 @@ class Equipment(Item):
 
     def use(self, user, target):
         if user.hp <= 0:
-            print(f"{user.name} 无法行动，因为他的 HP 为 0 或更低。")
+            echo(f"{user.name} 无法行动，因为他的 HP 为 0 或更低。")
             return
 
         if self.category != "法宝":
-            print(f"{self.name} 不是法宝，无法使用。")
+            echo(f"{self.name} 不是法宝，无法使用。")
             return
 
         if isinstance(target, list):
@@ -82,12 +123,12 @@ class Equipment(Item):
             if getattr(user, attr) >= value:
                 setattr(user, attr, getattr(user, attr) - value)
             else:
-                print(f"{user.name} 没有足够的 {attr} 来使用法宝 {self.name}")
+                echo(f"{user.name} 没有足够的 {attr} 来使用法宝 {self.name}")
                 return
 
         # 确保 target 是 Player 或 Enemy 对象
         if not hasattr(target, 'remove_buffs_by_type'):
-            print(f"{target.name} 不是有效的目标，无法使用法宝 {self.name}。")
+            echo(f"{target.name} 不是有效的目标，无法使用法宝 {self.name}。")
             return
 
         # 处理法宝效果
@@ -103,31 +144,31 @@ class Equipment(Item):
                 if effect_change["attribute"] in ["attack", "defense"]:
                     # 基于攻击或防御的技能需要调用计算伤害函数
                     skill_multiplier = effect_change.get("multiplier", 1.0)
-                    damage = user.calculate_damage(target, base_value, skill_multiplier=skill_multiplier, is_skill=True)
+                    damage, _ = user.calculate_damage(target, base_value, skill_multiplier=skill_multiplier, is_skill=True)
                     target.hp = max(0, target.hp - damage)
-                    print(f"{user.name} 使用了法宝 {self.name} 对 {target.name}，造成了 {damage:.2f} 点伤害。")
+                    echo(f"{user.name} 使用了法宝 {self.name} 对 {target.name}，造成了 {damage:.2f} 点伤害。")
                 else:
                     # 普通伤害或真实伤害直接影响
                     multiplier = effect_change.get("multiplier", 1.0)
                     change = base_value * multiplier
                     target.hp = max(0, target.hp - change)
                     if change >= 0:
-                        print(f"{user.name} 使用了技能 {self.name} 对 {target.name}，造成了 {change:.2f} 点 {attr} 真实伤害！")
+                        echo(f"{user.name} 使用了技能 {self.name} 对 {target.name}，造成了 {change:.2f} 点 {attr} 真实伤害！")
                     else:
                         change = -change
-                        print(f"{user.name} 使用了技能 {self.name} 对 {target.name}，回复了 {change:.2f}点血量！")
+                        echo(f"{user.name} 使用了技能 {self.name} 对 {target.name}，回复了 {change:.2f}点血量！")
 
             elif attr == "buff":
                 for buff_change in effect_change:
                     if buff_change["action"] == "add":
                         chance = buff_change.get("chance", 1.0)  # 默认 100% 概率
-                        if random.random() <= chance:
+                        if battle_rng(user, "status").random() <= chance:
                             new_buff = Buff(buff_change["name"], buff_change["type"], user, target,
                                             buff_change["duration"], buff_change["effect"])
                             target.add_buff(new_buff)
-                            print(f"{target.name} 获得了 {buff_change['name']} buff。")
+                            echo(f"{target.name} 获得了 {buff_change['name']} buff。")
                         else:
-                            print(f"{target.name} 未能获得 {buff_change['name']} buff。")
+                            echo(f"{target.name} 未能获得 {buff_change['name']} buff。")
                     elif buff_change["action"] == "remove":
                         if buff_change["type"] == "all":
                             target.remove_all_buffs()
@@ -139,7 +180,7 @@ class Equipment(Item):
                             target.remove_buff(buff_name=buff_change["name"])
                         else:
                             target.remove_buff(buff_type=buff_change["type"])
-                        print(f"{target.name} 移除了 {buff_change.get('name', buff_change['type'])} buff。")
+                        echo(f"{target.name} 移除了 {buff_change.get('name', buff_change['type'])} buff。")
             else:
                 if isinstance(effect_change, dict):
                     base_value = getattr(user, effect_change.get('attribute', 'hp'))
@@ -149,7 +190,7 @@ class Equipment(Item):
                     change = effect_change
                 setattr(target, attr,
                         max(0, min(getattr(target, attr) + change, target.max_hp if attr == 'hp' else target.max_mp)))
-                print(f"{user.name} 使用了法宝 {self.name} 对 {target.name}，造成了 {change:.2f} 点 {attr} 变化。")
+                echo(f"{user.name} 使用了法宝 {self.name} 对 {target.name}，造成了 {change:.2f} 点 {attr} 变化。")
 
     def __str__(self):
         return f"{self.name} (ID: {self.number}, 数量: {self.quantity})"
@@ -165,9 +206,9 @@ class Medicine(Item):
             self.apply_medicine_effect(user)  # 将效果应用到用户
             self.quantity -= 1  # 使用一次药品，数量减1
             if self.quantity == 0:
-                print(f"{self.name} 已经用完。")
+                echo(f"{self.name} 已经用完。")
         else:
-            print(f"{self.name} 数量不足，无法使用。")
+            echo(f"{self.name} 数量不足，无法使用。")
 
     def apply_medicine_effect(self, user):
         for attr, effect in self.effect_changes.items():
@@ -178,7 +219,7 @@ class Medicine(Item):
                 # 其他属性影响药品属性汇总
                 self.apply_medicine_summary_effect(user, attr, effect)
 
-        print(f"{user.name} 使用了药品 {self.name}，{self.description}")
+        echo(f"{user.name} 使用了药品 {self.name}，{self.description}")
 
     def apply_direct_effect(self, user, attr, effect):
         if isinstance(effect, dict):
@@ -193,7 +234,7 @@ class Medicine(Item):
 
         # 更新玩家的当前 hp 或 mp
         setattr(user, attr, getattr(user, attr) + value)
-        print(f"{user.name} 的 {attr} 增加了 {value} 点。")
+        echo(f"{user.name} 的 {attr} 增加了 {value} 点。")
 
     def apply_medicine_summary_effect(self, user, attr, effect):
         # 药品属性汇总字段，例如 medicine_attack, medicine_defense 等
@@ -213,9 +254,9 @@ class Medicine(Item):
 
             # 更新对应的药品属性汇总字段
             setattr(user, medicine_attr, getattr(user, medicine_attr) + value)
-            print(f"{user.name} 的 {medicine_attr} 增加了 {value} 点。")
+            echo(f"{user.name} 的 {medicine_attr} 增加了 {value} 点。")
         else:
-            print(f"玩家没有属性: {medicine_attr}，无法应用 {self.name} 的效果。")
+            echo(f"玩家没有属性: {medicine_attr}，无法应用 {self.name} 的效果。")
 
 
 class Material(Item):
@@ -235,16 +276,16 @@ class Skill(Item):
 
     def use(self, user, target):
         if user.hp <= 0:
-            print(f"{user.name} 无法行动，因为他的 HP 为 0 或更低。")
+            echo(f"{user.name} 无法行动，因为他的 HP 为 0 或更低。")
             return
 
         # 检查技能使用次数
         if self.frequency is not None:
             if self.frequency <= 0:
-                print(f"灵力枯竭，该地灵力已经无法支持 {user.name} 使用技能 {self.name}")
+                echo(f"灵力枯竭，该地灵力已经无法支持 {user.name} 使用技能 {self.name}")
                 return
             else:
-                print(f"{self.name} 的剩余使用次数: {self.frequency}")
+                echo(f"{self.name} 的剩余使用次数: {self.frequency}")
 
         # 计算技能消耗
         for attr, cost_change in self.cost.items():
@@ -257,9 +298,9 @@ class Skill(Item):
 
             if getattr(user, attr) >= cost:
                 setattr(user, attr, getattr(user, attr) - cost)
-                print(f"{user.name} 使用技能 {self.name} 消耗了 {cost:.2f} 点 {attr}。")
+                echo(f"{user.name} 使用技能 {self.name} 消耗了 {cost:.2f} 点 {attr}。")
             else:
-                print(f"{user.name} 没有足够的 {attr} 来使用技能 {self.name}")
+                echo(f"{user.name} 没有足够的 {attr} 来使用技能 {self.name}")
                 return
 
         # 确定目标
@@ -277,11 +318,11 @@ class Skill(Item):
         # 减少技能的剩余使用次数
         if self.frequency is not None:
             self.frequency -= 1
-            print(f"{self.name} 的使用次数减少为: {self.frequency}")
+            echo(f"{self.name} 的使用次数减少为: {self.frequency}")
 
     def get_targets(self, user):
         if user.battle is None:
-            print(f"Error: {user.name} 没有绑定到一个有效的战斗实例。")
+            echo(f"Error: {user.name} 没有绑定到一个有效的战斗实例。")
             return []
         if self.target_type == "ally" and self.target_scope == "user":
             return [[user]]  # 返回使用者自身作为目标
@@ -316,32 +357,43 @@ class Skill(Item):
 
             if isinstance(effect_change, dict) and effect_change.get("attribute") in ["attack", "defense"]:
                 # 处理普通伤害
-                damage = user.calculate_damage(target, base_value, skill_multiplier=multiplier, is_skill=True)
+                damage, _ = user.calculate_damage(target, base_value, skill_multiplier=multiplier, is_skill=True)
                 target.hp = max(0, target.hp - damage)
-                print(f"{user.name} 使用了技能 {self.name} 对 {target.name}，造成了 {damage:.2f} 点伤害。")
+                echo(f"{user.name} 使用了技能 {self.name} 对 {target.name}，造成了 {damage:.2f} 点伤害。")
             else:
                 # 处理真实伤害或治疗
                 change = base_value * multiplier
                 target.hp = max(0, target.hp - change)
                 if change >= 0:
-                    print(f"{user.name} 使用了技能 {self.name} 对 {target.name}，造成了 {change:.2f} 点真实伤害。")
+                    echo(f"{user.name} 使用了技能 {self.name} 对 {target.name}，造成了 {change:.2f} 点真实伤害。")
                 else:
-                    print(f"{user.name} 使用了技能 {self.name} 对 {target.name}，回复了 {-change:.2f} 点血量。")
+                    echo(f"{user.name} 使用了技能 {self.name} 对 {target.name}，回复了 {-change:.2f} 点血量。")
 
         def apply_buff_change(effect_change, target):
             for buff_change in effect_change:
                 action = buff_change["action"]
-                if action == "add" and random.random() <= buff_change.get("chance", 1.0):
-                    new_buff = Buff(buff_change["name"], buff_change["type"], user, target,
-                                    buff_change["duration"], buff_change["effect"])
-                    target.add_buff(new_buff)
-                    print(f"{target.name} 获得了 {buff_change['name']} buff。")
+                if action == "add" and battle_rng(user, "status").random() <= buff_change.get("chance", 1.0):
+                    if hasattr(target, "request_buff"):
+                        # 战斗中的 Combatant 没有 add_buff，经 BuffRequestEvent 挂到 battle_state
+                        target.request_buff(buff_change["name"], buff_change["type"],
+                                            buff_change["duration"], buff_change["effect"],
+                                            source=user.name)
+                    else:
+                        new_buff = Buff(buff_change["name"], buff_change["type"], user, target,
+                                        buff_change["duration"], buff_change["effect"])
+                        target.add_buff(new_buff)
+                    echo(f"{target.name} 获得了 {buff_change['name']} buff。")
                 elif action == "remove":
-                    if buff_change["type"] == "all":
+                    if hasattr(target, "request_remove_buff"):
+                        if buff_change["type"] == "all":
+                            target.request_remove_buff("all")
+                        else:
+                            target.request_remove_buff("type", buff_type=buff_change["type"] or buff_change.get("name"))
+                    elif buff_change["type"] == "all":
                         target.remove_all_buffs()
                     else:
                         target.remove_buffs_by_type(buff_change["type"] or buff_change.get("name"))
-                    print(f"{target.name} 移除了 {buff_change.get('name', buff_change['type'])} buff。")
+                    echo(f"{target.name} 移除了 {buff_change.get('name', buff_change['type'])} buff。")
 
         def apply_general_change(effect_change, target, attr):
             base_value = get_base_value(effect_change, user, target)
@@ -352,12 +404,12 @@ class Skill(Item):
                 skill_attr = f'skill_{attr}'
                 if hasattr(target, skill_attr):
                     setattr(target, skill_attr, getattr(target, skill_attr, 0) + change)
-                    print(f"{user.name} 使用了技能 {self.name}，对 {target.name} 的 {attr} 累积了 {change:.2f} 点变化。")
+                    echo(f"{user.name} 使用了技能 {self.name}，对 {target.name} 的 {attr} 累积了 {change:.2f} 点变化。")
             elif target_type in ["Enemy", "Boss", "Ally"] and hasattr(target, attr):
                 setattr(target, attr, max(0, getattr(target, attr) + change))
-                print(f"{user.name} 使用了技能 {self.name}，对 {target.name} 的 {attr} 造成了 {change:.2f} 点变化。")
+                echo(f"{user.name} 使用了技能 {self.name}，对 {target.name} 的 {attr} 造成了 {change:.2f} 点变化。")
             else:
-                print(f"警告: {target.name} 没有 {attr} 属性，无法应用技能效果。")
+                echo(f"警告: {target.name} 没有 {attr} 属性，无法应用技能效果。")
 
         # 主流程
         for attr, effect_change in self.effect_changes.items():
@@ -394,20 +446,20 @@ class Product(Item):
             if attr == "hp" and isinstance(effect_change, dict) and effect_change["attribute"] in ["attack", "defense"]:
                 base_value = getattr(user, effect_change.get("attribute", "attack"))
                 multiplier = effect_change.get("multiplier", 1.0)
-                damage = user.calculate_damage(target, base_value, multiplier, is_skill=True)
+                damage, _ = user.calculate_damage(target, base_value, multiplier, is_skill=True)
                 target.hp = max(0, target.hp - damage)
-                print(f"{user.name} 使用了道具 {self.name} 对 {target.name}，造成了 {damage:.2f} 点伤害。")
+                echo(f"{user.name} 使用了道具 {self.name} 对 {target.name}，造成了 {damage:.2f} 点伤害。")
             elif attr == "buff":
                 for buff_change in effect_change:
                     if buff_change["action"] == "add":
                         chance = buff_change.get("chance", 1.0)
-                        if random.random() <= chance:
+                        if battle_rng(user, "status").random() <= chance:
                             new_buff = Buff(buff_change["name"], buff_change["type"], user, target,
                                             buff_change["duration"], buff_change["effect"])
                             target.add_buff(new_buff)
-                            print(f"{target.name} 获得了 {buff_change['name']} buff。")
+                            echo(f"{target.name} 获得了 {buff_change['name']} buff。")
                         else:
-                            print(f"{target.name} 未能获得 {buff_change['name']} buff。")
+                            echo(f"{target.name} 未能获得 {buff_change['name']} buff。")
                     elif buff_change["action"] == "remove":
                         if buff_change["type"] == "all":
                             target.remove_all_buffs()
@@ -415,13 +467,13 @@ class Product(Item):
                             target.remove_buffs_by_type("debuff")
                         else:
                             target.remove_buff(buff_change["buff"])
-                        print(f"{target.name} 移除了 {buff_change['type']} buff。")
+                        echo(f"{target.name} 移除了 {buff_change['type']} buff。")
             elif attr == "summon":
                 if summon_func:
                     summon_func(user, effect_change)
                     self.quantity += 1  # 召唤令为非一次性物品
                 else:
-                    print("召唤功能未定义或未传递召唤函数。")
+                    echo("召唤功能未定义或未传递召唤函数。")
             else:
                 if isinstance(effect_change, dict):
                     base_value = getattr(user, effect_change.get('attribute', 'hp'))
@@ -431,7 +483,7 @@ class Product(Item):
                     change = effect_change
                 setattr(target, attr,
                         max(0, min(getattr(target, attr) + change, target.max_hp if attr == 'hp' else target.max_mp)))
-                print(f"{user.name} 使用了道具 {self.name} 对 {target.name}，造成了 {change:.2f} 点 {attr} 变化。")
+                echo(f"{user.name} 使用了道具 {self.name} 对 {target.name}，造成了 {change:.2f} 点 {attr} 变化。")
 
     def use(self, user, target, summon_func=None):
         if self.quantity > 0:
@@ -441,7 +493,7 @@ class Product(Item):
                 user.inventory = [item for item in user.inventory if
                                   not (item.number == self.number and item.quantity == 0)]
         else:
-            print(f"{self.name} 数量不足，无法使用。")
+            echo(f"{self.name} 数量不足，无法使用。")
 
     def __str__(self):
         return f"{self.name} (ID: {self.number}, 数量: {self.quantity})"
@@ -454,13 +506,13 @@ class Warp(Item):
 
     def use(self, user, target=None):
         if self.quantity > 0:
-            print(f"使用 {self.name} 将玩家传送到地图 {self.target_map_number}")
+            echo(f"使用 {self.name} 将玩家传送到地图 {self.target_map_number}")
             game_state.move_player_to_map(self.target_map_number)
             self.quantity = 1  # 使用后强制为1，保证折跃令可以一直使用
             if self.quantity == 0:
-                print(f"{self.name} 出现错误。")
+                echo(f"{self.name} 出现错误。")
         else:
-            print(f"{self.name} 数量不足，无法使用。")
+            echo(f"{self.name} 数量不足，无法使用。")
 
 
 class Buff:
@@ -488,25 +540,25 @@ class Buff:
                     self.original_values[attribute] = getattr(self.target, attribute)
                     setattr(self.target, attribute, getattr(self.target, attribute) + change)
                     self.applied = True
-                    print(f"{self.name} buff 生效: {self.target.name} {attribute} {change:+}")
+                    echo(f"{self.name} buff 生效: {self.target.name} {attribute} {change:+}")
                 elif attribute in ["hp", "mp"]:
                     # 对于 HP 和 MP，每次都进行增量变化
                     setattr(self.target, attribute, max(0, getattr(self.target, attribute) + change))
-                    print(f"{self.name} buff 生效: {self.target.name} {attribute} {change:+} ({getattr(self.target, attribute)}/{getattr(self.target, 'max_' + attribute, 'N/A')} {attribute})")
+                    echo(f"{self.name} buff 生效: {self.target.name} {attribute} {change:+} ({getattr(self.target, attribute)}/{getattr(self.target, 'max_' + attribute, 'N/A')} {attribute})")
         else:
             # 处理不需要 "value" 的 buff 例如眩晕、麻痹、沉默
             if attribute == "dizzy":
                 self.target.dizzy_rounds = max(self.target.dizzy_rounds, self.duration)
-                print(f"{self.name} buff 生效: {self.target.name} 正 眩晕 持续 {self.duration} 回合.")
+                echo(f"{self.name} buff 生效: {self.target.name} 正 眩晕 持续 {self.duration} 回合.")
             elif attribute == "paralysis":
                 self.target.paralysis_rounds = max(self.target.paralysis_rounds, self.duration)
-                print(f"{self.name} buff 生效: {self.target.name} 正 麻痹 持续 {self.duration} 回合.")
+                echo(f"{self.name} buff 生效: {self.target.name} 正 麻痹 持续 {self.duration} 回合.")
             elif attribute == "silence":
                 self.target.silence_rounds = max(self.target.silence_rounds, self.duration)
-                print(f"{self.name} buff 生效: {self.target.name} 正 沉默 持续 {self.duration} 回合.")
+                echo(f"{self.name} buff 生效: {self.target.name} 正 沉默 持续 {self.duration} 回合.")
             elif attribute == "blind":
                 self.target.blind_rounds = max(self.target.blind_rounds, self.duration)
-                print(f"{self.name} buff 生效: {self.target.name} 正 致盲 持续 {self.duration} 回合.")
+                echo(f"{self.name} buff 生效: {self.target.name} 正 致盲 持续 {self.duration} 回合.")
 
     def is_expired(self):
         return self.duration == 0
@@ -527,23 +579,23 @@ class Buff:
                 change = current_value - original_value
 
                 setattr(self.target, attribute, original_value)
-                print(f"{self.name} buff 移除: {self.target.name} {attribute} 恢复至 {original_value}")
+                echo(f"{self.name} buff 移除: {self.target.name} {attribute} 恢复至 {original_value}")
 
                 # 更新增量值以考虑其他非 Buff 的变化
                 self.original_values[attribute] = current_value - change
                 self.applied = False
         elif attribute == "dizzy":
             self.target.dizzy_rounds = 0
-            print(f"{self.name} buff 到期移除: {self.target.name} 不再眩晕")
+            echo(f"{self.name} buff 到期移除: {self.target.name} 不再眩晕")
         elif attribute == "paralysis":
             self.target.paralysis_rounds = 0
-            print(f"{self.name} buff 到期移除: {self.target.name} 不再麻痹")
+            echo(f"{self.name} buff 到期移除: {self.target.name} 不再麻痹")
         elif attribute == "silence":
             self.target.silence_rounds = 0
-            print(f"{self.name} buff 到期移除: {self.target.name} 不再沉默")
+            echo(f"{self.name} buff 到期移除: {self.target.name} 不再沉默")
         elif attribute == "blind":
             self.target.blind_rounds = 0
-            print(f"{self.name} buff 到期移除: {self.target.name} 不再致盲")
+            echo(f"{self.name} buff 到期移除: {self.target.name} 不再致盲")
 
     def __str__(self):
         target_name = self.target.name if self.target else "未知目标"
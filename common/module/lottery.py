@@ -1,7 +1,65 @@
 import random
+from bisect import bisect_left
+
+
+class _Sampler:
+    """
+    奖池的预计算抽样表（rewards 不变时重复使用）。
+      cdf       : 累积概率，最后一项固定为 1.0（概率总和不足时由最后一项补足，与逐项累加一致）
+      eligible  : min_probability → 满足条件的奖励子池
+      entries   : draw_many 用的 ((item, probability), probability) 预组元组
+      tiers     : min_probability → 满足条件的 entries 子池
+    """
+
+    __slots__ = ("rewards", "size", "cdf", "eligible", "entries", "tiers")
+
+    def __init__(self, rewards):
+        self.rewards = rewards
+        self.size = len(rewards)
+        cdf, total = [], 0.0
+        for reward in rewards:
+            total += reward['probability']
+            cdf.append(min(total, 1.0))
+        if cdf:
+            cdf[-1] = 1.0
+        self.cdf = cdf
+        self.eligible = {}
+        self.entries = [((r['item'], r['probability']), r['probability']) for r in rewards]
+        self.tiers = {}
+
+    def valid_for(self, rewards) -> bool:
+        return self.rewards is rewards and self.size == len(rewards)
+
+    def pick(self, roll):
+        index = bisect_left(self.cdf, roll)
+        return self.rewards[min(index, self.size - 1)]
+
+    def pick_many(self, n, rng):
+        return rng.choices(self.entries, cum_weights=self.cdf, k=n)
+
+    def pool(self, min_probability):
+        pool = self.eligible.get(min_probability)
+        if pool is None:
+            pool = self.eligible[min_probability] = [
+                r for r in self.rewards if r['probability'] <= min_probability
+            ]
+        return pool
+
+    def tier(self, min_probability):
+        tier = self.tiers.get(min_probability)
+        if tier is None:
+            tier = self.tiers[min_probability] = [
+                e for e in self.entries if e[1] <= min_probability
+            ]
+        return tier
 
 
 class Lottery:
+    TOP_TIER_PROBABILITY = 0.03     # 第一档：概率 ≤ 0.03
+    SECOND_TIER_PROBABILITY = 0.2   # 第二档及以上：概率 ≤ 0.2
+    TOP_TIER_PITY = 100             # 连续 100 抽未出第一档则保底
+    TEN_DRAW = 10                   # 每十抽保证第二档及以上
+
     def __init__(self, name, rewards):
         self.name = name
         self.rewards = rewards
@@ -9,50 +67,73 @@ class Lottery:
         self.ten_draw_guarantee_counter = 0  # 记录十连抽奖次数以实现第二档保底机制
 
     def draw(self, draw_count):
-        results = []
-        first_tier_rewarded = False
+        return self.draw_many(draw_count)
+
+    def draw_many(self, n, rng=random):
+        """
+        连续抽 n 次，返回 [(item, probability), ...]。
+        基础结果一次批量抽出（预计算 CDF），再依序套用保底规则：
+          - 每十抽的最后一抽：前 9 抽没有第二档及以上时替换为第二档保底
+          - 第一档计数器累计到 100 时替换为第一档保底
+        计数器与逐抽执行完全一致，适合大量模拟。
+        """
+        sampler = self._get_sampler()
+        if n <= 0 or not sampler.size:
+            return []
 
-        for i in range(draw_count):
-            reward = self.perform_draw()
+        top_p     = self.TOP_TIER_PROBABILITY
+        second_p  = self.SECOND_TIER_PROBABILITY
+        pity      = self.TOP_TIER_PITY
+        ten       = self.TEN_DRAW
+        top_pool    = sampler.tier(top_p)
+        second_pool = sampler.tier(second_p)
+        fallback    = sampler.entries[0]
+
+        counter = self.top_tier_guarantee_counter
+        results = []
+        append  = results.append
+        second_in_block = False
 
-            # 如果这是一次十连抽的第一个抽奖，重置保底标志
-            if i % 10 == 0:
-                first_tier_rewarded = False
+        position = -1
+        for entry in sampler.pick_many(n, rng):
+            position += 1
+            # 十连抽的第一抽：重置本组的第二档标记
+            if position == ten:
+                position = 0
+            if position == 0:
+                second_in_block = False
 
             # 每次十连抽保证第二档及以上奖励
-            if (i + 1) % 10 == 0 and not any(probability <= 0.2 for item, probability in results[-9:]):
-                # 如果前9次抽奖中没有第二档及以上奖励，替换最后一次抽奖的结果
-                reward = self.guaranteed_draw(min_probability=0.2)
+            elif position == ten - 1 and not second_in_block:
+                entry = rng.choice(second_pool) if second_pool else fallback
 
             # 检查第一档奖励保底
-            if reward['probability'] <= 0.03:
-                self.top_tier_guarantee_counter = 0  # 重置保底计数器
-                first_tier_rewarded = True
+            if entry[1] <= top_p:
+                counter = 0
             else:
-                self.top_tier_guarantee_counter += 1  # 增加保底计数器
+                counter += 1
+                if counter >= pity:
+                    entry = rng.choice(top_pool) if top_pool else fallback
+                    counter = 0
 
-            # 处理第一档奖励保底机制
-            if self.top_tier_guarantee_counter >= 100:
-                reward = self.guaranteed_draw(min_probability=0.03)
-                self.top_tier_guarantee_counter = 0
-
-            # 存储奖励和概率
-            results.append((reward['item'], reward['probability']))
+            if entry[1] <= second_p:
+                second_in_block = True
+            append(entry[0])
 
+        self.top_tier_guarantee_counter = counter
         return results
 
     def perform_draw(self):
-        roll = random.random()
-        cumulative_probability = 0.0
-
-        for reward in self.rewards:
-            cumulative_probability += reward['probability']
-            if roll <= cumulative_probability:
-                return reward
-
-        return self.rewards[-1]  # 默认返回最后一项，防止概率问题
+        return self._get_sampler().pick(random.random())
 
     def guaranteed_draw(self, min_probability):
         """返回满足最小概率条件的奖励"""
-        eligible_rewards = [r for r in self.rewards if r['probability'] <= min_probability]
+        eligible_rewards = self._get_sampler().pool(min_probability)
         return random.choice(eligible_rewards) if eligible_rewards else self.rewards[0]
+
+    def _get_sampler(self) -> _Sampler:
+        # 旧存档 / 快取还原的实例没有 _sampler 属性
+        sampler = getattr(self, "_sampler", None)
+        if sampler is None or not sampler.valid_for(self.rewards):
+            sampler = self._sampler = _Sampler(self.rewards)
+        return sampler
@@ -0,0 +1,300 @@
+"""
+LotterySimulator
+抽奖保底机制的批量模拟（验证实际出率 / 保底效果）。
+
+  - 每个虚拟玩家持有独立的 Lottery 副本（保底计数器从 0 开始）
+  - 按 session 分批调用 draw_many()，十连保底只在同一批次内生效，与游戏内一致
+  - 多个玩家按 chunk 分发到进程池，每个 worker 独立加载 Registry
+
+统计：
+  - 各档位（第一档 / 第二档 / 普通）与各奖励的实际出率
+  - 每次出第一档所需抽数的分布、期望与方差（含 100 抽保底）
+  - 抽奖吞吐量（抽 / 秒），可作为抽奖路径的效能基准
+
+用法：
+    from common.module.lottery_simulator import simulate
+
+    report = simulate(1, players=10_000, pulls=300)
+    print(report.summary())
+
+命令行：
+    python -m common.module.lottery_simulator 1 -p 10000 --pulls 300
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from core.registry import registry
+from common.module.lottery import Lottery
+
+
+# ══════════════════════════════════════════════
+#  报告
+# ══════════════════════════════════════════════
+
+@dataclass
+class LotteryReport:
+    """
+    批量模拟结果，可跨 chunk 合并（merge）。
+
+    tier_counts  : {"top" / "second" / "common": 抽中次数}
+    item_counts  : {奖励: 抽中次数}
+    top_gaps     : {出第一档所需抽数: 次数}（自开始或上一次第一档起算）
+    elapsed      : 各 chunk 抽奖耗时总和（秒，不含进程调度）
+    """
+    players:     int = 0
+    pulls:       int = 0
+    elapsed:     float = 0.0
+    tier_counts: Counter = field(default_factory=Counter)
+    item_counts: Counter = field(default_factory=Counter)
+    top_gaps:    Counter = field(default_factory=Counter)
+
+    def merge(self, other: "LotteryReport") -> None:
+        self.players += other.players
+        self.pulls   += other.pulls
+        self.elapsed += other.elapsed
+        self.tier_counts.update(other.tier_counts)
+        self.item_counts.update(other.item_counts)
+        self.top_gaps.update(other.top_gaps)
+
+    # ── 统计量 ────────────────────────────────
+
+    def tier_rates(self) -> dict[str, float]:
+        if not self.pulls:
+            return {}
+        return {tier: n / self.pulls for tier, n in self.tier_counts.items()}
+
+    def item_rates(self) -> dict[str, float]:
+        if not self.pulls:
+            return {}
+        return {item: n / self.pulls for item, n in self.item_counts.items()}
+
+    @property
+    def top_hits(self) -> int:
+        return sum(self.top_gaps.values())
+
+    @property
+    def mean_pulls_to_top(self) -> float:
+        hits = self.top_hits
+        if not hits:
+            return 0.0
+        return sum(gap * n for gap, n in self.top_gaps.items()) / hits
+
+    @property
+    def variance_pulls_to_top(self) -> float:
+        hits = self.top_hits
+        if hits < 2:
+            return 0.0
+        mean = self.mean_pulls_to_top
+        return sum(n * (gap - mean) ** 2 for gap, n in self.top_gaps.items()) / (hits - 1)
+
+    @property
+    def pity_rate(self) -> float:
+        """第一档中靠满 100 抽保底取得的比例（上限处的抽数）。"""
+        hits = self.top_hits
+        return self.top_gaps.get(Lottery.TOP_TIER_PITY, 0) / hits if hits else 0.0
+
+    @property
+    def pulls_per_second(self) -> float:
+        return self.pulls / self.elapsed if self.elapsed else 0.0
+
+    def gap_percentile(self, q: float) -> int:
+        """出第一档所需抽数的分位数（q ∈ [0, 1]）。"""
+        hits = self.top_hits
+        if not hits:
+            return 0
+        rank = q * (hits - 1)
+        seen = 0
+        for gap in sorted(self.top_gaps):
+            seen += self.top_gaps[gap]
+            if seen > rank:
+                return gap
+        return max(self.top_gaps)
+
+    def to_dict(self) -> dict:
+        return {
+            "players":               self.players,
+            "pulls":                 self.pulls,
+            "tier_rates":            self.tier_rates(),
+            "item_rates":            self.item_rates(),
+            "mean_pulls_to_top":     self.mean_pulls_to_top,
+            "variance_pulls_to_top": self.variance_pulls_to_top,
+            "gap_p50":               self.gap_percentile(0.5),
+            "gap_p90":               self.gap_percentile(0.9),
+            "pity_rate":             self.pity_rate,
+            "pulls_per_second":      self.pulls_per_second,
+            "top_gaps":              dict(sorted(self.top_gaps.items())),
+        }
+
+    def summary(self) -> str:
+        rates = self.tier_rates()
+        lines = [
+            f"{'═'*40}",
+            f"  模拟玩家：{self.players}  总抽数：{self.pulls}",
+            f"  档位出率：第一档 {rates.get('top', 0):.3%}"
+            f" / 第二档 {rates.get('second', 0):.3%}"
+            f" / 普通 {rates.get('common', 0):.3%}",
+            f"  出第一档抽数：平均 {self.mean_pulls_to_top:.2f}"
+            f"  方差 {self.variance_pulls_to_top:.2f}"
+            f"  P50 {self.gap_percentile(0.5)}  P90 {self.gap_percentile(0.9)}",
+            f"  保底触发：{self.pity_rate:.2%}",
+            f"  吞吐量：{self.pulls_per_second:,.0f} 抽 / 秒",
+            "  各奖励出率：",
+        ]
+        for item, rate in sorted(self.item_rates().items(), key=lambda kv: kv[1]):
+            lines.append(f"    {item} : {rate:.3%}")
+        lines.append(f"{'═'*40}")
+        return "\n".join(lines)
+
+
+# ══════════════════════════════════════════════
+#  单个 chunk（worker 内执行）
+# ══════════════════════════════════════════════
+
+def _resolve_pool(ref) -> Lottery:
+    """奖池引用 → 原型：lottery ID 或 Lottery 实例。"""
+    if isinstance(ref, Lottery):
+        return ref
+    pool = registry.get("lottery", ref)
+    if pool is None:
+        raise KeyError(f"找不到奖池：{ref!r}")
+    return pool
+
+
+def _init_worker() -> None:
+    """spawn 启动的 worker 没有继承父进程的 Registry，需重新加载。"""
+    if not registry.get_all("lottery"):
+        from core.data_loader import load_all
+        load_all()
+
+
+def _run_chunk(
+    pool, players: int, pulls: int, session: int, seed: int | None,
+) -> LotteryReport:
+    _init_worker()
+    rng = random.Random(seed)
+
+    prototype = _resolve_pool(pool)
+    prototype._get_sampler()          # 预建抽样表，玩家副本共用
+    top_p     = Lottery.TOP_TIER_PROBABILITY
+    second_p  = Lottery.SECOND_TIER_PROBABILITY
+    report    = LotteryReport(players=players)
+    items     = report.item_counts
+    gaps      = report.top_gaps
+    top = second = 0
+
+    start = time.perf_counter()
+    for _ in range(players):
+        lottery = copy.copy(prototype)
+        lottery.top_tier_guarantee_counter = 0
+        since_top = 0
+        done = 0
+        while done < pulls:
+            batch = min(session, pulls - done)
+            for item, probability in lottery.draw_many(batch, rng):
+                items[item] += 1
+                since_top += 1
+                if probability <= top_p:
+                    top += 1
+                    gaps[since_top] += 1
+                    since_top = 0
+                elif probability <= second_p:
+                    second += 1
+            done += batch
+    report.elapsed = time.perf_counter() - start
+
+    report.pulls = players * pulls
+    report.tier_counts.update({
+        "top":    top,
+        "second": second,
+        "common": report.pulls - top - second,
+    })
+    return report
+
+
+# ══════════════════════════════════════════════
+#  对外入口
+# ══════════════════════════════════════════════
+
+def simulate(
+    pool,
+    players: int = 1000,
+    pulls: int = 300,
+    session: int = 10,
+    workers: int | None = None,
+    chunk_size: int = 1000,
+    seed: int | None = None,
+) -> LotteryReport:
+    """
+    让 players 名虚拟玩家各抽 pulls 次。
+
+    pool       : lottery ID 或 Lottery 实例（原型不会被修改）
+    session    : 每次调用 draw 的抽数（10 = 十连抽，1 = 单抽，没有十连保底）
+    workers    : 进程数；None 为 CPU 核数，1 则在当前进程内执行
+    chunk_size : 每个任务包含的玩家数
+    seed       : 指定时每个 chunk 使用 seed + chunk 序号，结果可复现
+    """
+    if players <= 0 or pulls <= 0:
+        return LotteryReport()
+
+    workers = workers or os.cpu_count() or 1
+
+    chunks = []
+    remaining, index = players, 0
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        chunk_seed = None if seed is None else seed + index
+        chunks.append((pool, size, pulls, session, chunk_seed))
+        remaining -= size
+        index     += 1
+
+    report = LotteryReport()
+
+    if workers == 1 or len(chunks) == 1:
+        for args in chunks:
+            report.merge(_run_chunk(*args))
+        return report
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = [executor.submit(_run_chunk, *args) for args in chunks]
+        for future in futures:
+            report.merge(future.result())
+
+    return report
+
+
+# ══════════════════════════════════════════════
+#  命令行
+# ══════════════════════════════════════════════
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="抽奖保底机制批量模拟")
+    parser.add_argument("pool", type=int, help="奖池 ID（lottery）")
+    parser.add_argument("-p", "--players", type=int, default=1000)
+    parser.add_argument("--pulls", type=int, default=300, help="每名玩家的抽数")
+    parser.add_argument("--session", type=int, default=10, help="每次抽奖的抽数（十连 = 10）")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    _init_worker()
+    report = simulate(
+        args.pool,
+        players=args.players,
+        pulls=args.pulls,
+        session=args.session,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
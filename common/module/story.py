@@ -1,4 +1,4 @@
-from library.material_library import material_library
+from core.registry import registry
 from library.enemy_library import enemy_library
 from library.storybuff_library import storybuff_library
 from library.storyfight_library import storyfight_library
@@ -539,7 +539,9 @@ def load_story_from_json(filename, player, dynamic_battle, chapter=None, story_m
 
                 # 添加物品
                 if action_type == 'add_item':
-                    item = material_library[action_data['item_id']]
+                    _, item = registry.get_item(action_data['item_id'])
+                    if item is None:
+                        raise KeyError(f"物品 {action_data['item_id']} 不存在于已知库中")
                     nodes[node_id].add_action(AddItemAction(player, item, action_data['quantity']))
 
                 # 增加敌人
@@ -0,0 +1,122 @@
+"""
+common.synthesis.availability
+─────────────────────────────────────────────
+SynthesisAvailability — 可合成清單的增量快取。
+
+  material_number → {target_number, ...}   反向索引（哪些配方用到此材料）
+  available                                當前材料足夠的配方集合
+
+建立時完整檢查一次；之後只在 ItemAddedEvent / ItemRemovedEvent 發生時，
+重新檢查用到該材料的配方，不必每次開啟介面都掃描全部配方。
+
+查詢前 sync() 校正收不到事件的情況：EventBus.clear() 清掉了訂閱 →
+重新訂閱並完整重算。物品事件不延後分派（deferrable = False），批次模式下同樣即時。
+
+只以弱引用持有玩家，快取不會讓玩家物件無法回收。
+"""
+
+from __future__ import annotations
+
+import weakref
+
+from all.synthesis_recipes import synthesis_recipes
+
+from common.event import EventBus, ItemAddedEvent, ItemRemovedEvent
+
+
+def build_material_index(recipes: dict) -> dict:
+    """material_number → {target_number, ...}"""
+    index: dict = {}
+    for target_number, recipe in recipes.items():
+        for mat_num in recipe["materials"]:
+            index.setdefault(mat_num, set()).add(target_number)
+    return index
+
+
+class SynthesisAvailability:
+
+    def __init__(self, player, recipes: dict | None = None):
+        self._player  = weakref.ref(player)
+        self.recipes  = synthesis_recipes if recipes is None else recipes
+        self._users   = build_material_index(self.recipes)
+        self._rank    = {t: i for i, t in enumerate(self.recipes)}
+        # ItemRemovedEvent 只帶名稱，槽位清空後無法再從背包取得編號
+        self._numbers: dict[str, object] = {}
+        self._available: set = set()
+        self._generation: int | None = None     # 訂閱時的 EventBus.generation
+
+        self._subscribe()
+        self.refresh()
+
+    @property
+    def player(self):
+        """追蹤的玩家；玩家已被回收時為 None。"""
+        return self._player()
+
+    # ── 查詢 ──────────────────────────────────────────────
+
+    def available(self) -> list:
+        """可合成的目標編號（依配方表順序）。"""
+        self.sync()
+        return sorted(self._available, key=self._rank.__getitem__)
+
+    def is_available(self, target_number) -> bool:
+        self.sync()
+        return target_number in self._available
+
+    def recipes_using(self, material_number) -> set:
+        """用到指定材料的配方目標編號。"""
+        return self._users.get(material_number, set())
+
+    # ── 維護 ──────────────────────────────────────────────
+
+    def refresh(self) -> None:
+        """完整重算（讀檔 / 直接改動背包後使用）。"""
+        inventory = self.player.inventory
+        self._numbers = {
+            name: slot.item.number
+            for name, slot in inventory._slots.items()
+            if getattr(slot.item, "number", None) is not None
+        }
+        self._available = {t for t in self.recipes if self._check(t)}
+
+    def sync(self) -> None:
+        """補上未收到的物品事件（見模組說明）。"""
+        if self._generation != EventBus.generation:
+            self._subscribe()
+            self.refresh()
+
+    def close(self) -> None:
+        if self._generation == EventBus.generation:
+            EventBus.unsubscribe(ItemAddedEvent,   self._on_item_changed)
+            EventBus.unsubscribe(ItemRemovedEvent, self._on_item_changed)
+        self._generation = None
+
+    def _subscribe(self) -> None:
+        EventBus.subscribe(ItemAddedEvent,   self._on_item_changed)
+        EventBus.subscribe(ItemRemovedEvent, self._on_item_changed)
+        self._generation = EventBus.generation
+
+    def _on_item_changed(self, event) -> None:
+        if self.player is None:
+            return
+        number = self._numbers.get(event.item_name)
+        if number is None:
+            slot = self.player.inventory.get(event.item_name)
+            number = getattr(slot.item, "number", None) if slot else None
+            if number is None:
+                return
+            self._numbers[event.item_name] = number
+
+        for target in self._users.get(number, ()):
+            if self._check(target):
+                self._available.add(target)
+            else:
+                self._available.discard(target)
+
+    def _check(self, target_number) -> bool:
+        count = self.player.inventory.count_by_number
+        return all(
+            count(mat_num) >= req_qty
+            for mat_num, req_qty in self.recipes[target_number]["materials"].items()
+        )
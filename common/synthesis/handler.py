@@ -0,0 +1,138 @@
+"""
+common.synthesis.handler
+─────────────────────────────────────────────
+SynthesisHandler — 合成的副作用層（扣材料 / 加背包 / 回報結果）。
+
+  SynthesisRequestEvent      → 單一配方合成 → SynthesisSucceededEvent / SynthesisFailedEvent
+  SynthesisListRequestEvent  → SynthesisListResultEvent
+  SynthesisPlanRequestEvent  → 多段合成計畫 → SynthesisPlanCompletedEvent / SynthesisFailedEvent
+
+常駐，遊戲啟動時註冊。
+"""
+from __future__ import annotations
+
+import copy
+
+from core.registry import registry
+from all.synthesis_recipes import synthesis_recipes
+
+from common.event import EventBus
+from common.event.handlers import BattleHandler
+from common.event.system.synthesis import (
+    SynthesisRequestEvent,
+    SynthesisSucceededEvent,
+    SynthesisFailedEvent,
+    SynthesisListRequestEvent,
+    SynthesisListResultEvent,
+    SynthesisPlanRequestEvent,
+    SynthesisPlanCompletedEvent,
+)
+from common.synthesis.service import SynthesisService
+
+
+class SynthesisHandler(BattleHandler):
+
+    def __init__(self, player) -> None:
+        self._player = player
+
+    # ── 單一配方 ──────────────────────────────
+
+    def on_synthesis_request_event(self, e: SynthesisRequestEvent) -> None:
+        player = self._player
+        ok, message = SynthesisService.can_synthesize(player, e.target_number, e.quantity)
+        if not ok:
+            self._fail(e.target_number, message)
+            return
+
+        recipe   = synthesis_recipes[e.target_number]
+        consumed = {num: qty * e.quantity for num, qty in recipe["materials"].items()}
+        produced = {e.target_number: recipe["result_quantity"] * e.quantity}
+        reason = self._transact(consumed, produced)
+        if reason:
+            self._fail(e.target_number, reason)
+            return
+
+        EventBus.emit(SynthesisSucceededEvent(
+            player_name=player.name,
+            target_number=e.target_number,
+            result_item_name=self._name(e.target_number),
+            result_quantity=produced[e.target_number],
+        ))
+
+    # ── 可合成清單 ────────────────────────────
+
+    def on_synthesis_list_request_event(self, e: SynthesisListRequestEvent) -> None:
+        EventBus.emit(SynthesisListResultEvent(
+            player_name=self._player.name,
+            available_targets=SynthesisService.get_available_targets(self._player),
+        ))
+
+    # ── 多段合成 ──────────────────────────────
+
+    def on_synthesis_plan_request_event(self, e: SynthesisPlanRequestEvent) -> None:
+        """整個計畫視為一筆交易：全部驗證後一次扣料 / 加料，只回報一次結果。"""
+        player = self._player
+        plan = SynthesisService.plan(player, e.target_number, e.quantity)
+        if plan.error:
+            self._fail(e.target_number, plan.error)
+            return
+        if plan.missing:
+            lacking = "、".join(
+                f"{self._name(num)} x{qty}" for num, qty in plan.missing.items()
+            )
+            self._fail(e.target_number, f"材料不足：{lacking}")
+            return
+
+        reason = self._transact(plan.consumed, plan.produced)
+        if reason:
+            self._fail(e.target_number, reason)
+            return
+
+        EventBus.emit(SynthesisPlanCompletedEvent(
+            player_name=player.name,
+            target_number=e.target_number,
+            result_item_name=self._name(e.target_number),
+            result_quantity=plan.produced.get(e.target_number, 0),
+            steps=plan.summary(),
+            consumed=dict(plan.consumed),
+            produced=dict(plan.produced),
+        ))
+
+    # ── 內部 ──────────────────────────────────
+
+    def _transact(self, consumed: dict, produced: dict) -> str:
+        """
+        批量交易：扣除 consumed、加入 produced（皆為 {number: qty}）。
+        材料只驗證一次，背包只改動一次（Inventory.transact），
+        合成 N 次也只產生每種物品各一個 ItemRemovedEvent / ItemAddedEvent。
+        任何一項不符都不改動背包；回傳失敗原因，成功時回傳空字串。
+        """
+        inventory = self._player.inventory
+
+        produce = []
+        for num, qty in produced.items():
+            slot = inventory.get_by_number(num)
+            if slot is not None:
+                produce.append((slot.item, qty))
+                continue
+            _, prototype = registry.get_item(num)
+            if prototype is None:
+                return f"合成目標 {num} 不存在於已知庫中"
+            produce.append((copy.deepcopy(prototype), qty))
+
+        if inventory.transact(consumed, produce):
+            return ""
+        # 失敗時背包未改動，重新取得原因供 SynthesisFailedEvent 使用
+        return inventory.check_transaction(consumed, produce) or "背包交易失敗"
+
+    def _fail(self, target_number, reason: str) -> None:
+        EventBus.emit(SynthesisFailedEvent(
+            player_name=self._player.name,
+            target_number=target_number,
+            reason=reason,
+        ))
+
+    @staticmethod
+    def _name(number) -> str:
+        _, item = registry.get_item(number)
+        return item.name if item is not None else str(number)
@@ -0,0 +1,196 @@
+"""
+common.synthesis.planner
+─────────────────────────────────────────────
+SynthesisPlanner — 多段合成規劃（純邏輯，不修改玩家狀態）。
+
+配方會串接（极恶石 → 三罪剑、冥火 / 神火 → 阴阳火），
+規劃器從目標往下展開整棵合成樹：
+  - 背包已有的中間材料優先使用，只合成不足的部分
+  - 合成多出的產物留作後續步驟的庫存
+  - 無配方且庫存不足的材料記入 missing
+  - 配方循環（A 需要 B、B 又需要 A）時中止並記錄路徑
+
+base_cost() 為各目標「完全從基礎材料合成一批」的成本，按目標記憶化。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from all.synthesis_recipes import synthesis_recipes
+
+
+class RecipeCycleError(ValueError):
+    """配方之間存在循環依賴。"""
+
+    def __init__(self, path: list):
+        self.path = path
+        super().__init__("配方循環：" + " → ".join(str(n) for n in path))
+
+
+# ══════════════════════════════════════════════
+#  規劃結果
+# ══════════════════════════════════════════════
+
+@dataclass
+class CraftStep:
+    target_number: int
+    batches: int                     # 合成次數
+    result_quantity: int             # 每次產出數量
+    materials: dict                  # 每次消耗 {material_number: qty}
+
+    @property
+    def produced(self) -> int:
+        return self.batches * self.result_quantity
+
+
+@dataclass
+class CraftPlan:
+    target_number: int
+    quantity: int                                          # 目標合成次數
+    steps: list[CraftStep] = field(default_factory=list)   # 依執行順序（先材料後成品）
+    consumed: dict = field(default_factory=dict)           # 背包淨減少 {number: qty}
+    produced: dict = field(default_factory=dict)           # 背包淨增加 {number: qty}
+    missing: dict = field(default_factory=dict)            # 缺少的基礎材料 {number: qty}
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.error
+
+    @property
+    def total_batches(self) -> int:
+        return sum(s.batches for s in self.steps)
+
+    def summary(self) -> dict:
+        """合併同一目標的步驟 {target_number: batches}（事件 / 顯示用）。"""
+        merged: dict = {}
+        for s in self.steps:
+            merged[s.target_number] = merged.get(s.target_number, 0) + s.batches
+        return merged
+
+
+# ══════════════════════════════════════════════
+#  規劃器
+# ══════════════════════════════════════════════
+
+class SynthesisPlanner:
+
+    def __init__(self, recipes: dict | None = None):
+        self.recipes = synthesis_recipes if recipes is None else recipes
+        self._base_cost: dict = {}
+
+    # ── 成本 ──────────────────────────────────────────────
+
+    def base_cost(self, target_number) -> dict:
+        """
+        完全從基礎材料合成一批 target 所需的基礎材料 {number: qty}（記憶化）。
+        子配方多產出的部分按比例攤分，因此數量可能為小數。
+        配方循環時拋出 RecipeCycleError。
+        """
+        return self._cost(target_number, [])
+
+    def _cost(self, number, path: list) -> dict:
+        cached = self._base_cost.get(number)
+        if cached is not None:
+            return cached
+        recipe = self.recipes.get(number)
+        if recipe is None:
+            return {number: 1}
+        if number in path:
+            raise RecipeCycleError(path[path.index(number):] + [number])
+
+        path.append(number)
+        total: dict = {}
+        for mat_num, qty in recipe["materials"].items():
+            if mat_num in self.recipes:
+                per_unit = qty / self.recipes[mat_num]["result_quantity"]
+                for base, amount in self._cost(mat_num, path).items():
+                    total[base] = total.get(base, 0) + amount * per_unit
+            else:
+                total[mat_num] = total.get(mat_num, 0) + qty
+        path.pop()
+
+        self._base_cost[number] = total
+        return total
+
+    # ── 規劃 ──────────────────────────────────────────────
+
+    def plan(self, player, target_number, quantity: int = 1) -> CraftPlan:
+        """
+        以 player 當前背包為起點，規劃合成 target quantity 次
+        （與 SynthesisRequestEvent 相同，產出 result_quantity × quantity）。
+        """
+        plan  = CraftPlan(target_number=target_number, quantity=quantity)
+        if target_number not in self.recipes:
+            plan.error = "無此合成配方"
+            return plan
+
+        count = player.inventory.count_by_number
+        stock: dict = {}            # 規劃過程中的虛擬庫存
+        initial: dict = {}
+
+        def available(number) -> int:
+            if number not in stock:
+                stock[number] = initial[number] = count(number)
+            return stock[number]
+
+        def need(number, qty: int, path: list) -> None:
+            have = available(number)
+            take = min(have, qty)
+            stock[number] = have - take
+            rest = qty - take
+            if rest <= 0:
+                return
+
+            recipe = self.recipes.get(number)
+            if recipe is None:
+                plan.missing[number] = plan.missing.get(number, 0) + rest
+                return
+            if number in path:
+                raise RecipeCycleError(path[path.index(number):] + [number])
+
+            per_batch = recipe["result_quantity"]
+            batches   = -(-rest // per_batch)
+            path.append(number)
+            for mat_num, mat_qty in recipe["materials"].items():
+                need(mat_num, mat_qty * batches, path)
+            path.pop()
+
+            plan.steps.append(CraftStep(
+                target_number=number,
+                batches=batches,
+                result_quantity=per_batch,
+                materials=dict(recipe["materials"]),
+            ))
+            stock[number] += batches * per_batch - rest
+
+        try:
+            # 先以記憶化成本走訪整棵樹：資料中的循環即使被庫存遮蔽也會被發現
+            self.base_cost(target_number)
+
+            # 目標本身一定要合成，不從背包取用
+            recipe  = self.recipes[target_number]
+            batches = quantity
+            available(target_number)
+            path = [target_number]
+            for mat_num, mat_qty in recipe["materials"].items():
+                need(mat_num, mat_qty * batches, path)
+            plan.steps.append(CraftStep(
+                target_number=target_number,
+                batches=batches,
+                result_quantity=recipe["result_quantity"],
+                materials=dict(recipe["materials"]),
+            ))
+            stock[target_number] += batches * recipe["result_quantity"]
+        except RecipeCycleError as e:
+            plan.error = str(e)
+            return plan
+
+        for number, before in initial.items():
+            delta = stock[number] - before
+            if delta < 0:
+                plan.consumed[number] = -delta
+            elif delta > 0:
+                plan.produced[number] = delta
+        return plan
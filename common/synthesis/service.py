@@ -8,16 +8,19 @@ SynthesisService — 純邏輯層，不直接修改玩家狀態。
 
 from __future__ import annotations
 
-from library.material_library  import material_library
-from library.equipment_library import equipment_library
-from library.medicine_library  import medicine_library
-from library.product_library   import product_library
-from all.synthesis_recipes     import synthesis_recipes
+import weakref
+
+from core.registry          import registry
+from all.synthesis_recipes import synthesis_recipes
+
+from common.synthesis.availability import SynthesisAvailability
+from common.synthesis.planner      import SynthesisPlanner, CraftPlan
 
 from common.event import EventBus
 from common.event.system.synthesis import (
     SynthesisRequestEvent,
     SynthesisListRequestEvent,
+    SynthesisPlanRequestEvent,
 )
 
 
@@ -26,6 +29,12 @@ class SynthesisService:
     對外 API（UI / NPC 合成模組呼叫此類）。
     """
 
+    # player → SynthesisAvailability（可合成清單增量快取；玩家回收時自動移除並退訂）
+    _trackers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    # 多段合成規劃器（配方成本記憶化，全域共用）
+    _planner = SynthesisPlanner()
+
     # ── 純查詢 ────────────────────────────────────────────
 
     @staticmethod
@@ -47,29 +56,36 @@ class SynthesisService:
     @staticmethod
     def get_result_item(target_number):
         """
-        從各 library 查詢合成結果物品原型。
+        從 Registry 物品索引查詢合成結果物品原型。
         回傳物品物件（未複製）。
         """
-        for lib in (material_library, equipment_library,
-                    medicine_library, product_library):
-            if target_number in lib:
-                return lib[target_number]
-        raise KeyError(f"合成目標 {target_number} 不存在於已知庫中")
+        _, item = registry.get_item(target_number)
+        if item is None:
+            raise KeyError(f"合成目標 {target_number} 不存在於已知庫中")
+        return item
 
     @staticmethod
     def get_available_targets(player) -> list:
         """
-        回傳當前玩家可合成的目標編號清單。
+        回傳當前玩家可合成的目標編號清單（增量快取，見 SynthesisAvailability）。
+        """
+        return SynthesisService.availability(player).available()
+
+    @staticmethod
+    def availability(player) -> SynthesisAvailability:
+        """取得（首次時建立）玩家的可合成清單快取。"""
+        tracker = SynthesisService._trackers.get(player)
+        if tracker is None:
+            tracker = SynthesisService._trackers[player] = SynthesisAvailability(player)
+            weakref.finalize(player, tracker.close)
+        return tracker
+
+    @staticmethod
+    def plan(player, target_number, quantity: int = 1) -> CraftPlan:
+        """
+        規劃多段合成（不足的中間材料自動補合成），不修改背包。
         """
-        result = []
-        for target_number, recipe in synthesis_recipes.items():
-            required = recipe["materials"]
-            if all(
-                player.get_material_quantity(mat_num) >= req_qty
-                for mat_num, req_qty in required.items()
-            ):
-                result.append(target_number)
-        return result
+        return SynthesisService._planner.plan(player, target_number, quantity)
 
     # ── 有副作用的操作（emit 事件） ───────────────────────
 
@@ -85,6 +101,18 @@ class SynthesisService:
             quantity=quantity,
         ))
 
+    @staticmethod
+    def synthesize_plan(player, target_number, quantity: int = 1):
+        """
+        發起多段合成請求：整棵合成樹由 SynthesisHandler 一次執行，
+        完成後只回傳一個 SynthesisPlanCompletedEvent。
+        """
+        EventBus.emit(SynthesisPlanRequestEvent(
+            player_name=getattr(player, "name", ""),
+            target_number=target_number,
+            quantity=quantity,
+        ))
+
     @staticmethod
     def request_list(player):
         """
@@ -9,16 +9,14 @@ from __future__ import annotations
 
 from typing import Callable
 
-from library.material_library  import material_library
-from library.equipment_library import equipment_library
-from library.medicine_library  import medicine_library
-from library.product_library   import product_library
+from core.registry import registry
 
 from common.event import EventBus, InfoEvent, WarningEvent
 from common.event.system.synthesis import (
     SynthesisSucceededEvent,
     SynthesisFailedEvent,
     SynthesisListResultEvent,
+    SynthesisPlanCompletedEvent,
 )
 from common.synthesis.service import SynthesisService
 
@@ -37,6 +35,7 @@ class SynthesisUI:
         EventBus.subscribe(SynthesisSucceededEvent, self._on_success)
         EventBus.subscribe(SynthesisFailedEvent,    self._on_failed)
         EventBus.subscribe(SynthesisListResultEvent, self._on_list_result)
+        EventBus.subscribe(SynthesisPlanCompletedEvent, self._on_plan_completed)
 
         self._pending_targets: list = []   # 暫存可合成清單
 
@@ -102,6 +101,15 @@ class SynthesisUI:
             message=f"合成失敗：{event.reason}"
         ))
 
+    def _on_plan_completed(self, event: SynthesisPlanCompletedEvent):
+        steps = "、".join(
+            f"{self._resolve_name(num)} x{times}" for num, times in event.steps.items()
+        )
+        EventBus.emit(InfoEvent(
+            message=f"合成成功！獲得 {event.result_item_name} x{event.result_quantity}"
+                    f"（合成步驟：{steps}）。"
+        ))
+
     def _on_list_result(self, event: SynthesisListResultEvent):
         self._pending_targets = event.available_targets
 
@@ -109,8 +117,5 @@ class SynthesisUI:
 
     @staticmethod
     def _resolve_name(target_num) -> str:
-        for lib in (material_library, equipment_library,
-                    medicine_library, product_library):
-            if target_num in lib:
-                return lib[target_num].name
-        return str(target_num)
\ No newline at end of file
+        _, item = registry.get_item(target_num)
+        return item.name if item is not None else str(target_num)
\ No newline at end of file
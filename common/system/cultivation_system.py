@@ -209,6 +209,7 @@ class CultivationSystem:
                 attr=attr,
                 change=increase,
                 scope="permanent",
+                target_id=str(self.player.unique_id),
             ))
 
         self.player.update_stats()
@@ -242,6 +243,7 @@ class CultivationSystem:
                     attr=attr,
                     change=-decrease,
                     scope="permanent",
+                    target_id=str(self.player.unique_id),
                 ))
 
             data["level"] = 0
@@ -21,7 +21,6 @@ Item 基類 + 子類：
 """
 
 from __future__ import annotations
-import random
 
 from common.event import (
     EventBus,
@@ -184,6 +183,7 @@ class Medicine(Item):
                         target=user.name,
                         amount=value,
                         attr=attr,
+                        target_id=str(user.unique_id),
                     ))
                 else:
                     EventBus.emit(DamageRequestEvent(
@@ -191,6 +191,7 @@ class Medicine(Item):
                         target=user.name,
                         amount=-value,
                         damage_type="true",
+                        target_id=str(user.unique_id),
                     ))
             else:
                 # 非 hp/mp 屬性 → StatChangeRequest（battle scope）
@@ -200,6 +201,7 @@ class Medicine(Item):
                     attr=attr,
                     change=value,
                     scope="battle",
+                    target_id=str(user.unique_id),
                 ))
 
 
@@ -420,6 +422,7 @@ def _apply_hp_change(
                 damage_type="skill",
                 skill_multiplier=multiplier,
                 is_skill=True,
+                target_id=str(target.unique_id),
             ))
             return
 
@@ -430,6 +433,7 @@ def _apply_hp_change(
             target=target.name,
             amount=change,
             attr="hp",
+            target_id=str(target.unique_id),
         ))
     else:
         EventBus.emit(DamageRequestEvent(
@@ -437,6 +441,7 @@ def _apply_hp_change(
             target=target.name,
             amount=-change,
             damage_type="true",
+            target_id=str(target.unique_id),
         ))
 
 
@@ -452,9 +457,8 @@ def _apply_buff_change(
         action = buff_change.get("action")
 
         if action == "add":
+            # 命中判定由 BuffHandler 以戰鬥的 status 子串流進行（只擲一次）
             chance = buff_change.get("chance", 1.0)
-            if random.random() > chance:
-                return
             EventBus.emit(BuffRequestEvent(
                 source=user.name,
                 target=target.name,
@@ -463,6 +467,7 @@ def _apply_buff_change(
                 duration=buff_change["duration"],
                 effect=buff_change.get("effect", {}),
                 chance=chance,
+                target_id=str(target.unique_id),
             ))
 
         elif action == "remove":
@@ -482,6 +487,7 @@ def _apply_buff_change(
                 scope=scope,
                 buff_name=remove_name,
                 buff_type=remove_type,
+                target_id=str(target.unique_id),
             ))
 
 
@@ -503,4 +509,5 @@ def _apply_general_change(
         attr=attr,
         change=change,
         scope=scope,
+        target_id=str(target.unique_id),
     ))
@@ -5,9 +5,18 @@
   - BLOCKING_STATUSES 拆分為 TURN_BLOCKING_STATUSES / ACTION_BLOCKING_STATUSES
   - is_blocked() / check_and_emit_blocked() 只檢查會跳過整個回合的狀態
     （stunned / paralyzed），不再把 silenced / blinded 歸入「跳過回合」
+  - tick_buffs() 不再逐一遞減所有 Buff：
+      到期排程：最小堆 (到期回合, 施加順序, 序號, buff)，只彈出本回合到期者
+      持續效果：只有 tick=True（DoT / HoT）的 Buff 每回合呼叫 on_tick()
+    每回合的成本與「到期 + 持續效果」的 Buff 數量成正比，與持有的 Buff 總數無關；
+    未到期 Buff 的剩餘回合 BuffTickEvent 只在有監聽者時發送
+    （批次模式下合併為 BuffTicksEvent；無人值守模擬沒有監聽者，整段略過）
 """
 
 from __future__ import annotations
+
+import heapq
+
 from common.event import (
     EventBus,
     BuffAppliedEvent,
@@ -39,6 +48,12 @@ class BattleState:
         self._buffs: dict[str, Buff] = {}
         self.shield: float = 0.0
 
+        self.round = 0                          # 已結算的回合數（tick_buffs 次數）
+        self._expiry: list[tuple] = []          # (到期回合, 施加順序, 序號, buff)
+        self._tickers: dict[str, Buff] = {}     # tick=True 的 Buff（維持施加順序）
+        self._order: dict[str, int] = {}        # Buff 名稱 → 施加順序
+        self._seq = 0                           # 施加 / 排程的遞增序號
+
     # ══════════════════════════════════════════
     #  Buff
     # ══════════════════════════════════════════
@@ -60,34 +75,87 @@ class BattleState:
             return
 
         self._buffs[buff.name] = buff
+        self._order[buff.name] = self._next_seq()
+        if buff.has_tick:
+            self._tickers[buff.name] = buff
+        buff._state = self
+        self._schedule(buff)
         buff.on_apply()
 
     def tick_buffs(self) -> None:
         """
         每回合結束時呼叫。
-        順序：on_tick() → decrement_duration() → 到期則 on_expire()。
+        順序：持續效果 on_tick()（看到的是本回合的剩餘回合）
+              → 回合數 +1 → 未到期者的剩餘回合 BuffTickEvent
+              → 本回合到期者依施加順序 on_expire()。
         """
-        expired = []
-        for name, buff in self._buffs.items():
-            buff.on_tick()
-            if buff.decrement_duration():
-                expired.append(name)
-            else:
-                EventBus.emit(BuffTickEvent(
-                    target=self.owner,
-                    buff_name=name,
-                    duration_remaining=buff.duration,
-                ))
+        for name, buff in list(self._tickers.items()):
+            if self._buffs.get(name) is buff:
+                buff.on_tick()
 
-        for name in expired:
-            buff = self._buffs.pop(name)
-            buff.on_expire()
-            attribute = buff.effect.get("attribute")
-            if attribute in _MECHANIC_ATTRIBUTES:
-                EventBus.emit(StatusExpiredEvent(
-                    target=self.owner,
-                    status=attribute,
-                ))
+        self.round += 1
+        expiry, now = self._expiry, self.round
+        expired = []
+        while expiry and expiry[0][0] <= now:
+            expires_at, order, _, buff = heapq.heappop(expiry)
+            if self._buffs.get(buff.name) is buff and buff._expires_at == expires_at:
+                expired.append((order, buff))
+
+        if self._buffs and EventBus.listeners(BuffTickEvent):
+            ending = {buff.name for _, buff in expired}
+            for name, buff in self._buffs.items():
+                if name not in ending:
+                    EventBus.emit(BuffTickEvent(
+                        target=self.owner,
+                        buff_name=name,
+                        duration_remaining=buff.duration,
+                    ))
+
+        for _, buff in sorted(expired, key=lambda item: item[0]):
+            if self._buffs.get(buff.name) is buff:
+                self._expire(buff)
+
+    def _schedule(self, buff: Buff) -> None:
+        """依 buff 目前的剩餘回合排入到期堆；永久 Buff（-1）不排程。"""
+        if buff._duration == -1:
+            buff._expires_at = None
+            return
+        buff._expires_at = self.round + buff._duration
+        heapq.heappush(
+            self._expiry,
+            (buff._expires_at, self._order[buff.name], self._next_seq(), buff),
+        )
+        # 刷新留下的過期項目過多時重建
+        if len(self._expiry) > 2 * len(self._buffs) + 16:
+            self._expiry = [
+                entry for entry in self._expiry
+                if self._buffs.get(entry[3].name) is entry[3]
+                and entry[3]._expires_at == entry[0]
+            ]
+            heapq.heapify(self._expiry)
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _detach(self, buff: Buff) -> None:
+        """Buff 離開 BattleState：剩餘回合凍結為當下的值。"""
+        buff._duration   = buff.duration
+        buff._expires_at = None
+        buff._state      = None
+        self._tickers.pop(buff.name, None)
+        self._order.pop(buff.name, None)
+
+    def _expire(self, buff: Buff) -> None:
+        del self._buffs[buff.name]
+        self._detach(buff)
+        buff.on_expire()
+        attribute = buff.effect.get("attribute")
+        if attribute in _MECHANIC_ATTRIBUTES:
+            EventBus.emit(StatusExpiredEvent(
+                target=self.owner,
+                status=attribute,
+            ))
 
     def remove_buff(self, buff_name: str) -> bool:
         """主動移除指定 Buff，呼叫 on_expire()。"""
@@ -97,14 +165,7 @@ class BattleState:
             ))
             return False
 
-        buff = self._buffs.pop(buff_name)
-        buff.on_expire()
-        attribute = buff.effect.get("attribute")
-        if attribute in _MECHANIC_ATTRIBUTES:
-            EventBus.emit(StatusExpiredEvent(
-                target=self.owner,
-                status=attribute,
-            ))
+        self._expire(self._buffs[buff_name])
         return True
 
     def remove_buffs_by_type(self, buff_type: str) -> int:
@@ -207,8 +268,12 @@ class BattleState:
         清空所有狀態，不觸發 on_expire()。
         戰鬥結束後呼叫，不需要發送還原事件。
         """
+        for buff in self._buffs.values():
+            self._detach(buff)
         self._buffs.clear()
+        self._expiry.clear()
         self.shield = 0.0
+        self.round  = 0
 
     # ══════════════════════════════════════════
     #  顯示
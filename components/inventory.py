@@ -2,10 +2,13 @@
 背包組件
 ─────────────────────────────────────────────
 管理物品的增刪查，支援堆疊與上限控制
+槽位以 item.name 為鍵，另維護 number / 類型兩個輔助索引，
+按編號計數、按類型列舉都不需要掃描整個背包
 """
 
 from __future__ import annotations
 from dataclasses import dataclass, field
+from typing import Iterator
 from common.event import EventBus, WarningEvent, ItemAddedEvent, ItemRemovedEvent
 
 
@@ -28,6 +31,9 @@ class Inventory:
         self.capacity = capacity
         self.owner    = owner
         self._slots: dict[str, InventorySlot] = {}   # key = item.name
+        # 輔助索引（與 _slots 同步；內層 dict 以 item.name 為鍵、保持加入順序）
+        self._by_number: dict[object, dict[str, InventorySlot]] = {}
+        self._by_type:   dict[type,   dict[str, InventorySlot]] = {}
 
     # ══════════════════════════════════════════
     #  新增
@@ -48,7 +54,8 @@ class Inventory:
             EventBus.emit(WarningEvent(message=f"{self.owner} 背包已滿，無法放入【{name}】"))
             return False
 
-        self._slots[name] = InventorySlot(item=item, quantity=quantity)
+        slot = self._slots[name] = InventorySlot(item=item, quantity=quantity)
+        self._index(name, slot)
         EventBus.emit(ItemAddedEvent(item_name=name, quantity=quantity, is_new=True))
         return True
 
@@ -75,10 +82,85 @@ class Inventory:
         slot.quantity -= quantity
         if slot.quantity == 0:
             del self._slots[item_name]
+            self._unindex(item_name, slot)
 
         EventBus.emit(ItemRemovedEvent(item_name=item_name, quantity=quantity))
         return True
 
+    # ══════════════════════════════════════════
+    #  批量交易
+    # ══════════════════════════════════════════
+
+    def check_transaction(self, consume: dict, produce: list) -> str:
+        """
+        驗證 transact() 能否完整執行，回傳失敗原因；可以執行時回傳空字串。
+        consume : {item_number: quantity}
+        produce : [(item, quantity), ...]
+        """
+        freed = 0
+        for number, qty in consume.items():
+            have = self.count_by_number(number)
+            if have < qty:
+                slot = self.get_by_number(number)
+                name = slot.item.name if slot else number
+                return f"【{name}】數量不足（需要 {qty}，剩餘 {have}）"
+            if have == qty:
+                freed += len(self._by_number.get(number, ()))
+
+        new_names = {item.name for item, _ in produce if item.name not in self._slots}
+        if len(self._slots) - freed + len(new_names) > self.capacity:
+            return "背包已滿"
+        return ""
+
+    def transact(self, consume: dict, produce: list) -> bool:
+        """
+        一次完成扣除 consume、加入 produce（合成等批量操作用）。
+        先完整驗證，不能全部執行時不改動背包；
+        全部改動完成後才發送事件，每種物品各一個 ItemRemovedEvent / ItemAddedEvent。
+        """
+        reason = self.check_transaction(consume, produce)
+        if reason:
+            EventBus.emit(WarningEvent(message=f"{self.owner} {reason}"))
+            return False
+
+        events = []
+        for number, qty in consume.items():
+            removed: dict[str, int] = {}
+            for name, slot in list(self._by_number.get(number, {}).items()):
+                if qty <= 0:
+                    break
+                take = min(slot.quantity, qty)
+                slot.quantity -= take
+                qty -= take
+                removed[name] = take
+                if slot.quantity == 0:
+                    del self._slots[name]
+                    self._unindex(name, slot)
+            events.extend(
+                ItemRemovedEvent(item_name=name, quantity=q) for name, q in removed.items()
+            )
+
+        added: dict[str, list] = {}
+        for item, qty in produce:
+            name = item.name
+            slot = self._slots.get(name)
+            if slot is None:
+                slot = self._slots[name] = InventorySlot(item=item, quantity=qty)
+                self._index(name, slot)
+                added[name] = [qty, True]
+            else:
+                slot.quantity += qty
+                entry = added.setdefault(name, [0, False])
+                entry[0] += qty
+        events.extend(
+            ItemAddedEvent(item_name=name, quantity=q, is_new=is_new)
+            for name, (q, is_new) in added.items()
+        )
+
+        for event in events:
+            EventBus.emit(event)
+        return True
+
     # ══════════════════════════════════════════
     #  查詢
     # ══════════════════════════════════════════
@@ -94,6 +176,26 @@ class Inventory:
         slot = self._slots.get(item_name)
         return slot.quantity if slot else 0
 
+    def count_by_number(self, number) -> int:
+        """按物品編號計數（同編號多個槽位時加總）。"""
+        slots = self._by_number.get(number)
+        if not slots:
+            return 0
+        return sum(slot.quantity for slot in slots.values())
+
+    def get_by_number(self, number) -> InventorySlot | None:
+        """按物品編號取得第一個槽位。"""
+        slots = self._by_number.get(number)
+        if not slots:
+            return None
+        return next(iter(slots.values()))
+
+    def iter_by_type(self, item_type: type | tuple[type, ...]) -> Iterator[InventorySlot]:
+        """列舉 isinstance(slot.item, item_type) 的槽位（同一類型內保持加入順序）。"""
+        for cls, slots in list(self._by_type.items()):
+            if issubclass(cls, item_type):
+                yield from list(slots.values())
+
     @property
     def is_full(self) -> bool:
         return len(self._slots) >= self.capacity
@@ -103,6 +205,30 @@ class Inventory:
         """回傳 [(item_name, quantity), ...]"""
         return [(name, slot.quantity) for name, slot in self._slots.items()]
 
+    # ══════════════════════════════════════════
+    #  索引維護
+    # ══════════════════════════════════════════
+
+    def _index(self, name: str, slot: InventorySlot) -> None:
+        number = getattr(slot.item, "number", None)
+        if number is not None:
+            self._by_number.setdefault(number, {})[name] = slot
+        self._by_type.setdefault(type(slot.item), {})[name] = slot
+
+    def _unindex(self, name: str, slot: InventorySlot) -> None:
+        number = getattr(slot.item, "number", None)
+        if number is not None:
+            slots = self._by_number.get(number)
+            if slots is not None:
+                slots.pop(name, None)
+                if not slots:
+                    del self._by_number[number]
+        slots = self._by_type.get(type(slot.item))
+        if slots is not None:
+            slots.pop(name, None)
+            if not slots:
+                del self._by_type[type(slot.item)]
+
     # ══════════════════════════════════════════
     #  顯示
     # ══════════════════════════════════════════
@@ -1,8 +1,12 @@
 from pathlib import Path
 from core.registry import registry
+from core.registry_cache import RegistryCache
 
 _BASE = Path(__file__).parent.parent / "data"
 
+# 編譯快取（與 data/ 同層），JSON 變動時自動重建
+_CACHE_PATH = _BASE.parent / "registry_cache.pkl"
+
 _MANIFEST = {
     # category          filepath
     "equipment" :  _BASE / "item/equipment.json",
@@ -22,10 +26,19 @@ _MANIFEST = {
     "task"      :  _BASE / "interact/task.json",
 }
 
-def load_all():
+def load_all(use_cache: bool = True, lazy: bool = False):
+    """
+    加載 _MANIFEST 中的所有 category。
+    lazy=True 時只登記來源，各 category 在首次存取時才讀取，
+    適合只用到少數 category 的短生命週期工具（平衡檢查、存檔遷移等）。
+    """
+    cache = RegistryCache(_CACHE_PATH) if use_cache else None
     for category, path in _MANIFEST.items():
-        if path.exists():
-            registry.load(category, path)
-        else:
+        if not path.exists():
             print(f"[DataLoader] WARNING: {path} not found, skipping.")
-            
\ No newline at end of file
+        elif lazy:
+            registry.register(category, path, cache=cache)
+        else:
+            registry.load(category, path, cache=cache)
+    if cache is not None and not lazy:
+        cache.save()
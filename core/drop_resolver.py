@@ -1,6 +1,8 @@
 # core/drop_resolver.py
 import random
 import re
+from dataclasses import dataclass
+from functools import lru_cache
 
 # 白名單：只允許這些函數
 _SAFE_FUNCS = {
@@ -9,6 +11,80 @@ _SAFE_FUNCS = {
     "random.uniform": random.uniform,
 }
 
+_RANDINT = re.compile(r'random\.randint\((\d+),\s*(\d+)\)')
+_CHOICE  = re.compile(r'random\.choice\(\[(.+)\]\)')
+
+
+@dataclass(frozen=True)
+class QuantitySpec:
+    """
+    预解析后的 drop 数量分布。
+      kind = "fixed"   : values = (n,)
+      kind = "randint" : values = (a, b)        闭区间
+      kind = "choice"  : values = (x1, x2, ...) 等概率
+    """
+    kind: str
+    values: tuple
+
+    def roll(self, rng=random) -> int:
+        if self.kind == "fixed":
+            return self.values[0]
+        if self.kind == "randint":
+            return rng.randint(*self.values)
+        return rng.choice(self.values)
+
+    def roll_total(self, n: int, rng=random) -> int:
+        """n 次独立抽取的总和（批量掉落用，一次 choices 调用完成）。"""
+        if n <= 0:
+            return 0
+        if self.kind == "fixed":
+            return self.values[0] * n
+        if n == 1:
+            return self.roll(rng)
+        if self.kind == "randint":
+            a, b = self.values
+            return sum(rng.choices(range(a, b + 1), k=n))
+        return sum(rng.choices(self.values, k=n))
+
+    @property
+    def mean(self) -> float:
+        if self.kind == "randint":
+            return (self.values[0] + self.values[1]) / 2
+        return sum(self.values) / len(self.values)
+
+
+@lru_cache(maxsize=None)
+def _compile_expr(expr: str) -> QuantitySpec:
+    expr = expr.strip()
+
+    # 匹配 random.randint(a, b)
+    m = _RANDINT.fullmatch(expr)
+    if m:
+        a, b = int(m.group(1)), int(m.group(2))
+        return QuantitySpec("fixed", (a,)) if a == b else QuantitySpec("randint", (a, b))
+
+    # 匹配 random.choice([a, b, c])
+    m = _CHOICE.fullmatch(expr)
+    if m:
+        items = tuple(int(x.strip()) for x in m.group(1).split(','))
+        return QuantitySpec("choice", items)
+
+    raise ValueError(f"不支持的 drop 表達式: {expr!r}")
+
+
+def compile_quantity(value: int | str) -> QuantitySpec:
+    """
+    将 drop 数量解析为 QuantitySpec（字符串表达式结果会缓存，只解析一次）。
+    - 数字 → fixed
+    - 字符串只允许白名单函数，不用 eval
+    """
+    if isinstance(value, int):
+        return QuantitySpec("fixed", (value,))
+    if isinstance(value, str):
+        return _compile_expr(value)
+    raise TypeError(f"無效的 quantity 類型: {type(value)}")
+
+
 def resolve_quantity(value: int | str) -> int:
     """
     安全地解析 drop 數量。
@@ -17,22 +93,7 @@ def resolve_quantity(value: int | str) -> int:
     """
     if isinstance(value, int):
         return value
-
-    if isinstance(value, str):
-        # 匹配 random.randint(a, b)
-        m = re.fullmatch(r'random\.randint\((\d+),\s*(\d+)\)', value.strip())
-        if m:
-            return random.randint(int(m.group(1)), int(m.group(2)))
-
-        # 匹配 random.choice([a, b, c])
-        m = re.fullmatch(r'random\.choice\(\[(.+)\]\)', value.strip())
-        if m:
-            items = [int(x.strip()) for x in m.group(1).split(',')]
-            return random.choice(items)
-
-        raise ValueError(f"不支持的 drop 表達式: {value!r}")
-
-    raise TypeError(f"無效的 quantity 類型: {type(value)}")
+    return compile_quantity(value).roll()
 
 
 def resolve_drops(drops: list) -> list[tuple[int, int]]:
@@ -1,39 +1,187 @@
-from typing import Type, TypeVar, Dict, Any
+from typing import Type, TypeVar, Dict, Any, Iterator
 import uuid
 
 T = TypeVar('T')
 
+
+class _Archetype:
+    """
+    同一組件簽名（component type 集合）的實體表。
+    每種組件一欄（column），同一實體在各欄的 row 相同；
+    移除實體時以最後一列填補空位（swap-remove），保持欄位緊密。
+    """
+
+    __slots__ = ("signature", "entities", "columns", "rows", "add_edges", "remove_edges")
+
+    def __init__(self, signature: frozenset):
+        self.signature = signature
+        self.entities: list[int] = []
+        self.columns: Dict[type, list] = {ct: [] for ct in signature}
+        self.rows: Dict[int, int] = {}
+        # 增 / 刪某組件後的目標 archetype（轉移路徑快取）
+        self.add_edges: Dict[type, "_Archetype"] = {}
+        self.remove_edges: Dict[type, "_Archetype"] = {}
+
+    def append(self, entity_id: int, components: Dict[type, Any]) -> None:
+        self.rows[entity_id] = len(self.entities)
+        self.entities.append(entity_id)
+        for ct, column in self.columns.items():
+            column.append(components[ct])
+
+    def pop(self, entity_id: int) -> Dict[type, Any]:
+        """移除實體並回傳其組件 {type: component}。"""
+        row  = self.rows.pop(entity_id)
+        last = len(self.entities) - 1
+        components = {}
+        for ct, column in self.columns.items():
+            components[ct] = column[row]
+            column[row] = column[last]
+            column.pop()
+        moved = self.entities[last]
+        self.entities[row] = moved
+        self.entities.pop()
+        if moved != entity_id:
+            self.rows[moved] = row
+        return components
+
+
 class World:
-    """管理所有實體和組件"""
+    """
+    管理所有實體和組件（archetype 儲存）。
+
+    實體依組件簽名分組存放在 _Archetype 表中；query() 只掃描簽名符合的表，
+    符合的表清單按查詢條件快取，新 archetype 出現時增量更新。
+    add_component / remove_component / destroy_entity 只在表之間搬移單一實體。
+    """
+
     def __init__(self):
-        self._components: Dict[int, Dict[type, Any]] = {}
+        self._archetypes: Dict[frozenset, _Archetype] = {}
+        self._locations: Dict[int, _Archetype] = {}
+        self._queries: Dict[frozenset, list[_Archetype]] = {}
+        self._get_archetype(frozenset())
         self._next_id = 0
 
-    def create_entity(self) -> int:
+    # ══════════════════════════════════════════
+    #  實體 / 組件
+    # ══════════════════════════════════════════
+
+    def create_entity(self, *components) -> int:
+        """建立實體，可同時附帶初始組件（只做一次 archetype 定位）。"""
         eid = self._next_id
         self._next_id += 1
-        self._components[eid] = {}
+        comps = {type(c): c for c in components}
+        arch = self._get_archetype(frozenset(comps))
+        arch.append(eid, comps)
+        self._locations[eid] = arch
         return eid
 
     def add_component(self, entity_id: int, component):
-        self._components[entity_id][type(component)] = component
+        arch = self._locations[entity_id]
+        ct = type(component)
+        column = arch.columns.get(ct)
+        if column is not None:
+            column[arch.rows[entity_id]] = component
+            return
+
+        target = arch.add_edges.get(ct)
+        if target is None:
+            target = arch.add_edges[ct] = self._get_archetype(arch.signature | {ct})
+
+        comps = arch.pop(entity_id)
+        comps[ct] = component
+        target.append(entity_id, comps)
+        self._locations[entity_id] = target
+
+    def remove_component(self, entity_id: int, component_type: type):
+        """移除組件並回傳它；實體沒有該組件時回傳 None。"""
+        arch = self._locations.get(entity_id)
+        if arch is None or component_type not in arch.columns:
+            return None
+
+        target = arch.remove_edges.get(component_type)
+        if target is None:
+            target = arch.remove_edges[component_type] = self._get_archetype(
+                arch.signature - {component_type}
+            )
+
+        comps = arch.pop(entity_id)
+        removed = comps.pop(component_type)
+        target.append(entity_id, comps)
+        self._locations[entity_id] = target
+        return removed
 
     def get_component(self, entity_id: int, component_type: Type[T]) -> T | None:
-        return self._components.get(entity_id, {}).get(component_type)
+        arch = self._locations.get(entity_id)
+        if arch is None:
+            return None
+        column = arch.columns.get(component_type)
+        if column is None:
+            return None
+        return column[arch.rows[entity_id]]
 
     def has_component(self, entity_id: int, component_type: type) -> bool:
-        return component_type in self._components.get(entity_id, {})
+        arch = self._locations.get(entity_id)
+        return arch is not None and component_type in arch.columns
+
+    def destroy_entity(self, entity_id: int):
+        arch = self._locations.pop(entity_id, None)
+        if arch is not None:
+            arch.pop(entity_id)
+
+    def __contains__(self, entity_id: int) -> bool:
+        return entity_id in self._locations
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    # ══════════════════════════════════════════
+    #  查詢
+    # ══════════════════════════════════════════
 
     def query(self, *component_types: type) -> list[int]:
-        """查詢擁有所有指定組件的實體"""
+        """查詢擁有所有指定組件的實體（依 archetype 分組排列）"""
         result = []
-        for eid, comps in self._components.items():
-            if all(ct in comps for ct in component_types):
-                result.append(eid)
+        for arch in self._matching(component_types):
+            result.extend(arch.entities)
         return result
 
-    def destroy_entity(self, entity_id: int):
-        self._components.pop(entity_id, None)
+    def query_components(self, *component_types: type) -> Iterator[tuple]:
+        """
+        批量迭代：逐一產出 (entity_id, comp_1, comp_2, ...)。
+        直接讀取 archetype 欄位，不經過 get_component。
+        迭代期間不要增刪組件或銷毀實體；需要時先 list() 取快照。
+        """
+        for arch in self._matching(component_types):
+            if not arch.entities:
+                continue
+            columns = [arch.columns[ct] for ct in component_types]
+            yield from zip(arch.entities, *columns)
+
+    def count(self, *component_types: type) -> int:
+        return sum(len(arch.entities) for arch in self._matching(component_types))
+
+    # ══════════════════════════════════════════
+    #  內部
+    # ══════════════════════════════════════════
+
+    def _matching(self, component_types) -> list[_Archetype]:
+        key = frozenset(component_types)
+        matched = self._queries.get(key)
+        if matched is None:
+            matched = self._queries[key] = [
+                arch for sig, arch in self._archetypes.items() if key <= sig
+            ]
+        return matched
+
+    def _get_archetype(self, signature: frozenset) -> _Archetype:
+        arch = self._archetypes.get(signature)
+        if arch is None:
+            arch = self._archetypes[signature] = _Archetype(signature)
+            # 增量更新已快取的查詢
+            for key, matched in self._queries.items():
+                if key <= signature:
+                    matched.append(arch)
+        return arch
 
 
 # 全局世界
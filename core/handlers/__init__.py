@@ -23,6 +23,7 @@ from core.handlers.map_handler    import MapHandler
 from core.handlers.combat_handler import CombatHandler
 from core.handlers.buff_handler   import BuffHandler
 from core.handlers.status_handler import StatusHandler
+from common.synthesis.handler     import SynthesisHandler
 
 
 def register_global_handlers(
@@ -36,6 +37,7 @@ def register_global_handlers(
     EventBus.register(NpcHandler(map_registry, dungeon_registry))
     EventBus.register(QuestHandler(player))
     EventBus.register(MapHandler(player, map_registry))
+    EventBus.register(SynthesisHandler(player))
 
 
 class BattleHandlerContext:
@@ -9,7 +9,6 @@ BuffHandler
 """
 from __future__ import annotations
 
-import random
 import copy
 
 from common.event.handlers import BattleHandler
@@ -19,6 +18,7 @@ from common.event.battle import (
 )
 from common.event import EventBus, WarningEvent
 from common.module.buff import Buff
+from common.battle.rng import battle_rng
 
 
 class BuffHandler(BattleHandler):
@@ -26,20 +26,18 @@ class BuffHandler(BattleHandler):
     def __init__(self, engine) -> None:
         self._engine = engine
 
-    def _resolve(self, name: str):
-        for p in self._engine._all_participants():
-            if p.name == name:
-                return p
-        return None
+    def _resolve(self, name: str, unique_id: str = ""):
+        """通过 engine 成员索引找到 Combatant（unique_id 优先，名字后备）。"""
+        return self._engine.resolve(name, unique_id)
 
     # ── Apply ─────────────────────────────────
 
     def on_buff_request_event(self, e: BuffRequestEvent) -> None:
         # 概率检查
-        if random.random() > e.chance:
+        if battle_rng(self._engine, "status").random() > e.chance:
             return
 
-        target = self._resolve(e.target)
+        target = self._resolve(e.target, e.target_id)
         if target is None:
             EventBus.emit(WarningEvent(
                 message=f"BuffRequest: 找不到目标 '{e.target}'"
@@ -49,16 +47,18 @@ class BuffHandler(BattleHandler):
         buff = Buff(
             name=e.buff_name,
             buff_type=e.buff_type,
+            source=e.source,
             duration=e.duration,
             effect=copy.deepcopy(e.effect),
             target=e.target,
+            target_id=str(target.unique_id),
         )
         target.battle_state.apply_buff(buff)
 
     # ── Remove ────────────────────────────────
 
     def on_buff_remove_request_event(self, e: BuffRemoveRequestEvent) -> None:
-        target = self._resolve(e.target)
+        target = self._resolve(e.target, e.target_id)
         if target is None:
             EventBus.emit(WarningEvent(
                 message=f"BuffRemoveRequest: 找不到目标 '{e.target}'"
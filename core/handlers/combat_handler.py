@@ -2,7 +2,7 @@
 CombatHandler
 ─────────────────────────────────────────────
 处理所有战斗内的 Request 事件：
-  - DamageRequestEvent  → 扣血（护盾优先吸收）
+  - DamageRequestEvent  → 扣血（护盾优先吸收），结算后发出 DamageAppliedEvent
   - HealRequestEvent    → 回血/回蓝
   - StatChangeRequestEvent → 修改属性
 
@@ -14,6 +14,7 @@ from common.event.bus import BattleEvent
 from common.event.handlers import BattleHandler
 from common.event.battle import (
     DamageRequestEvent,
+    DamageAppliedEvent,
     HealRequestEvent,
     StatChangeRequestEvent,
 )
@@ -25,17 +26,14 @@ class CombatHandler(BattleHandler):
     def __init__(self, engine) -> None:
         self._engine = engine
 
-    def _resolve(self, name: str):
-        """通过名字在战场内找到 Combatant 实例。"""
-        for p in self._engine._all_participants():
-            if p.name == name:
-                return p
-        return None
+    def _resolve(self, name: str, unique_id: str = ""):
+        """通过 engine 成员索引找到 Combatant（unique_id 优先，名字后备）。"""
+        return self._engine.resolve(name, unique_id)
 
     # ── Damage ────────────────────────────────
 
     def on_damage_request_event(self, e: DamageRequestEvent) -> None:
-        target = self._resolve(e.target)
+        target = self._resolve(e.target, e.target_id)
         if target is None:
             EventBus.emit(WarningEvent(
                 message=f"DamageRequest: 找不到目标 '{e.target}'"
@@ -46,12 +44,20 @@ class CombatHandler(BattleHandler):
         remaining = target.battle_state.absorb(e.amount)
 
         # 实际扣血
-        target.hp = max(0.0, target.hp - remaining)
+        hp = target.hp
+        target.hp = max(0.0, hp - remaining)
+
+        EventBus.emit(DamageAppliedEvent(
+            source=e.source,
+            target=e.target,
+            amount=hp - target.hp,
+            absorbed=e.amount - remaining,
+        ))
 
     # ── Heal ──────────────────────────────────
 
     def on_heal_request_event(self, e: HealRequestEvent) -> None:
-        target = self._resolve(e.target)
+        target = self._resolve(e.target, e.target_id)
         if target is None:
             EventBus.emit(WarningEvent(
                 message=f"HealRequest: 找不到目标 '{e.target}'"
@@ -70,7 +76,7 @@ class CombatHandler(BattleHandler):
     # ── StatChange ────────────────────────────
 
     def on_stat_change_request_event(self, e: StatChangeRequestEvent) -> None:
-        target = self._resolve(e.target)
+        target = self._resolve(e.target, e.target_id)
         if target is None:
             EventBus.emit(WarningEvent(
                 message=f"StatChangeRequest: 找不到目标 '{e.target}'"
@@ -85,3 +91,7 @@ class CombatHandler(BattleHandler):
 
         current = getattr(target, e.attr)
         setattr(target, e.attr, current + e.change)
+
+        # 速度变动只重新定位该角色，不重排整个回合顺序
+        if e.attr == "speed":
+            self._engine.turn_manager.reposition(target)
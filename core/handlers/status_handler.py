@@ -31,14 +31,12 @@ class StatusHandler(BattleHandler):
     def __init__(self, engine) -> None:
         self._engine = engine
 
-    def _resolve(self, name: str):
-        for p in self._engine._all_participants():
-            if p.name == name:
-                return p
-        return None
+    def _resolve(self, name: str, unique_id: str = ""):
+        """通过 engine 成员索引找到 Combatant（unique_id 优先，名字后备）。"""
+        return self._engine.resolve(name, unique_id)
 
     def on_status_applied_event(self, e: StatusAppliedEvent) -> None:
-        target = self._resolve(e.target)
+        target = self._resolve(e.target, e.target_id)
         if target is None:
             EventBus.emit(WarningEvent(
                 message=f"StatusApplied: 找不到目标 '{e.target}'"
@@ -50,6 +48,7 @@ class StatusHandler(BattleHandler):
         buff = Buff(
             name=e.status,
             buff_type=buff_type,
+            source="",
             duration=e.rounds,
             effect={
                 "attribute": e.status,
@@ -57,5 +56,6 @@ class StatusHandler(BattleHandler):
                 "tick": False,
             },
             target=e.target,
+            target_id=str(target.unique_id),
         )
         target.battle_state.apply_buff(buff)
@@ -1,9 +1,11 @@
 import json
 import re
 from decimal import Decimal
+from functools import lru_cache
 
 
-# 延遲導入，避免循環依賴
+# 延遲導入，避免循環依賴（首次呼叫後快取）
+@lru_cache(maxsize=1)
 def _get_class_map():
     from common.module.item import Equipment, Skill, Medicine, Product, Material, Warp, Buff
     from common.character.enemy import Enemy
@@ -38,15 +40,23 @@ def _get_class_map():
     }
 
 
+# lib 引用格式：形如 "material_100000"
+_LIB_REF = re.compile(r'^\w+_\d+$')
+
+
 def parse_attribute_value(value, top_level=False):
+    """解析單個值；不修改傳入的 value（__class__ 不再 pop）。"""
     if isinstance(value, dict):
         if top_level and "__class__" in value:
-            class_name = value.pop("__class__")
+            class_name = value["__class__"]
             cls_map = _get_class_map()
             cls = cls_map.get(class_name)
             if cls is None:
                 raise ValueError(f"未知的 __class__: {class_name!r}")
-            return cls(**{k: parse_attribute_value(v) for k, v in value.items()})
+            return cls(**{
+                k: parse_attribute_value(v)
+                for k, v in value.items() if k != "__class__"
+            })
         return {k: parse_attribute_value(v) for k, v in value.items()}
 
     elif isinstance(value, list):
@@ -54,7 +64,7 @@ def parse_attribute_value(value, top_level=False):
 
     elif isinstance(value, str):
         # 保留 lib 引用格式：形如 "material_100000"
-        if re.match(r'^\w+_\d+$', value):
+        if _LIB_REF.match(value):
             lib_name, item_id = value.rsplit('_', 1)
             return (lib_name, int(item_id))
         try:
@@ -87,9 +97,10 @@ _WRAPPER_KEYS = {
 }
 
 
-def load_json_to_dict(filepath: str) -> dict:
+def load_json_raw(filepath: str) -> dict:
     """
-    通用加載：自動剝離 wrapper key，返回 {int_id: instance} 字典。
+    只讀取 JSON、剝離 wrapper key，返回 {int_id: 原始 attributes}，不實例化。
+    供 Registry 延遲加載使用：實例化交給 parse_entry() 按需進行。
     """
     with open(filepath, 'r', encoding='utf-8') as f:
         data = json.load(f)
@@ -108,9 +119,21 @@ def load_json_to_dict(filepath: str) -> dict:
         except ValueError:
             print(f"[Parser] Skipping non-int key: {key!r}")
             continue
-
-        # 需要複製一份，因為 parse_attribute_value 會 pop __class__
-        attrs_copy = json.loads(json.dumps(attributes))
-        result[parsed_key] = parse_attribute_value(attrs_copy, top_level=True)
+        result[parsed_key] = attributes
 
     return result
+
+
+def parse_entry(attributes):
+    """將單筆原始 attributes 實例化（帶 __class__ 時建立對應物件）。"""
+    return parse_attribute_value(attributes, top_level=True)
+
+
+def load_json_to_dict(filepath: str) -> dict:
+    """
+    通用加載：自動剝離 wrapper key，返回 {int_id: instance} 字典。
+    """
+    return {
+        key: parse_entry(attributes)
+        for key, attributes in load_json_raw(filepath).items()
+    }
@@ -1,28 +1,230 @@
 from pathlib import Path
-from core.parser import load_json_to_dict
+from core.parser import load_json_to_dict, load_json_raw, parse_entry
 
 class Registry:
+    """
+    全域原型倉庫：category → {int_id: prototype}
+
+    兩種加載方式：
+      load(category, path)      : 立即解析整個 JSON（eager）
+      register(category, path)  : 只登記來源，首次 get / get_all / has 時
+                                  才讀取該 category，單筆原型在被請求時才實例化
+      preload(categories)       : 預先完整實例化指定 category（暖機用）
+
+    物品類 category（ITEM_CATEGORIES）另外建立統一索引 id → category，
+    get_item(id) 不必猜測分類；不同分類出現相同 id 時在加載時警告，
+    並以 ITEM_CATEGORIES 中排序較前的分類為準。
+
+    物品原型被重新加載 / 覆蓋時（load / register / add）呼叫
+    on_items_changed() 登記的回呼，供持有物品原型引用的快取失效。
+    """
     _instance = None
 
+    # 物品分類（順序即 id 衝突時的優先順序）
+    ITEM_CATEGORIES = ("material", "equipment", "product", "warp", "medicine", "skill")
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._store: dict[str, dict[int, object]] = {}
+            # lazy 模式：category → (filepath, cache)
+            cls._instance._sources: dict[str, tuple[Path, object]] = {}
+            # lazy 模式：尚未實例化的原始 attributes / 原始鍵順序
+            cls._instance._pending: dict[str, dict[int, dict]] = {}
+            cls._instance._order: dict[str, list[int]] = {}
+            # 物品統一索引：item_id → category
+            cls._instance._item_index: dict[int, str] = {}
+            cls._instance._collisions: set[tuple[int, str, str]] = set()
+            cls._instance._item_listeners: list = []
         return cls._instance
 
-    def load(self, category: str, filepath: str | Path):
-        """加載 JSON 並存入指定 category"""
-        data = load_json_to_dict(str(filepath))
+    def load(self, category: str, filepath: str | Path, cache=None):
+        """
+        加載 JSON 並存入指定 category。
+        傳入 RegistryCache 時，JSON 未變動則直接使用快取的原型。
+        """
+        data = cache.get(category, filepath) if cache is not None else None
+        source = "cache"
+        if data is None:
+            data = load_json_to_dict(str(filepath))
+            source = "json"
+            if cache is not None:
+                cache.put(category, filepath, data)
+        self._sources.pop(category, None)
+        self._pending.pop(category, None)
         self._store[category] = data
-        print(f"[Registry] '{category}' loaded → {len(data)} entries")
+        print(f"[Registry] '{category}' loaded → {len(data)} entries ({source})")
+        if category in self.ITEM_CATEGORIES:
+            self._reindex_items()
+            self._items_changed()
+
+    def register(self, category: str, filepath: str | Path, cache=None):
+        """登記 category 來源（lazy），首次存取時才加載。"""
+        self._sources[category] = (Path(filepath), cache)
+        self._store.pop(category, None)
+        self._pending.pop(category, None)
+        if category in self.ITEM_CATEGORIES:
+            self._reindex_items()
+            self._items_changed()
+
+    def add(self, category: str, key: int, prototype) -> None:
+        """
+        執行期追加 / 覆蓋單筆原型（DLC 用），同步更新物品索引。
+        """
+        if category not in self._store:
+            self._open(category)
+        self._store.setdefault(category, {})[key] = prototype
+        pending = self._pending.get(category)
+        if pending is not None:
+            if key not in pending and key not in self._order[category]:
+                self._order[category].append(key)
+            pending.pop(key, None)
+            if not pending:
+                self._finish(category)
+        if category in self.ITEM_CATEGORIES:
+            self._index_item(category, key)
+            self._items_changed()
+
+    def on_items_changed(self, callback) -> None:
+        """登記物品原型變動時的回呼（無參數）；重複登記同一回呼只算一次。"""
+        if callback not in self._item_listeners:
+            self._item_listeners.append(callback)
+
+    def preload(self, categories=None) -> None:
+        """完整實例化指定 category（None 表示所有已登記的 category）。"""
+        if categories is None:
+            categories = list(self._sources)
+        for category in categories:
+            self.get_all(category)
+
+    # ── 查詢 ──────────────────────────────────
 
     def get(self, category: str, key: int) -> object | None:
-        return self._store.get(category, {}).get(key)
+        store = self._store.get(category)
+        if store is None:
+            store = self._open(category)
+        item = store.get(key)
+        if item is None and category in self._pending:
+            item = self._materialize(category, key)
+        return item
 
     def get_all(self, category: str) -> dict[int, object]:
+        if category not in self._store:
+            self._open(category)
+        if category in self._pending:
+            for key in list(self._pending[category]):
+                self._materialize(category, key)
         return self._store.get(category, {})
 
     def has(self, category: str, key: int) -> bool:
-        return key in self._store.get(category, {})
+        store = self._store.get(category)
+        if store is None:
+            store = self._open(category)
+        return key in store or key in self._pending.get(category, ())
+
+    def get_item(self, key: int) -> tuple[str | None, object | None]:
+        """
+        跨分類查找物品原型，返回 (category, prototype)；找不到為 (None, None)。
+        """
+        self._open_item_categories()
+        category = self._item_index.get(key)
+        if category is None:
+            return None, None
+        return category, self.get(category, key)
+
+    def item_category(self, key: int) -> str | None:
+        """物品 id 所屬分類（不實例化原型）。"""
+        self._open_item_categories()
+        return self._item_index.get(key)
+
+    def collisions(self) -> list[tuple[int, str, str]]:
+        """已偵測到的物品 id 衝突 [(id, 採用的分類, 被遮蔽的分類), ...]。"""
+        return sorted(self._collisions)
+
+    def is_loaded(self, category: str) -> bool:
+        """category 是否已完整實例化。"""
+        return category in self._store and category not in self._pending
+
+    # ── lazy 內部 ─────────────────────────────
+
+    def _open(self, category: str) -> dict[int, object]:
+        """首次存取 lazy category：命中快取則整批還原，否則只讀原始 JSON。"""
+        source = self._sources.get(category)
+        if source is None:
+            return {}
+
+        filepath, cache = source
+        data = cache.get(category, filepath) if cache is not None else None
+        if data is not None:
+            self._store[category] = data
+            print(f"[Registry] '{category}' loaded → {len(data)} entries (cache)")
+        else:
+            raw = load_json_raw(str(filepath))
+            self._pending[category] = raw
+            self._order[category]   = list(raw)
+            self._store[category]   = {}
+            print(f"[Registry] '{category}' opened → {len(raw)} entries (lazy)")
+
+        if category in self.ITEM_CATEGORIES:
+            self._reindex_items()
+        return self._store[category]
+
+    def _open_item_categories(self) -> None:
+        """lazy 模式下物品索引需要知道全部 id：打開尚未讀取的物品分類（不實例化）。"""
+        for category in self.ITEM_CATEGORIES:
+            if category in self._sources and category not in self._store:
+                self._open(category)
+
+    # ── 物品索引 ──────────────────────────────
+
+    def _items_changed(self) -> None:
+        for callback in self._item_listeners:
+            callback()
+
+    def _reindex_items(self) -> None:
+        self._item_index = {}
+        for category in self.ITEM_CATEGORIES:
+            for key in self._store.get(category, ()):
+                self._index_item(category, key)
+            for key in self._pending.get(category, ()):
+                self._index_item(category, key)
+
+    def _index_item(self, category: str, key: int) -> None:
+        owner = self._item_index.get(key)
+        if owner is None or owner == category:
+            self._item_index[key] = category
+            return
+
+        rank = self.ITEM_CATEGORIES.index
+        winner, loser = (owner, category) if rank(owner) < rank(category) else (category, owner)
+        self._item_index[key] = winner
+        if (key, winner, loser) not in self._collisions:
+            self._collisions.add((key, winner, loser))
+            print(f"[Registry] WARNING: item id {key} 同時存在於 '{winner}' 與 '{loser}'，"
+                  f"以 '{winner}' 為準")
+
+    def _materialize(self, category: str, key: int) -> object | None:
+        pending = self._pending[category]
+        attributes = pending.pop(key, None)
+        if attributes is None:
+            return None
+
+        item = self._store[category][key] = parse_entry(attributes)
+        if not pending:
+            self._finish(category)
+        return item
+
+    def _finish(self, category: str) -> None:
+        """category 全部實例化後恢復 JSON 原始順序，並寫入快取。"""
+        del self._pending[category]
+        store = self._store[category]
+        store = self._store[category] = {
+            key: store[key] for key in self._order.pop(category) if key in store
+        }
+
+        filepath, cache = self._sources[category]
+        if cache is not None:
+            cache.put(category, filepath, store)
+            cache.save()
 
-registry = Registry()
\ No newline at end of file
+registry = Registry()
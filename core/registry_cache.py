@@ -0,0 +1,165 @@
+"""
+Registry 編譯快取
+─────────────────────────────────────────────
+把 load_json_to_dict() 的結果（已實例化的原型）以 pickle 存成單一檔案。
+每個 category 記錄來源 JSON 的 mtime / size / sha1：
+  - mtime、size 都相同      → 直接反序列化
+  - mtime 變了但 sha1 相同  → 仍然有效，更新 mtime
+  - 其餘情況                → 視為失效，由 Registry 重新解析 JSON 後寫回
+
+快取檔另記錄原型相關原始碼的指紋（_code_fingerprint）：core/parser.py 與
+原型類別所在模組（common/character、common/module、common/thing、components、
+common/battle/combatant.py）任一檔案內容改變，整份快取即失效。
+pickle 只保存實例屬性，類別新增欄位後舊快取仍能反序列化成功，
+只靠版本號容易漏遞增，因此以指紋把關。
+
+快取檔損毀、版本或指紋不符、原型類別已變動（反序列化失敗）時一律當作未命中，
+首次執行或資料 / 程式碼更新後會自動重建，不需要手動刪除。
+快取格式本身改變時請遞增 _CACHE_VERSION。
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+
+_CACHE_VERSION = 2
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+# 原型的解析規則與類別定義；內容變動即視為快取失效
+_CODE_SOURCES = (
+    "core/parser.py",
+    "common/character",
+    "common/module",
+    "common/thing",
+    "components",
+    "common/battle/combatant.py",
+)
+
+
+def _digest(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _code_fingerprint() -> str:
+    """_CODE_SOURCES 下所有 .py 檔（相對路徑 + 內容）的 sha1。"""
+    h = hashlib.sha1()
+    for source in _CODE_SOURCES:
+        path = _ROOT / source
+        files = sorted(path.rglob("*.py")) if path.is_dir() else [path]
+        for file in files:
+            try:
+                data = file.read_bytes()
+            except OSError:
+                continue
+            h.update(file.relative_to(_ROOT).as_posix().encode())
+            h.update(b"\0")
+            h.update(data)
+    return h.hexdigest()
+
+
+class RegistryCache:
+
+    def __init__(self, path: str | Path):
+        self._path = Path(path)
+        self._entries: dict[str, dict] | None = None
+        self._dirty = False
+
+    # ── 讀取 ──────────────────────────────────
+
+    def get(self, category: str, source: str | Path) -> dict | None:
+        """回傳快取的 {int_id: instance}；失效時回傳 None。"""
+        entries = self._load_entries()
+        entry = entries.get(category)
+        if entry is None or entry["source"] != str(source):
+            return None
+
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+
+        if (st.st_mtime_ns, st.st_size) != (entry["mtime_ns"], entry["size"]):
+            if _digest(Path(source)) != entry["digest"]:
+                return None
+            entry["mtime_ns"] = st.st_mtime_ns
+            entry["size"]     = st.st_size
+            self._dirty = True
+
+        try:
+            return pickle.loads(entry["blob"])
+        except Exception:
+            # 原型類別已變動，丟棄此 category 的快取
+            del entries[category]
+            self._dirty = True
+            return None
+
+    # ── 寫入 ──────────────────────────────────
+
+    def put(self, category: str, source: str | Path, data: dict) -> None:
+        try:
+            blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"[RegistryCache] '{category}' 無法序列化，略過快取：{e}")
+            return
+
+        st = os.stat(source)
+        self._load_entries()[category] = {
+            "source":   str(source),
+            "mtime_ns": st.st_mtime_ns,
+            "size":     st.st_size,
+            "digest":   _digest(Path(source)),
+            "blob":     blob,
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """有變動時原子寫回快取檔；寫入失敗只警告，不影響遊戲啟動。"""
+        if not self._dirty:
+            return
+        payload = {
+            "version": _CACHE_VERSION,
+            "code":    _code_fingerprint(),
+            "entries": self._load_entries(),
+        }
+        tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path)
+            self._dirty = False
+        except OSError as e:
+            print(f"[RegistryCache] WARNING: 無法寫入 {self._path}：{e}")
+
+    def clear(self) -> None:
+        self._entries = {}
+        self._dirty = True
+
+    # ── 內部 ──────────────────────────────────
+
+    def _load_entries(self) -> dict[str, dict]:
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        if not self._path.exists():
+            return self._entries
+
+        try:
+            with open(self._path, "rb") as f:
+                payload = pickle.load(f)
+        except Exception:
+            return self._entries
+
+        if (
+            isinstance(payload, dict)
+            and payload.get("version") == _CACHE_VERSION
+            and payload.get("code") == _code_fingerprint()
+        ):
+            self._entries = payload.get("entries", {})
+        return self._entries
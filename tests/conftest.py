@@ -0,0 +1,31 @@
+"""
+測試共用設定：專案根目錄加入 sys.path，資料只載入一次。
+"""
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(scope="session")
+def registry():
+    from core.data_loader import load_all
+    from core.registry import registry
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        load_all()
+    return registry
+
+
+@pytest.fixture
+def event_bus():
+    """每個測試使用乾淨的 EventBus，結束時清空。"""
+    from common.event import EventBus
+
+    EventBus.clear()
+    yield EventBus
+    EventBus.clear()
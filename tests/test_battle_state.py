@@ -0,0 +1,117 @@
+"""
+BattleState：到期堆排程（刷新、主動移除、同回合到期順序、永久 Buff）與剩餘回合通知。
+"""
+from components.battle_state import BattleState
+from common.event import BuffExpiredEvent, BuffTickEvent, BuffTicksEvent
+from common.module.buff import Buff
+
+
+def _buff(name: str, duration: int) -> Buff:
+    return Buff(
+        name=name,
+        buff_type="buff",
+        source="測試",
+        target="",
+        duration=duration,
+        effect={"attribute": "attack", "value": 5},
+    )
+
+
+def _collect(event_bus, *event_types) -> list:
+    events = []
+    for event_type in event_types:
+        event_bus.subscribe(event_type, events.append)
+    return events
+
+
+def _tick(state: BattleState, rounds: int) -> None:
+    for _ in range(rounds):
+        state.tick_buffs()
+
+
+def test_refresh_skips_stale_entry(event_bus):
+    state = BattleState("甲")
+    expired = _collect(event_bus, BuffExpiredEvent)
+
+    state.apply_buff(_buff("攻擊", 3))
+    _tick(state, 2)
+    state.apply_buff(_buff("攻擊", 3))            # 刷新：舊的第 3 回合到期項目失效
+    assert state.get_buff("攻擊").duration == 3
+
+    _tick(state, 2)                                # 第 4 回合：舊項目到期時間已過
+    assert state.has_buff("攻擊")
+    assert expired == []
+
+    state.tick_buffs()                             # 第 5 回合：刷新後的到期時間
+    assert not state.has_buff("攻擊")
+    assert [e.buff_name for e in expired] == ["攻擊"]
+
+
+def test_remove_buff_mid_duration(event_bus):
+    state = BattleState("甲")
+    expired = _collect(event_bus, BuffExpiredEvent)
+    buff = _buff("攻擊", 5)
+
+    state.apply_buff(buff)
+    _tick(state, 2)
+    assert state.remove_buff("攻擊")
+    assert buff.duration == 3                      # 剩餘回合凍結
+
+    _tick(state, 5)
+    assert buff.duration == 3
+    assert [e.buff_name for e in expired] == ["攻擊"]
+
+
+def test_same_round_expiry_follows_apply_order(event_bus):
+    state = BattleState("甲")
+    expired = _collect(event_bus, BuffExpiredEvent)
+
+    state.apply_buff(_buff("丙", 2))
+    state.tick_buffs()
+    state.apply_buff(_buff("甲", 2))
+    state.apply_buff(_buff("乙", 2))
+    state.apply_buff(_buff("丙", 2))               # 刷新：同回合到期，施加順序不變
+
+    _tick(state, 2)
+    assert [e.buff_name for e in expired] == ["丙", "甲", "乙"]
+    assert state.active_buffs == []
+
+
+def test_permanent_buff_never_expires(event_bus):
+    state = BattleState("甲")
+    expired = _collect(event_bus, BuffExpiredEvent)
+
+    state.apply_buff(_buff("永久", -1))
+    _tick(state, 50)
+    assert state.has_buff("永久")
+    assert state.get_buff("永久").duration == -1
+    assert expired == []
+
+    state.remove_buff("永久")
+    assert [e.buff_name for e in expired] == ["永久"]
+
+
+def test_tick_reports_remaining_duration(event_bus):
+    state = BattleState("甲")
+    state.apply_buff(_buff("短", 1))
+    state.apply_buff(_buff("長", 3))
+    state.apply_buff(_buff("永久", -1))
+    ticks = _collect(event_bus, BuffTickEvent)
+
+    state.tick_buffs()                             # 「短」本回合到期，不報剩餘回合
+    assert [(e.buff_name, e.duration_remaining) for e in ticks] == [
+        ("長", 2), ("永久", -1),
+    ]
+
+
+def test_tick_notifications_coalesce_in_batch(event_bus):
+    state = BattleState("甲")
+    state.apply_buff(_buff("長", 3))
+    state.apply_buff(_buff("永久", -1))
+    ticks = _collect(event_bus, BuffTickEvent, BuffTicksEvent)
+
+    with event_bus.batch():
+        state.tick_buffs()
+    assert len(ticks) == 1
+    assert isinstance(ticks[0], BuffTicksEvent)
+    assert ticks[0].ticks == {"長": 2, "永久": -1}
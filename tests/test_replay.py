@@ -0,0 +1,66 @@
+"""
+ReplayRecorder / ReplayReader：自動戰鬥（批次模式）錄製的回合位移。
+"""
+from collections import Counter
+
+from common.battle.engine import BattleEngine
+from common.character.player import Player
+from common.event import (
+    DamageRequestEvent,
+    ReplayReader,
+    ReplayRecorder,
+    SilentBattleHandler,
+    TurnStartEvent,
+)
+
+
+def _record_auto_battle(registry, event_bus, seed: int):
+    """錄製一場自動戰鬥，回傳 (reader, 各回合實際發出的 DamageRequestEvent 數)。"""
+    recorder = ReplayRecorder()
+    event_bus.register(SilentBattleHandler())
+    event_bus.register(recorder)
+
+    player = Player("測試")
+    player.stats.attack = 30.0
+    enemies = [registry.get("enemy", eid) for eid in (500001, 500002, 500001)]
+    engine = BattleEngine(player, [], enemies, headless=True, max_turns=60, seed=seed)
+    assert engine.auto_battle
+
+    requests: Counter = Counter()
+    event_bus.subscribe(
+        DamageRequestEvent, lambda e: requests.update([engine._turn_count])
+    )
+    engine.run()
+    return ReplayReader(recorder.to_bytes()), requests
+
+
+def test_seek_starts_at_turn_start(registry, event_bus):
+    reader, _ = _record_auto_battle(registry, event_bus, seed=7)
+    turns = [t for t in reader.turns if t > 0]
+    assert len(turns) > 1
+
+    for turn in turns:
+        first = next(reader.events(from_turn=turn))
+        assert isinstance(first, TurnStartEvent)
+        assert first.turn == turn
+
+
+def test_requests_recorded_in_their_turn(registry, event_bus):
+    reader, requests = _record_auto_battle(registry, event_bus, seed=7)
+
+    recorded = Counter()
+    for turn in reader.turns:
+        recorded[turn] = sum(
+            isinstance(e, DamageRequestEvent) for e in reader.events(turn, turn)
+        )
+    assert +recorded == +requests
+
+
+def test_turn_slices_cover_whole_replay(registry, event_bus):
+    reader, _ = _record_auto_battle(registry, event_bus, seed=7)
+    whole = [type(e).__name__ for e in reader]
+
+    sliced = []
+    for turn in reader.turns:
+        sliced.extend(type(e).__name__ for e in reader.events(turn, turn))
+    assert sliced == whole